@@ -0,0 +1,94 @@
+"""Concurrent write throughput of the sharded tree engine.
+
+Preloads a tree, then has several threads insert, update and delete their
+own plates directly on it (as an embedding application would) and reports
+writes per second for each shard count. Each shard has its own write lock,
+so with more shards the threads wait less for each other; whether that turns
+into more throughput depends on the interpreter: on a free-threaded CPython
+build the shards' writes run in parallel, while with the GIL only one thread
+runs Python code at a time.
+
+The API server gains nothing from shards for writes: its handlers apply
+changes one at a time on the event loop.
+
+Usage:
+    python -m benchmarks.bench_shards
+    python -m benchmarks.bench_shards --shards 1 4 16 --threads 8 --writes 20000 --engine bptree
+"""
+import argparse
+import gc
+import random
+import sys
+import sysconfig
+import threading
+import time
+from typing import List, Optional
+
+from benchmarks.bench_tree import make_vehicles, plate
+from core.tree_factory import TREE_ENGINES, create_tree
+
+
+def run_case(engine: str, shards: int, threads: int, writes: int, preload: int, seed: int) -> float:
+    """Writes per second of `threads` threads sharing one tree of `shards` shards."""
+    tree = create_tree(engine, shards=shards)
+    tree.bulk_load(make_vehicles(range(preload), random.Random(seed)), presorted=True)
+    per_thread = writes // threads
+    # Every thread works on its own new plates, after the preloaded ones
+    batches = [
+        make_vehicles(range(preload + i * per_thread, preload + (i + 1) * per_thread), random.Random(seed + i))
+        for i in range(threads)
+    ]
+    start = threading.Barrier(threads + 1)
+
+    def work(vehicles) -> None:
+        start.wait()
+        for vehicle in vehicles:
+            tree.insert(vehicle)
+        for vehicle in vehicles:
+            tree.update(vehicle.plate, vehicle.model_copy(update={"price": vehicle.price + 1}))
+        for vehicle in vehicles:
+            tree.delete(vehicle.plate)
+
+    workers = [threading.Thread(target=work, args=(batch,)) for batch in batches]
+    for worker in workers:
+        worker.start()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        start.wait()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.enable()
+    assert len(tree) == preload and tree.search(plate(preload)) is None
+    return 3 * per_thread * threads / elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure concurrent write throughput of the sharded tree.")
+    parser.add_argument("--engine", default="avl", choices=list(TREE_ENGINES))
+    parser.add_argument("--shards", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=20_000, help="Vehicles inserted, updated and deleted in total")
+    parser.add_argument("--preload", type=int, default=100_000, help="Vehicles in the tree before the writes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per shard count; the best is kept")
+    args = parser.parse_args(argv)
+
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"python {sys.version.split()[0]} ({'free-threaded' if free_threaded else 'GIL'}), "
+          f"engine={args.engine} threads={args.threads} writes={args.writes} preload={args.preload}")
+    baseline = None
+    for shards in args.shards:
+        rate = max(
+            run_case(args.engine, shards, args.threads, args.writes, args.preload, args.seed)
+            for _ in range(args.repeat)
+        )
+        baseline = baseline or rate
+        print(f"shards={shards:<3} {rate:>10,.0f} writes/s  x{rate / baseline:.2f}", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
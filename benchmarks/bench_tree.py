@@ -0,0 +1,270 @@
+"""Micro-benchmarks of the tree engines across plate distributions.
+
+Times insert, search (hit and miss), update, delete and the three
+traversals, and records tree height and memory, for every combination of
+engine, distribution and size. Results are written as JSON and can be
+compared against a stored baseline to flag regressions.
+
+Usage:
+    python -m benchmarks.bench_tree
+    python -m benchmarks.bench_tree --sizes 1000 10000 100000 1000000 --output benchmarks/results.json
+    python -m benchmarks.bench_tree --compare benchmarks/baseline.json --threshold 0.25
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional
+
+from core.tree_factory import TREE_ENGINES, create_tree
+from models.vehicle import Vehicle
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DISTRIBUTIONS = ["random", "sorted", "reverse", "zigzag"]
+# Distributions that degenerate the plain BST into a linked list
+DEGENERATE = {"sorted", "reverse", "zigzag"}
+# Timed metrics, compared against the baseline
+METRICS = [
+    "insert", "search_hit", "search_miss", "update", "delete",
+    "inorder", "preorder", "postorder",
+]
+
+
+def plate(index: int) -> str:
+    """Plate number `index` in ascending plate order, e.g. 0 -> "AAA000", 1001 -> "AAB001"."""
+    letters, digits = divmod(index, 1000)
+    chars = []
+    for _ in range(3):
+        letters, remainder = divmod(letters, 26)
+        chars.append(string.ascii_uppercase[remainder])
+    return "".join(reversed(chars)) + f"{digits:03d}"
+
+
+def key_order(distribution: str, size: int, rng: random.Random) -> List[int]:
+    """Insertion order of the plate indexes 0..size-1 for a distribution."""
+    if distribution == "random":
+        order = list(range(size))
+        rng.shuffle(order)
+        return order
+    if distribution == "sorted":
+        return list(range(size))
+    if distribution == "reverse":
+        return list(range(size - 1, -1, -1))
+    if distribution == "zigzag":
+        # Alternates between the lowest and highest remaining plate
+        order = []
+        low, high = 0, size - 1
+        while low <= high:
+            order.append(low)
+            if low != high:
+                order.append(high)
+            low += 1
+            high -= 1
+        return order
+    raise ValueError(f"Unknown distribution '{distribution}'")
+
+
+def make_vehicles(indexes: Iterable[int], rng: random.Random) -> List[Vehicle]:
+    brands = ["Toyota", "Mazda", "Renault", "Chevrolet", "Kia"]
+    colors = ["Red", "Blue", "White", "Black", "Gray"]
+    return [
+        Vehicle(
+            plate=plate(index),
+            brand=rng.choice(brands),
+            color=rng.choice(colors),
+            model=str(rng.randint(1, 9)),
+            price=float(rng.randint(5_000, 90_000)),
+        )
+        for index in indexes
+    ]
+
+
+def _ns_per_op(func: Callable[[], object], ops: int) -> float:
+    start = time.perf_counter_ns()
+    func()
+    return (time.perf_counter_ns() - start) / max(ops, 1)
+
+
+def _consume(iterator) -> None:
+    for _ in iterator:
+        pass
+
+
+def measure_memory(engine: str, compact: bool, order: List[int], seed: int) -> int:
+    """Bytes retained by a tree loaded with the vehicles of `order`, once the input list is dropped."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tree = create_tree(engine, compact=compact)
+        vehicles = make_vehicles(order, random.Random(seed))
+        for vehicle in vehicles:
+            tree.insert(vehicle)
+        del vehicles
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(
+    engine: str, compact: bool, distribution: str, size: int, sample: int, seed: int, repeat: int, memory: bool
+) -> dict:
+    """Benchmark one engine/distribution/size combination."""
+    order = key_order(distribution, size, random.Random(seed))
+    rng = random.Random(seed)
+    vehicles = make_vehicles(order, rng)
+    sample_count = min(sample, size)
+    hits = [vehicle.plate for vehicle in rng.sample(vehicles, sample_count)]
+    # Suffixed plates fall between existing ones, so misses walk full paths
+    misses = [f"{p}X" for p in hits]
+    updates = [vehicle.model_copy(update={"price": vehicle.price + 1}) for vehicle in rng.sample(vehicles, sample_count)]
+    removals = [vehicle.plate for vehicle in rng.sample(vehicles, sample_count)]
+
+    timings = {}
+    for _ in range(repeat):
+        tree = create_tree(engine, compact=compact)
+        gc.disable()
+        try:
+            run = {"insert": _ns_per_op(lambda: [tree.insert(v) for v in vehicles], size)}
+            height = tree.height()
+            run["search_hit"] = _ns_per_op(lambda: [tree.search(p) for p in hits], sample_count)
+            run["search_miss"] = _ns_per_op(lambda: [tree.search(p) for p in misses], sample_count)
+            run["update"] = _ns_per_op(lambda: [tree.update(v.plate, v) for v in updates], sample_count)
+            for name in ("inorder", "preorder", "postorder"):
+                try:
+                    traversal = getattr(tree, f"iter_{name}")
+                    run[name] = _ns_per_op(lambda: _consume(traversal()), size)
+                except NotImplementedError:
+                    # Engines without a binary shape (the B+tree) only walk in order
+                    pass
+            run["delete"] = _ns_per_op(lambda: [tree.delete(p) for p in removals], sample_count)
+        finally:
+            gc.enable()
+        del tree
+        # Best of the repetitions: the least disturbed by other processes
+        for name, value in run.items():
+            timings[name] = min(value, timings.get(name, value))
+
+    result = {
+        "engine": engine,
+        "compact": compact,
+        "distribution": distribution,
+        "size": size,
+        "height": height,
+        "ns_per_op": {name: round(value, 1) for name, value in timings.items()},
+    }
+    if memory:
+        del vehicles, updates
+        tree_bytes = measure_memory(engine, compact, order, seed)
+        result["memory_bytes"] = tree_bytes
+        result["bytes_per_key"] = round(tree_bytes / size, 1)
+    return result
+
+
+def case_key(result: dict) -> tuple:
+    return result["engine"], result["compact"], result["distribution"], result["size"]
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> List[str]:
+    """Describe every metric that got slower (or a tree that got taller) beyond `threshold`."""
+    previous = {case_key(result): result for result in baseline if "ns_per_op" in result}
+    regressions = []
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None or "ns_per_op" not in result:
+            continue
+        label = "{}{} {} n={}".format(result["engine"], "+compact" if result["compact"] else "", result["distribution"], result["size"])
+        for metric in METRICS:
+            before, after = old["ns_per_op"].get(metric), result["ns_per_op"].get(metric)
+            if before and after and after > before * (1 + threshold):
+                regressions.append(f"{label}: {metric} {before:.0f} -> {after:.0f} ns/op (+{after / before - 1:.0%})")
+        if result["height"] > old["height"]:
+            regressions.append(f"{label}: height {old['height']} -> {result['height']}")
+        if "bytes_per_key" in old and "bytes_per_key" in result and result["bytes_per_key"] > old["bytes_per_key"] * (1 + threshold):
+            regressions.append(f"{label}: memory {old['bytes_per_key']:.0f} -> {result['bytes_per_key']:.0f} bytes/key")
+    return regressions
+
+
+def print_result(result: dict) -> None:
+    label = "{:<6}{:<8} {:<8} {:>8}".format(
+        result["engine"], "+compact" if result["compact"] else "", result["distribution"], result["size"]
+    )
+    if "skipped" in result:
+        print(f"{label}  skipped: {result['skipped']}")
+        return
+    timings = " ".join(f"{name}={value:.0f}" for name, value in result["ns_per_op"].items())
+    memory = f" {result['bytes_per_key']:.0f}B/key" if "bytes_per_key" in result else ""
+    print(f"{label}  h={result['height']}{memory}  ns/op: {timings}", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the tree engines across plate distributions.")
+    parser.add_argument("--engines", nargs="+", default=list(TREE_ENGINES), choices=list(TREE_ENGINES))
+    parser.add_argument("--distributions", nargs="+", default=DISTRIBUTIONS, choices=DISTRIBUTIONS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--compact", action="store_true", help="Also benchmark compact storage mode")
+    parser.add_argument("--sample", type=int, default=10_000, help="Keys used for search/update/delete timings")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best time of each metric is kept")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc pass")
+    parser.add_argument(
+        "--degenerate-limit", type=int, default=2_000,
+        help="Largest size run for the plain BST on sorted/reverse/zigzag keys (quadratic build)",
+    )
+    parser.add_argument("--output", default="benchmarks/results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", metavar="BASELINE", help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown ratio before flagging")
+    args = parser.parse_args(argv)
+
+    results = []
+    for engine in args.engines:
+        for compact in ([False, True] if args.compact else [False]):
+            for distribution in args.distributions:
+                for size in args.sizes:
+                    if engine == "bst" and distribution in DEGENERATE and size > args.degenerate_limit:
+                        result = {
+                            "engine": engine, "compact": compact, "distribution": distribution, "size": size,
+                            "skipped": f"degenerate plain BST above --degenerate-limit={args.degenerate_limit}",
+                        }
+                    else:
+                        result = run_case(
+                            engine, compact, distribution, size, args.sample, args.seed, args.repeat, args.memory
+                        )
+                    print_result(result)
+                    results.append(result)
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "sample": args.sample,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) against {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
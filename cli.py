@@ -0,0 +1,76 @@
+"""Command line tools for the vehicle data files.
+
+Usage:
+    python cli.py csv-to-snapshot [--csv data/vehicles.csv] [--snapshot data/vehicles.snap]
+    python cli.py snapshot-to-csv [--snapshot data/vehicles.snap] [--csv data/vehicles.csv]
+"""
+import argparse
+import os
+from typing import List
+from models.vehicle import Vehicle
+from services.csv_service import CSVService
+from services.journal_service import JournaledCSVService
+from services.snapshot_service import SnapshotService
+
+
+def _journaled(csv_path: str) -> bool:
+    """Whether the CSV has journal records (PERSISTENCE_MODE=journal) that belong to its data."""
+    journal_path = csv_path + ".journal"
+    return os.path.exists(journal_path) or os.path.exists(journal_path + ".compacting")
+
+
+def _load_vehicles(csv_path: str) -> List[Vehicle]:
+    """Load the CSV plus the journal replayed on top of it, if there is one."""
+    if not _journaled(csv_path):
+        return CSVService(csv_path).load_all()
+    service = JournaledCSVService(csv_path)
+    try:
+        return service.load_all()
+    finally:
+        service.close()
+
+
+def _save_vehicles(csv_path: str, vehicles: List[Vehicle]) -> None:
+    """Replace the CSV, emptying its journal so old records are not replayed over the new data."""
+    if not _journaled(csv_path):
+        CSVService(csv_path).save_all(vehicles)
+        return
+    service = JournaledCSVService(csv_path)
+    try:
+        service.save_all(vehicles)
+    finally:
+        service.close()
+
+
+def csv_to_snapshot(args: argparse.Namespace) -> None:
+    vehicles = _load_vehicles(args.csv)
+    count = SnapshotService(args.snapshot).save_all(vehicles)
+    print(f"Wrote {count} vehicles to {args.snapshot}")
+
+
+def snapshot_to_csv(args: argparse.Namespace) -> None:
+    vehicles = [record.to_vehicle() for record in SnapshotService(args.snapshot).load_records()]
+    _save_vehicles(args.csv, vehicles)
+    print(f"Wrote {len(vehicles)} vehicles to {args.csv}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert vehicle data between CSV and binary snapshots.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    to_snapshot = subparsers.add_parser("csv-to-snapshot", help="Build a binary snapshot from a CSV file")
+    to_snapshot.add_argument("--csv", default="data/vehicles.csv")
+    to_snapshot.add_argument("--snapshot", default="data/vehicles.snap")
+    to_snapshot.set_defaults(handler=csv_to_snapshot)
+
+    to_csv = subparsers.add_parser("snapshot-to-csv", help="Export a binary snapshot as CSV")
+    to_csv.add_argument("--snapshot", default="data/vehicles.snap")
+    to_csv.add_argument("--csv", default="data/vehicles.csv")
+    to_csv.set_defaults(handler=snapshot_to_csv)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Application settings read from environment variables."""
+import os
+
+# Tree engine used by the vehicle controller: "avl" (self-balancing), "bst"
+# or "bptree" (B+tree with wide sorted leaves)
+BST_ENGINE = os.getenv("BST_ENGINE", "avl")
+# Children per node of the "bptree" engine
+BTREE_FANOUT = int(os.getenv("BTREE_FANOUT", "64"))
+# Store compact tuple records in the tree instead of pydantic models
+COMPACT_STORAGE = os.getenv("COMPACT_STORAGE", "false").lower() == "true"
+# Keep vehicle data in this append-only, memory-mapped file and only plates,
+# prices and file offsets in the tree; empty keeps whole vehicles in memory.
+# The file is rebuilt on every start (it is not a persistence format); each
+# process uses its own copy, suffixed with its pid, and removes it on shutdown
+RECORD_FILE = os.getenv("RECORD_FILE", "")
+# Vehicles kept decoded in the LRU cache in front of the record file
+RECORD_CACHE_SIZE = int(os.getenv("RECORD_CACHE_SIZE", "10000"))
+# Trees the plates are spread over by hash, each with its own write lock (1
+# keeps a single tree). Only threads writing to the tree directly benefit; the
+# API applies writes one at a time (see benchmarks/bench_shards.py)
+TREE_SHARDS = int(os.getenv("TREE_SHARDS", "1"))
+
+# Counting Bloom filter in front of plate lookups: misses skip the tree walk,
+# hits pay for the extra check, so enable it when most lookups miss
+PLATE_FILTER = os.getenv("PLATE_FILTER", "false").lower() == "true"
+# Plates the filter is sized for before it grows (it doubles when exceeded)
+PLATE_FILTER_CAPACITY = int(os.getenv("PLATE_FILTER_CAPACITY", "100000"))
+# Target false positive rate of the filter
+PLATE_FILTER_FALSE_POSITIVE_RATE = float(os.getenv("PLATE_FILTER_FALSE_POSITIVE_RATE", "0.01"))
+
+# Trigram index of plates for substring suggestions in /suggest (prefix
+# suggestions need no index)
+SUGGEST_SUBSTRING = os.getenv("SUGGEST_SUBSTRING", "true").lower() == "true"
+
+# Persistence mode: "csv" rewrites the CSV on every change,
+# "journal" appends changes to a write-ahead log that is compacted periodically
+PERSISTENCE_MODE = os.getenv("PERSISTENCE_MODE", "csv")
+# Journal records that trigger a background compaction (0 disables it)
+JOURNAL_COMPACT_THRESHOLD = int(os.getenv("JOURNAL_COMPACT_THRESHOLD", "10000"))
+# Seconds between periodic compactions (0 disables them)
+JOURNAL_COMPACT_INTERVAL = float(os.getenv("JOURNAL_COMPACT_INTERVAL", "300"))
+# fsync the journal after every append
+JOURNAL_FSYNC = os.getenv("JOURNAL_FSYNC", "true").lower() == "true"
+
+# "fsync": acknowledge writes once persisted, "async": acknowledge immediately
+PERSISTENCE_DURABILITY = os.getenv("PERSISTENCE_DURABILITY", "fsync")
+# Seconds the background writer waits to group pending writes into one commit
+COMMIT_WINDOW = float(os.getenv("COMMIT_WINDOW", "0.002"))
+
+# Share the data between the processes of `uvicorn --workers N`: writes are
+# serialized across processes with a lock on the journal, and every worker
+# follows the journal to apply the others' changes. Requires PERSISTENCE_MODE=journal
+SHARED_WORKERS = os.getenv("SHARED_WORKERS", "false").lower() == "true"
+# Seconds between checks of the journal for other workers' changes: roughly
+# the most a read can lag behind a write made on another worker
+SHARED_SYNC_INTERVAL = float(os.getenv("SHARED_SYNC_INTERVAL", "0.05"))
+
+# Binary snapshot loaded at startup when it is newer than the CSV/journal
+# and rewritten on shutdown; empty disables it
+SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "data/vehicles.snap")
+
+# Worker processes parsing CSV uploads (0 uses one per CPU)
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "0"))
+# Bytes of an upload handed to a worker at a time
+IMPORT_CHUNK_BYTES = int(os.getenv("IMPORT_CHUNK_BYTES", str(4 * 1024 * 1024)))
+# Rejected rows listed in an import response (all of them are counted)
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+# Maximum bytes of serialized list/traversal responses kept in the LRU cache
+RESPONSE_CACHE_BYTES = int(os.getenv("RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# Tree operations timed for the /metrics histograms: one in every N (0 disables sampling)
+METRICS_SAMPLE_EVERY = int(os.getenv("METRICS_SAMPLE_EVERY", "16"))
+
+# Rows read between warm-up progress reports
+WARMUP_CHUNK_SIZE = int(os.getenv("WARMUP_CHUNK_SIZE", "10000"))
+# Seconds a request received during warm-up waits for the data before getting a 503
+WARMUP_WAIT_TIMEOUT = float(os.getenv("WARMUP_WAIT_TIMEOUT", "2"))
+# Retry-After seconds sent with 503 responses during warm-up
+WARMUP_RETRY_AFTER = int(os.getenv("WARMUP_RETRY_AFTER", "5"))
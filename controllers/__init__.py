@@ -1,3 +1,4 @@
 from .vehicle_controller import router
+from .health_controller import router as health_router
 
-__all__ = ["router"]
+__all__ = ["router", "health_router"]
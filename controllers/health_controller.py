@@ -0,0 +1,25 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+from controllers.vehicle_controller import warmup
+import config
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def liveness() -> dict:
+    """The process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness() -> JSONResponse:
+    """Whether the vehicle data is loaded, with loading progress; 503 until it is."""
+    body = warmup.status()
+    if warmup.ready:
+        return JSONResponse(body)
+    return JSONResponse(
+        body,
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(config.WARMUP_RETRY_AFTER)},
+    )
@@ -1,104 +1,627 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+import asyncio
+import gc
+import heapq
+import logging
+import math
+import os
+import uuid
+import zlib
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
 from models.vehicle import Vehicle
-from core.bst import BinarySearchTree
-from services.csv_service import CSVService
+from models.batch import BatchOperation, BatchRequest
+from models.serialization import dumps
+from core.tree_factory import create_tree
+from core.price_summary import PriceSummary
+from core.vehicle_index import VehicleIndex
+from core.vehicle_record import VehicleRecord
+from core.secondary_index import SecondaryIndexes
+from core.trigram_index import TrigramIndex
+from services.csv_service import CSVService, Mutation
+from services.import_service import ImportService, ParsedImport, RowError
+from services.journal_service import JournaledCSVService
+from services.persistence_writer import PersistenceWriter
+from services.response_cache import ResponseCache
+from services.snapshot_service import SnapshotService
+from services.metrics_service import (
+    TreeMetrics, register_filter_gauges, register_record_gauges, register_sync_gauges, register_tree_gauges,
+)
+from services.warmup_service import WarmUpService
+from services.worker_sync import WorkerSync
+import config
 
-router = APIRouter(prefix="/api/vehicles", tags=["vehicles"])
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+if config.SHARED_WORKERS and config.PERSISTENCE_MODE != "journal":
+    raise ValueError("SHARED_WORKERS requires PERSISTENCE_MODE=journal")
+
+# Initial data is loaded in the background once the server is up
+warmup = WarmUpService()
+
+
+async def require_ready() -> None:
+    """Hold requests until the initial load finishes, or answer 503 once the wait times out."""
+    if not await warmup.wait(config.WARMUP_WAIT_TIMEOUT):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Vehicle data is still loading ({warmup.state})",
+            headers={"Retry-After": str(config.WARMUP_RETRY_AFTER)},
+        )
+
+
+router = APIRouter(prefix="/api/vehicles", tags=["vehicles"], dependencies=[Depends(require_ready)])
 
 # Initialize BST and CSV service
-bst = BinarySearchTree()
-csv_service = CSVService()
+bst = create_tree(
+    config.BST_ENGINE,
+    compact=config.COMPACT_STORAGE,
+    fanout=config.BTREE_FANOUT,
+    shards=config.TREE_SHARDS,
+    # Each process rebuilds its own record file: uvicorn workers must not truncate each other's
+    record_file=f"{config.RECORD_FILE}.{os.getpid()}" if config.RECORD_FILE else "",
+    record_cache_size=config.RECORD_CACHE_SIZE,
+)
+# Brand/color/price indexes kept in sync with every tree mutation
+indexes = SecondaryIndexes()
+bst.add_listener(indexes)
+# Plate trigrams for substring suggestions
+trigrams = TrigramIndex() if config.SUGGEST_SUBSTRING else None
+if trigrams is not None:
+    bst.add_listener(trigrams)
+# Sampled operation costs and live tree shape for /metrics
+bst.set_stats(TreeMetrics(config.METRICS_SAMPLE_EVERY))
+register_tree_gauges(bst)
+# Answers lookups of unknown plates without walking the tree
+if config.PLATE_FILTER:
+    bst.enable_filter(config.PLATE_FILTER_CAPACITY, config.PLATE_FILTER_FALSE_POSITIVE_RATE)
+register_filter_gauges(bst)
+register_record_gauges(bst)
+if config.PERSISTENCE_MODE == "journal":
+    csv_service = JournaledCSVService(
+        compact_threshold=config.JOURNAL_COMPACT_THRESHOLD,
+        compact_interval=config.JOURNAL_COMPACT_INTERVAL,
+        fsync=config.JOURNAL_FSYNC,
+        shared=config.SHARED_WORKERS,
+    )
+else:
+    csv_service = CSVService()
+
+# Shared workers would race to rewrite the snapshot, so they always load from the CSV and journal
+snapshot_service = SnapshotService(config.SNAPSHOT_PATH) if config.SNAPSHOT_PATH and not config.SHARED_WORKERS else None
+# Applies the other workers' changes from the shared journal
+worker_sync = WorkerSync(csv_service, bst, config.SHARED_SYNC_INTERVAL) if config.SHARED_WORKERS else None
+if worker_sync is not None:
+    register_sync_gauges(worker_sync)
+
+
+def _load_initial_data(progress: WarmUpService) -> None:
+    """Build the tree in one pass, from the binary snapshot if it is up to date, else from the CSV.
+
+    Runs on a worker thread during warm-up. The CSV is read in chunks of
+    WARMUP_CHUNK_SIZE rows, reporting progress between chunks. The cyclic
+    garbage collector is paused while millions of objects are allocated,
+    and the loaded objects are then frozen so later collections do not keep
+    rescanning the whole tree.
+    """
+    gc.disable()
+    try:
+        if worker_sync is not None:
+            # Records other workers append from now on are applied after the load
+            worker_sync.mark()
+        progress.progress("reading")
+        if snapshot_service is not None and snapshot_service.is_fresh(csv_service.source_paths()):
+            vehicles = snapshot_service.load_records()
+            presorted = True
+        else:
+            vehicles = csv_service.load_all(
+                lambda count: progress.progress("reading", count), config.WARMUP_CHUNK_SIZE
+            )
+            presorted = False
+        progress.progress("building", len(vehicles))
+        bst.bulk_load(vehicles, presorted=presorted)
+        if worker_sync is not None:
+            progress.progress("syncing")
+            worker_sync.catch_up()
+            worker_sync.start()
+    finally:
+        gc.enable()
+    gc.freeze()
+
+
+def start_warmup() -> None:
+    """Start loading the initial data in the background (called from the app lifespan)."""
+    warmup.start(_load_initial_data)
+
+# File writes run on a background thread, batched into group commits
+writer = PersistenceWriter(csv_service, commit_window=config.COMMIT_WINDOW)
+# CSV uploads are parsed and validated in worker processes
+import_service = ImportService(config.IMPORT_WORKERS, config.IMPORT_CHUNK_BYTES, config.IMPORT_MAX_ERRORS)
+
+
+async def _wait_durable(future) -> None:
+    """Wait for a queued commit to be fsynced in "fsync" durability mode."""
+    if config.PERSISTENCE_DURABILITY == "fsync":
+        await asyncio.wrap_future(future)
+
+
+# Orders tree changes and their queued mutations the same way: a change running on a
+# worker thread must not let another write reach the persistence writer before its own
+_write_lock = asyncio.Lock()
+
+
+async def _write(change: Callable[[], Tuple[T, List[Mutation]]], in_thread: bool = False) -> T:
+    """Apply a change to the tree and persist the mutations it returns; return its result.
+
+    With SHARED_WORKERS the change runs on a worker thread as the only
+    writer of all workers, after applying their earlier writes, and its
+    mutations are appended to the shared journal before anyone else writes.
+    Otherwise it runs right away (on a worker thread if `in_thread`) and its
+    mutations are queued on the background writer before the next change
+    starts, so they are persisted in the order they were applied.
+    """
+    if worker_sync is not None:
+        return await asyncio.to_thread(worker_sync.write, change)
+    async with _write_lock:
+        result, mutations = await asyncio.to_thread(change) if in_thread else change()
+        future = writer.submit_many(list(mutations)) if mutations else None
+    if future is not None:
+        await _wait_durable(future)
+    return result
+
+
+def shutdown() -> None:
+    """Flush pending writes, release persistence resources and write the startup snapshot."""
+    if worker_sync is not None:
+        worker_sync.close()
+    writer.close()
+    csv_service.close()
+    import_service.close()
+    # A partially loaded tree must not overwrite the snapshot
+    if snapshot_service is not None and warmup.ready:
+        # Written after the final CSV flush so the next start can load it
+        try:
+            snapshot_service.save_all(bst.iter_inorder(), presorted=True)
+        except Exception:
+            # The next start loads the CSV instead; the cleanup below must still run
+            logger.exception("Failed to write the startup snapshot")
+    if config.RECORD_FILE:
+        # Per-process record files are not reused by the next start
+        for index in getattr(bst, "shards", (bst,)):
+            index.records.close()
+            os.remove(index.records.path)
 
-# Load existing data from CSV on startup
-_vehicles = csv_service.load_all()
-for vehicle in _vehicles:
-    bst.insert(vehicle)
+
+# Vehicles serialized per chunk written to a streaming response
+STREAM_CHUNK_SIZE = 500
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _wants_stream(request: Request, stream: bool) -> bool:
+    """Whether the client asked for NDJSON streaming (query flag or Accept header)."""
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _ndjson_chunks(documents: Iterator[bytes]) -> Iterator[bytes]:
+    """Join serialized vehicles as newline-delimited JSON, a chunk at a time."""
+    while True:
+        chunk = list(islice(documents, STREAM_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield b"\n".join(chunk) + b"\n"
+
+
+def _stream_response(documents: Iterator[bytes]) -> StreamingResponse:
+    """Stream vehicles lazily from a traversal without building the full list."""
+    return StreamingResponse(_ndjson_chunks(documents), media_type=NDJSON_MEDIA_TYPE)
+
+
+def _json_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    """Wrap an already serialized JSON body, skipping FastAPI's encoder."""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Serialized list/traversal responses keyed by request and tree version
+response_cache = ResponseCache(config.RESPONSE_CACHE_BYTES)
+# Distinguishes ETags issued by this process from those of earlier runs
+_ETAG_EPOCH = uuid.uuid4().hex[:8]
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match header already covers this ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _cached_json(request: Request, build: Callable[[VehicleIndex], bytes]) -> Response:
+    """Answer a read-only request from the response cache, with ETag/304 support.
+
+    The ETag only depends on the request and the tree version, so an
+    unchanged poll is answered with 304 without touching the tree. The body
+    is built from a snapshot of that version, unaffected by concurrent writes.
+    """
+    key = f"{request.url.path}?{sorted(request.query_params.multi_items())}"
+    view = bst.snapshot()
+    version = view.version
+    etag = f'"{_ETAG_EPOCH}-{version}-{zlib.crc32(key.encode()):08x}"'
+    headers = {"ETag": etag}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = response_cache.get((key, version))
+    if body is None:
+        body = build(view)
+        response_cache.put((key, version), body)
+    return _json_response(body, headers)
+
+
+class PageParams:
+    """Pagination and plate-range query parameters shared by the list endpoints."""
+
+    def __init__(
+        self,
+        offset: int = Query(0, ge=0, description="Number of vehicles to skip"),
+        limit: Optional[int] = Query(None, ge=1, description="Maximum number of vehicles to return"),
+        plate_from: Optional[str] = Query(None, alias="from", description="Lowest plate to include"),
+        plate_to: Optional[str] = Query(None, alias="to", description="Highest plate to include"),
+    ):
+        self.offset = offset
+        self.limit = limit
+        self.plate_from = plate_from
+        self.plate_to = plate_to
+
+    def iterate(self, order: str, tree: Optional[VehicleIndex] = None) -> Iterator[bytes]:
+        """Lazily run a traversal restricted to the requested page, yielding each vehicle's JSON."""
+        if tree is None:
+            tree = bst.snapshot()
+        try:
+            documents = tree.iter_json(order, start=self.offset, low=self.plate_from, high=self.plate_to)
+        except NotImplementedError as exc:
+            # For example preorder/postorder on the B+tree engine
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        return islice(documents, self.limit)
+
+    def render(self, order: str, tree: VehicleIndex, **fields) -> bytes:
+        """Serialize the requested page of a tree snapshot by joining the vehicles' cached JSON.
+
+        Extra fields are placed before the page description.
+        """
+        vehicles = list(self.iterate(order, tree))
+        head = dumps({
+            **fields,
+            "count": len(vehicles),
+            "total": tree.count_range(self.plate_from, self.plate_to),
+            "offset": self.offset,
+        })
+        return head[:-1] + b',"vehicles":[' + b",".join(vehicles) + b"]}"
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_vehicle(vehicle: Vehicle) -> dict:
     """Create a new vehicle."""
-    if bst.search(vehicle.plate):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Vehicle with plate '{vehicle.plate}' already exists"
-        )
-    
-    bst.insert(vehicle)
-    csv_service.add_vehicle(vehicle)
+    def create() -> Tuple[None, List[Mutation]]:
+        if vehicle.plate in bst:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Vehicle with plate '{vehicle.plate}' already exists"
+            )
+        bst.insert(vehicle)
+        return None, [Mutation("insert", vehicle.plate, vehicle)]
+
+    await _write(create)
     return {"message": "Vehicle created successfully", "vehicle": vehicle}
 
 
-@router.get("/{plate}")
-async def get_vehicle(plate: str) -> dict:
+def _apply_operation(operation: BatchOperation) -> Tuple[int, str, Optional[Mutation]]:
+    """Apply one batch operation to the tree; return its status, a message and the mutation to persist."""
+    if operation.op == "delete":
+        if not bst.delete(operation.plate):
+            return status.HTTP_404_NOT_FOUND, f"Vehicle with plate '{operation.plate}' not found", None
+        return status.HTTP_204_NO_CONTENT, "Vehicle deleted successfully", Mutation("delete", operation.plate)
+
+    vehicle = operation.vehicle
+    if vehicle is None:
+        return status.HTTP_400_BAD_REQUEST, f"Operation '{operation.op}' requires a vehicle", None
+    if vehicle.plate != operation.plate:
+        return status.HTTP_400_BAD_REQUEST, "Cannot change vehicle plate", None
+
+    if operation.op == "insert":
+        if not bst.insert(vehicle):
+            return status.HTTP_409_CONFLICT, f"Vehicle with plate '{vehicle.plate}' already exists", None
+        return status.HTTP_201_CREATED, "Vehicle created successfully", Mutation("insert", vehicle.plate, vehicle)
+
+    if not bst.update(operation.plate, vehicle):
+        return status.HTTP_404_NOT_FOUND, f"Vehicle with plate '{operation.plate}' not found", None
+    return status.HTTP_200_OK, "Vehicle updated successfully", Mutation("update", operation.plate, vehicle)
+
+
+@router.post("/batch")
+async def apply_batch(batch: BatchRequest) -> dict:
+    """Apply many insert/update/delete operations and persist them with a single write.
+
+    Operations are applied in plate order (operations on the same plate keep
+    their relative order); results are reported in request order.
+    """
+    operations = batch.operations
+    results: List[Optional[dict]] = [None] * len(operations)
+
+    def apply() -> Tuple[int, List[Mutation]]:
+        mutations: List[Mutation] = []
+        for index in sorted(range(len(operations)), key=lambda i: operations[i].plate):
+            operation = operations[index]
+            code, message, mutation = _apply_operation(operation)
+            if mutation is not None:
+                mutations.append(mutation)
+            results[index] = {"index": index, "op": operation.op, "plate": operation.plate, "status": code, "detail": message}
+        return len(mutations), mutations
+
+    applied = await _write(apply)
+    return {"applied": applied, "failed": len(operations) - applied, "results": results}
+
+
+def _merge_import(parsed: ParsedImport) -> Tuple[List[VehicleRecord], List[RowError]]:
+    """Bulk load the parsed vehicles whose plate is not in the tree yet; runs on a worker thread.
+
+    Returns the vehicles added and an error for each row skipped because
+    its plate already existed. Runs as a write (see _write), so no other
+    change can take one of the new plates in between.
+    """
+    new: List[VehicleRecord] = []
+    rejected: List[RowError] = []
+    for record, line in zip(parsed.records, parsed.lines):
+        if record.plate not in bst:
+            new.append(record)
+        else:
+            rejected.append(RowError(line, f"Vehicle with plate '{record.plate}' already exists"))
+    bst.bulk_load(new, presorted=True)
+    return new, rejected
+
+
+@router.post("/import")
+async def import_vehicles(
+    file: UploadFile = File(..., description="CSV with plate, brand, color, model and price columns"),
+) -> dict:
+    """Import the vehicles of an uploaded CSV, reporting every rejected row.
+
+    The file is streamed in blocks that are parsed and validated in worker
+    processes, then merged into the tree with one sorted bulk load. Rows with
+    a plate already in the tree or repeated in the file are rejected.
+    """
+    try:
+        parsed = await import_service.parse(file.read)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    def merge() -> Tuple[Tuple[List[VehicleRecord], List[RowError]], List[Mutation]]:
+        added, rejected = _merge_import(parsed)
+        return (added, rejected), [Mutation("insert", record.plate, record.to_vehicle()) for record in added]
+
+    added, rejected = await _write(merge, in_thread=True)
+    errors = sorted(parsed.errors + rejected)[:config.IMPORT_MAX_ERRORS]
+    failed = parsed.failed + len(rejected)
+    return {
+        "rows": parsed.rows,
+        "imported": len(added),
+        "failed": failed,
+        "errors": [error._asdict() for error in errors],
+        "errors_truncated": failed > len(errors),
+    }
+
+
+@router.get("/search", response_model=None)
+async def search_vehicles(
+    brand: Optional[str] = Query(None, description="Brand (case-insensitive)"),
+    color: Optional[str] = Query(None, description="Color (case-insensitive)"),
+    min_price: Optional[float] = Query(None, description="Minimum price (inclusive)"),
+    max_price: Optional[float] = Query(None, description="Maximum price (inclusive)"),
+) -> Response:
+    """Find vehicles by brand, color and price range using the secondary indexes."""
+    try:
+        plates = indexes.query(brand, color, min_price, max_price)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    tree = bst.snapshot()
+    # A plate deleted after the query is no longer in the tree
+    vehicles = [document for document in map(tree.search_json, plates) if document is not None]
+    return _json_response(b'{"count":%d,"vehicles":[' % len(vehicles) + b",".join(vehicles) + b"]}")
+
+
+# Sorts after any other character: plates starting with q are those between q and q + PREFIX_END
+PREFIX_END = "\U0010ffff"
+
+
+def _case_prefixes(tree: VehicleIndex, q: str) -> List[str]:
+    """Spellings of q, differing only in letter case, that some plate starts with.
+
+    Built a character at a time, keeping only the spellings with plates in
+    their range, so the few case variants that occur are checked instead of
+    every combination: O(len(q) * log n) for plates in a single case.
+    """
+    prefixes = [""]
+    for char in q:
+        prefixes = [
+            prefix + variant
+            for prefix in prefixes
+            for variant in sorted({char, char.upper(), char.lower()})
+            if tree.count_range(prefix + variant, prefix + variant + PREFIX_END)
+        ]
+        if not prefixes:
+            break
+    return prefixes
+
+
+@router.get("/suggest", response_model=None)
+async def suggest_plates(
+    q: str = Query(..., min_length=1, description="Beginning or part of a plate"),
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of suggestions"),
+) -> Response:
+    """Autocomplete plates: those starting with q first, then those containing it, each in plate order.
+
+    Matching ignores case. Prefix matches come from range walks over the
+    tree, one per spelling of q (in any letter case) that some plate starts
+    with, merged and stopped after `limit` vehicles; substring matches (q of
+    three or more characters) from the trigram index. Neither scans the
+    whole tree.
+    """
+    tree = bst.snapshot()
+    walks = [
+        islice(tree.iter_json_items(low=prefix, high=prefix + PREFIX_END), limit)
+        for prefix in _case_prefixes(tree, q)
+    ]
+    prefixed = list(islice(heapq.merge(*walks), limit))
+    vehicles = [document for _, document in prefixed]
+    if trigrams is not None and len(vehicles) < limit:
+        listed = {plate for plate, _ in prefixed}
+        for plate in trigrams.search(q, limit + len(listed)):
+            if len(vehicles) == limit:
+                break
+            if plate not in listed:
+                document = tree.search_json(plate)
+                if document is not None:
+                    vehicles.append(document)
+    head = dumps({"query": q, "count": len(vehicles)})
+    return _json_response(head[:-1] + b',"vehicles":[' + b",".join(vehicles) + b"]}")
+
+
+def _summary_fields(summary: PriceSummary) -> dict:
+    """Response fields of a price summary."""
+    return {
+        "count": summary.count,
+        "total": summary.total,
+        "average": summary.average,
+        "min": summary.minimum,
+        "max": summary.maximum,
+    }
+
+
+@router.get("/stats")
+async def price_statistics(
+    plate_from: Optional[str] = Query(None, alias="from", description="Lowest plate to include"),
+    plate_to: Optional[str] = Query(None, alias="to", description="Highest plate to include"),
+    verify: bool = Query(False, description="Also recompute the statistics with a full scan of the range"),
+) -> dict:
+    """Count, total, average, min and max price of the vehicles in a plate range.
+
+    Answered in O(log n) from the price aggregates kept in the tree. With
+    verify=true the range is also scanned in full and both results compared.
+    """
+    tree = bst.snapshot()
+    summary = tree.price_stats(plate_from, plate_to)
+    result = {"from": plate_from, "to": plate_to, **_summary_fields(summary)}
+    if verify:
+        full = await asyncio.to_thread(tree.recompute_price_stats, plate_from, plate_to)
+        result["verification"] = {
+            **_summary_fields(full),
+            "consistent": (
+                full.count == summary.count
+                and full.minimum == summary.minimum
+                and full.maximum == summary.maximum
+                and math.isclose(full.total, summary.total, rel_tol=1e-9, abs_tol=1e-6)
+            ),
+        }
+    return result
+
+
+@router.get("/{plate}", response_model=None)
+async def get_vehicle(plate: str) -> Response:
     """Get a vehicle by plate."""
-    vehicle = bst.search(plate)
+    vehicle = bst.search_json(plate)
     if not vehicle:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Vehicle with plate '{plate}' not found"
         )
-    return {"vehicle": vehicle}
+    return _json_response(b'{"vehicle":' + vehicle + b"}")
 
 
-@router.get("/")
-async def list_all_vehicles() -> dict:
-    """Get all vehicles in inorder traversal."""
-    vehicles = bst.inorder()
-    return {"count": len(vehicles), "vehicles": vehicles}
+@router.get("/", response_model=None)
+async def list_all_vehicles(
+    request: Request,
+    page: PageParams = Depends(),
+    stream: bool = Query(False, description="Stream vehicles as NDJSON"),
+) -> Response:
+    """Get all vehicles in inorder traversal, optionally paginated or limited to a plate range."""
+    if _wants_stream(request, stream):
+        return _stream_response(page.iterate("inorder"))
+    return _cached_json(request, lambda view: page.render("inorder", view))
 
 
 @router.put("/{plate}")
 async def update_vehicle(plate: str, updated_vehicle: Vehicle) -> dict:
     """Update a vehicle by plate."""
-    if not bst.search(plate):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Vehicle with plate '{plate}' not found"
-        )
-    
-    # Prevent changing the plate (primary key)
-    if updated_vehicle.plate != plate:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot change vehicle plate"
-        )
-    
-    bst.update(plate, updated_vehicle)
-    csv_service.update_vehicle(plate, updated_vehicle)
+    def update() -> Tuple[None, List[Mutation]]:
+        if plate not in bst:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Vehicle with plate '{plate}' not found"
+            )
+
+        # Prevent changing the plate (primary key)
+        if updated_vehicle.plate != plate:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot change vehicle plate"
+            )
+
+        bst.update(plate, updated_vehicle)
+        return None, [Mutation("update", plate, updated_vehicle)]
+
+    await _write(update)
     return {"message": "Vehicle updated successfully", "vehicle": updated_vehicle}
 
 
 @router.delete("/{plate}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_vehicle(plate: str):
     """Delete a vehicle by plate."""
-    if not bst.delete(plate):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Vehicle with plate '{plate}' not found"
-        )
-    
-    csv_service.remove_vehicle(plate)
+    def delete() -> Tuple[None, List[Mutation]]:
+        if not bst.delete(plate):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Vehicle with plate '{plate}' not found"
+            )
+        return None, [Mutation("delete", plate)]
+
+    await _write(delete)
     return None
 
 
-@router.get("/traversal/inorder")
-async def get_inorder_traversal() -> dict:
-    """Get all vehicles in inorder traversal (sorted by plate)."""
-    vehicles = bst.inorder()
-    return {"traversal": "inorder", "count": len(vehicles), "vehicles": vehicles}
+@router.get("/traversal/inorder", response_model=None)
+async def get_inorder_traversal(
+    request: Request,
+    page: PageParams = Depends(),
+    stream: bool = Query(False, description="Stream vehicles as NDJSON"),
+) -> Response:
+    """Get vehicles in inorder traversal (sorted by plate)."""
+    if _wants_stream(request, stream):
+        return _stream_response(page.iterate("inorder"))
+    return _cached_json(request, lambda view: page.render("inorder", view, traversal="inorder"))
 
 
-@router.get("/traversal/preorder")
-async def get_preorder_traversal() -> dict:
-    """Get all vehicles in preorder traversal."""
-    vehicles = bst.preorder()
-    return {"traversal": "preorder", "count": len(vehicles), "vehicles": vehicles}
+@router.get("/traversal/preorder", response_model=None)
+async def get_preorder_traversal(
+    request: Request,
+    page: PageParams = Depends(),
+    stream: bool = Query(False, description="Stream vehicles as NDJSON"),
+) -> Response:
+    """Get vehicles in preorder traversal."""
+    if _wants_stream(request, stream):
+        return _stream_response(page.iterate("preorder"))
+    return _cached_json(request, lambda view: page.render("preorder", view, traversal="preorder"))
 
 
-@router.get("/traversal/postorder")
-async def get_postorder_traversal() -> dict:
-    """Get all vehicles in postorder traversal."""
-    vehicles = bst.postorder()
-    return {"traversal": "postorder", "count": len(vehicles), "vehicles": vehicles}
+@router.get("/traversal/postorder", response_model=None)
+async def get_postorder_traversal(
+    request: Request,
+    page: PageParams = Depends(),
+    stream: bool = Query(False, description="Stream vehicles as NDJSON"),
+) -> Response:
+    """Get vehicles in postorder traversal."""
+    if _wants_stream(request, stream):
+        return _stream_response(page.iterate("postorder"))
+    return _cached_json(request, lambda view: page.render("postorder", view, traversal="postorder"))
@@ -1,4 +1,15 @@
 from .bst import BinarySearchTree
 from .bst_node import BSTNode
+from .avl_tree import AVLTree
+from .bplus_tree import BPlusTree
+from .sharded_tree import ShardedTree
+from .vehicle_index import VehicleIndex
+from .tree_factory import create_tree
+from .tree_listener import TreeListener
+from .tree_stats import TreeStats
+from .plate_filter import CountingBloomFilter
+from .price_summary import PriceSummary
+from .secondary_index import SecondaryIndexes
+from .trigram_index import TrigramIndex
 
-__all__ = ["BinarySearchTree", "BSTNode"]
+__all__ = ["BinarySearchTree", "BSTNode", "AVLTree", "BPlusTree", "ShardedTree", "VehicleIndex", "create_tree", "TreeListener", "TreeStats", "CountingBloomFilter", "PriceSummary", "SecondaryIndexes", "TrigramIndex"]
@@ -0,0 +1,83 @@
+from core.bst import BinarySearchTree
+from core.bst_node import BSTNode
+
+
+class AVLTree(BinarySearchTree):
+    """
+    Árbol AVL: un Árbol Binario de Búsqueda auto-balanceado.
+
+    Mantiene la misma API pública que BinarySearchTree (insert, search, update,
+    delete, inorder, preorder, postorder). Las inserciones y eliminaciones
+    iterativas del BST recalculan el camino modificado con _retrace, y aquí
+    _rebalance aplica las rotaciones necesarias en cada nodo de ese camino.
+
+    Propiedad AVL:
+    - Para cada nodo, las alturas de sus subárboles izquierdo y derecho
+      difieren como máximo en 1.
+
+    Gracias a esta propiedad la altura del árbol es O(log n) incluso cuando
+    las placas llegan en orden secuencial, por lo que search, insert y delete
+    tienen complejidad O(log n) garantizada.
+    """
+
+    def _balance_factor(self, node: BSTNode) -> int:
+        """Diferencia de alturas: izquierda - derecha."""
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_right(self, node: BSTNode) -> BSTNode:
+        """
+        Rotación simple a la derecha.
+
+              node            pivot
+             /    \\          /     \\
+          pivot    C   ->   A      node
+          /   \\                    /   \\
+         A     B                  B     C
+        """
+        # Las rotaciones trabajan sobre copias: `node` o `pivot` pueden ser
+        # nodos compartidos con versiones ya publicadas del árbol
+        node = node.copy()
+        pivot = node.left.copy()
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_left(self, node: BSTNode) -> BSTNode:
+        """Rotación simple a la izquierda (simétrica a _rotate_right)."""
+        node = node.copy()
+        pivot = node.right.copy()
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node: BSTNode) -> BSTNode:
+        """
+        Restaura la propiedad AVL en un nodo aplicando la rotación adecuada.
+
+        Casos:
+        - Izquierda-Izquierda: rotación a la derecha
+        - Izquierda-Derecha: rotación a la izquierda del hijo y luego a la derecha
+        - Derecha-Derecha: rotación a la izquierda
+        - Derecha-Izquierda: rotación a la derecha del hijo y luego a la izquierda
+
+        Returns:
+            BSTNode: La nueva raíz del subárbol.
+        """
+        self._update(node)
+        balance = self._balance_factor(node)
+
+        if balance > 1:
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+
+        if balance < -1:
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+
+        return node
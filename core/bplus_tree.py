@@ -0,0 +1,699 @@
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+from models.vehicle import Vehicle
+from models.serialization import vehicle_to_json
+from core.price_summary import PriceSummary, merge, summarize
+from core.record_store import RecordStore
+from core.tree_base import TreeBase
+
+# Hijos por nodo interno y vehículos por hoja si no se indica otra cosa
+DEFAULT_FANOUT = 64
+
+
+class _Leaf:
+    """Hoja: placas ordenadas con sus vehículos y el JSON ya serializado de cada uno."""
+
+    __slots__ = ("keys", "values", "json", "size", "summary")
+
+    def __init__(self, keys: List[str], values: list, json: Optional[List[Optional[bytes]]] = None):
+        self.keys = keys
+        self.values = values
+        self.json = json if json is not None else [None] * len(keys)
+        self.size = len(keys)
+        # Estadísticas de precio, calculadas la primera vez que se piden
+        self.summary: Optional[PriceSummary] = None
+
+
+class _Internal:
+    """
+    Nodo interno: `children[i]` guarda las placas menores que `keys[i]` y
+    mayores o iguales que `keys[i - 1]`. `counts[i]` es la cantidad de
+    vehículos bajo `children[i]`, usada para rank/select y paginación.
+    """
+
+    __slots__ = ("keys", "children", "counts", "size", "summary")
+
+    def __init__(self, keys: List[str], children: list, counts: List[int]):
+        self.keys = keys
+        self.children = children
+        self.counts = counts
+        self.size = sum(counts)
+        # Estadísticas de precio del subárbol, calculadas la primera vez que se piden
+        self.summary: Optional[PriceSummary] = None
+
+
+_Node = Union[_Leaf, _Internal]
+
+
+class BPlusTree(TreeBase):
+    """
+    Árbol B+ de vehículos indexados por placa.
+
+    Los vehículos viven solo en las hojas, en listas ordenadas de hasta
+    `fanout` elementos; los nodos internos guardan placas separadoras y hasta
+    `fanout` hijos. Buscar en un nivel es un bisect sobre una lista (en C), así
+    que una búsqueda hace pocos saltos entre objetos de Python: log_fanout(n)
+    niveles en lugar de log2(n). Los recorridos leen hojas completas con
+    slices, mucho más rápido que visitar un nodo por vehículo.
+
+    Cumple la misma interfaz VehicleIndex que BinarySearchTree, incluido el
+    contrato de versiones: cada escritura copia los nodos del camino que
+    modifica (una hoja y O(log n) nodos internos) y publica la nueva raíz con
+    una asignación atómica. Por eso las hojas no se enlazan entre sí (un
+    enlace obligaría a copiar la hoja vecina en cada escritura); el recorrido
+    pasa de una hoja a la siguiente con una pila de nodos internos.
+
+    Los recorridos preorden y postorden no existen en un árbol B+: lanzan
+    NotImplementedError.
+    """
+
+    def __init__(self, fanout: int = DEFAULT_FANOUT, compact: bool = False, records: Optional[RecordStore] = None):
+        """
+        Inicializa un árbol B+ vacío.
+
+        Args:
+            fanout (int): Máximo de hijos por nodo interno y de vehículos por hoja.
+            compact (bool): Guardar VehicleRecord en lugar de modelos pydantic.
+            records (Optional[RecordStore]): Modo disco: las hojas guardan solo
+                un DiskRef por vehículo y los datos van a este archivo.
+
+        Raises:
+            ValueError: Si el fanout es menor que 4.
+        """
+        if fanout < 4:
+            raise ValueError("B+tree fanout must be at least 4")
+        self.fanout = fanout
+        # Un nodo con menos elementos que esto se combina con un hermano
+        self.min_fill = fanout // 2
+        super().__init__(compact, records)
+        self.root: _Node = _Leaf([], [])
+
+    def _plates(self) -> Iterator[str]:
+        """Placas de la versión publicada, en orden."""
+        return (plate for leaf, first in self._leaves_from(self.root, 0) for plate in leaf.keys)
+
+    def _comparisons(self, plate: str) -> int:
+        """Comparaciones de placas de las búsquedas binarias al descender hasta `plate`."""
+        count = 0
+        node = self.root
+        while True:
+            count += len(node.keys).bit_length()
+            if isinstance(node, _Leaf):
+                return count
+            node = node.children[bisect_right(node.keys, plate)]
+
+    # ----- Búsqueda -----
+
+    def _find_leaf(self, root: _Node, plate: str) -> _Leaf:
+        """Baja desde `root` hasta la hoja donde está o estaría la placa."""
+        node = root
+        while isinstance(node, _Internal):
+            node = node.children[bisect_right(node.keys, plate)]
+        return node
+
+    def search(self, plate: str) -> Optional[Vehicle]:
+        """
+        Busca un vehículo por su placa.
+
+        Complejidad de tiempo: O(log n) - log_fanout(n) niveles con un bisect cada uno
+        """
+        if self.stats is not None and self.stats.should_sample():
+            return self._sampled("search", plate, self._search, plate)
+        return self._search(plate)
+
+    def _search(self, plate: str) -> Optional[Vehicle]:
+        leaf, i = self._locate(plate)
+        return self._load(leaf.values[i]) if leaf is not None else None
+
+    def __contains__(self, plate: str) -> bool:
+        """Indica si la placa está en el árbol, sin materializar el vehículo."""
+        return self._locate(plate)[0] is not None
+
+    def _locate(self, plate: str) -> Tuple[Optional[_Leaf], int]:
+        """
+        Hoja y posición de una placa, o (None, 0) si no está.
+
+        Si el filtro de Bloom está activo, se consulta antes de descender.
+        """
+        bloom = self.filter
+        if bloom is not None and not bloom.might_contain(plate):
+            return None, 0
+        leaf = self._find_leaf(self.root, plate)
+        i = bisect_left(leaf.keys, plate)
+        if i < leaf.size and leaf.keys[i] == plate:
+            return leaf, i
+        if bloom is not None:
+            bloom.record_false_positive()
+        return None, 0
+
+    def _entry_json(self, leaf: _Leaf, i: int) -> bytes:
+        """JSON del vehículo `i` de una hoja, guardado en la hoja salvo en modo compacto o disco."""
+        if self.records is not None:
+            return self.records.read_json(leaf.values[i])
+        data = leaf.json[i]
+        if data is None:
+            data = vehicle_to_json(leaf.values[i])
+            if not self.compact:
+                leaf.json[i] = data
+        return data
+
+    def search_json(self, plate: str) -> Optional[bytes]:
+        """Busca un vehículo por placa y retorna su JSON ya serializado."""
+        leaf, i = self._locate(plate)
+        return self._entry_json(leaf, i) if leaf is not None else None
+
+    # ----- Modificaciones (copy-on-write) -----
+
+    def _descend(self, plate: str, root: Optional[_Node] = None) -> Tuple[List[Tuple[_Internal, int]], _Leaf]:
+        """Camino de (nodo interno, índice del hijo) hasta la hoja de la placa, desde `root` o la raíz publicada."""
+        path: List[Tuple[_Internal, int]] = []
+        node = self.root if root is None else root
+        while isinstance(node, _Internal):
+            i = bisect_right(node.keys, plate)
+            path.append((node, i))
+            node = node.children[i]
+        return path, node
+
+    def _split(self, node: _Node) -> Tuple[List[_Node], List[str]]:
+        """
+        Divide un nodo que superó el fanout en dos mitades.
+
+        Returns:
+            Tuple[List[_Node], List[str]]: Los nodos resultantes (uno o dos) y
+                las placas separadoras entre ellos.
+        """
+        if isinstance(node, _Leaf):
+            if node.size <= self.fanout:
+                return [node], []
+            mid = node.size // 2
+            right = _Leaf(node.keys[mid:], node.values[mid:], node.json[mid:])
+            return [_Leaf(node.keys[:mid], node.values[:mid], node.json[:mid]), right], [right.keys[0]]
+        if len(node.children) <= self.fanout:
+            return [node], []
+        mid = len(node.children) // 2
+        left = _Internal(node.keys[:mid - 1], node.children[:mid], node.counts[:mid])
+        right = _Internal(node.keys[mid:], node.children[mid:], node.counts[mid:])
+        return [left, right], [node.keys[mid - 1]]
+
+    def _rebuild(self, path: List[Tuple[_Internal, int]], nodes: List[_Node], separators: List[str]) -> _Node:
+        """
+        Reemplaza el hijo del final del camino por `nodes` y copia los ancestros.
+
+        Cada ancestro se copia con el hijo nuevo y sus contadores actualizados;
+        si supera el fanout se divide y la división sube al siguiente nivel.
+
+        Returns:
+            _Node: La raíz de la nueva versión.
+        """
+        for parent, i in reversed(path):
+            node = _Internal(
+                parent.keys[:i] + separators + parent.keys[i:],
+                parent.children[:i] + nodes + parent.children[i + 1:],
+                parent.counts[:i] + [child.size for child in nodes] + parent.counts[i + 1:],
+            )
+            nodes, separators = self._split(node)
+        if len(nodes) == 1:
+            return nodes[0]
+        # La raíz se dividió: el árbol crece un nivel
+        return _Internal(separators, nodes, [child.size for child in nodes])
+
+    def _underflows(self, node: _Node) -> bool:
+        if isinstance(node, _Leaf):
+            return node.size < self.min_fill
+        return len(node.children) < self.min_fill
+
+    def _combine(self, left: _Node, right: _Node, separator: str) -> Tuple[List[_Node], List[str]]:
+        """Une dos hermanos vecinos y, si no caben en un nodo, los reparte en dos mitades."""
+        if isinstance(left, _Leaf):
+            node = _Leaf(left.keys + right.keys, left.values + right.values, left.json + right.json)
+        else:
+            node = _Internal(left.keys + [separator] + right.keys, left.children + right.children, left.counts + right.counts)
+        return self._split(node)
+
+    def insert(self, vehicle: Vehicle) -> bool:
+        """
+        Inserta un vehículo en la hoja que le corresponde.
+
+        Copia la hoja con el vehículo nuevo; si supera el fanout se divide en
+        dos y la placa separadora sube al padre, que a su vez puede dividirse.
+
+        Complejidad de tiempo: O(fanout * log_fanout(n))
+
+        Returns:
+            bool: True si se insertó, False si la placa ya existe.
+        """
+        with self._write_lock:
+            if self.stats is not None and self.stats.should_sample():
+                return self._sampled("insert", vehicle.plate, self._insert, vehicle)
+            return self._insert(vehicle)
+
+    def _insert(self, vehicle: Vehicle) -> bool:
+        root, stored = self._insert_into(self.root, vehicle)
+        if stored is None:
+            return False
+        if self.filter is not None:
+            self._filter_add([vehicle.plate])
+        # Publica la nueva versión antes de cambiar el contador
+        self.root = root
+        self.version += 1
+        for listener in self.listeners:
+            # En modo disco se notifica el vehículo recibido, sin releerlo del archivo
+            listener.on_insert(stored if self.records is None else vehicle)
+        return True
+
+    def _insert_into(self, root: _Node, vehicle: Vehicle) -> Tuple[_Node, object]:
+        """
+        Inserta un vehículo en la versión con raíz `root` sin publicar el resultado.
+
+        Returns:
+            Tuple[_Node, object]: La raíz nueva y lo guardado en la hoja, o
+                (root, None) si la placa ya existe.
+        """
+        plate = vehicle.plate
+        path, leaf = self._descend(plate, root)
+        i = bisect_left(leaf.keys, plate)
+        if i < leaf.size and leaf.keys[i] == plate:
+            return root, None
+
+        stored = self._store(vehicle)
+        leaf = _Leaf(
+            leaf.keys[:i] + [plate] + leaf.keys[i:],
+            leaf.values[:i] + [stored] + leaf.values[i:],
+            leaf.json[:i] + [None] + leaf.json[i:],
+        )
+        return self._rebuild(path, *self._split(leaf)), stored
+
+    def delete(self, plate: str) -> bool:
+        """
+        Elimina un vehículo por su placa.
+
+        Si la hoja (o un nodo interno) queda con menos de fanout/2 elementos,
+        se une con un hermano vecino o se reparte con él.
+
+        Complejidad de tiempo: O(fanout * log_fanout(n))
+
+        Returns:
+            bool: True si se eliminó, False si no se encontró.
+        """
+        with self._write_lock:
+            if self.stats is not None and self.stats.should_sample():
+                return self._sampled("delete", plate, self._delete, plate)
+            return self._delete(plate)
+
+    def _delete(self, plate: str) -> bool:
+        path, leaf = self._descend(plate)
+        i = bisect_left(leaf.keys, plate)
+        if i >= leaf.size or leaf.keys[i] != plate:
+            return False
+
+        removed = leaf.values[i]
+        node: _Node = _Leaf(
+            leaf.keys[:i] + leaf.keys[i + 1:],
+            leaf.values[:i] + leaf.values[i + 1:],
+            leaf.json[:i] + leaf.json[i + 1:],
+        )
+        for parent, i in reversed(path):
+            if self._underflows(node) and len(parent.children) > 1:
+                # Combina con el hermano izquierdo (o el derecho si es el primero)
+                low = i - 1 if i > 0 else i
+                left, right = (parent.children[low], node) if low < i else (node, parent.children[i + 1])
+                nodes, separators = self._combine(left, right, parent.keys[low])
+                node = _Internal(
+                    parent.keys[:low] + separators + parent.keys[low + 1:],
+                    parent.children[:low] + nodes + parent.children[low + 2:],
+                    parent.counts[:low] + [child.size for child in nodes] + parent.counts[low + 2:],
+                )
+            else:
+                node = _Internal(
+                    parent.keys,
+                    parent.children[:i] + [node] + parent.children[i + 1:],
+                    parent.counts[:i] + [node.size] + parent.counts[i + 1:],
+                )
+        # Una raíz interna con un solo hijo sobra: el árbol baja un nivel
+        while isinstance(node, _Internal) and len(node.children) == 1:
+            node = node.children[0]
+
+        self.root = node
+        self.version += 1
+        if self.filter is not None:
+            self.filter.remove(plate)
+        for listener in self.listeners:
+            listener.on_delete(removed)
+        return True
+
+    def update(self, plate: str, updated_vehicle: Vehicle) -> bool:
+        """
+        Reemplaza los datos de un vehículo existente, conservando la placa.
+
+        Returns:
+            bool: True si se actualizó, False si el vehículo no existe.
+        """
+        with self._write_lock:
+            path, leaf = self._descend(plate)
+            i = bisect_left(leaf.keys, plate)
+            if i >= leaf.size or leaf.keys[i] != plate:
+                return False
+
+            old = leaf.values[i]
+            if updated_vehicle.plate != plate:
+                updated_vehicle = updated_vehicle.model_copy(update={"plate": plate})
+            stored = self._store(updated_vehicle)
+            leaf = _Leaf(
+                leaf.keys,
+                leaf.values[:i] + [stored] + leaf.values[i + 1:],
+                # El JSON guardado corresponde a la versión anterior
+                leaf.json[:i] + [None] + leaf.json[i + 1:],
+            )
+            self.root = self._rebuild(path, [leaf], [])
+            self.version += 1
+            for listener in self.listeners:
+                listener.on_update(old, stored if self.records is None else updated_vehicle)
+            return True
+
+    def bulk_load(self, vehicles: Iterable[Vehicle], presorted: bool = False) -> int:
+        """
+        Carga muchos vehículos de una vez construyendo el árbol por niveles.
+
+        Mezcla los vehículos nuevos con los existentes (los existentes ganan
+        ante placas repetidas) y arma hojas llenas de forma pareja, luego cada
+        nivel interno, sin dividir nodos. Si llegan pocos vehículos comparados
+        con los que ya hay, se insertan uno por uno copiando caminos.
+
+        Complejidad de tiempo: O(n) si vienen ordenados, O(n log n) si no;
+        O(m log n) para m vehículos pocos frente a los n existentes
+
+        Returns:
+            int: Cantidad de vehículos nuevos agregados.
+        """
+        incoming = list(vehicles)
+        if not presorted:
+            # sort es estable: entre placas repetidas queda primero la original
+            incoming.sort(key=attrgetter("plate"))
+
+        with self._write_lock:
+            added: list = []
+            if self._merges_incrementally(len(incoming)):
+                # Pocos vehículos: se insertan sobre copias de sus caminos
+                root = self.root
+                for vehicle in incoming:
+                    root, stored = self._insert_into(root, vehicle)
+                    if stored is not None:
+                        added.append(stored if self.records is None else vehicle)
+                return self._publish_bulk(root, added)
+
+            existing = [value for leaf, first in self._leaves_from(self.root, 0) for value in leaf.values]
+            merged: list = []
+            i = 0
+            for vehicle in incoming:
+                while i < len(existing) and existing[i].plate < vehicle.plate:
+                    merged.append(existing[i])
+                    i += 1
+                if i < len(existing) and existing[i].plate == vehicle.plate:
+                    continue
+                if merged and merged[-1].plate == vehicle.plate:
+                    continue
+                stored = self._store(vehicle)
+                merged.append(stored)
+                added.append(stored if self.records is None else vehicle)
+            merged.extend(existing[i:])
+            return self._publish_bulk(self._build(merged), added)
+
+    def _chunks(self, count: int) -> List[Tuple[int, int]]:
+        """Reparte `count` elementos en la menor cantidad de grupos de hasta fanout, de tamaño parejo."""
+        groups = max(1, -(-count // self.fanout))
+        return [(count * g // groups, count * (g + 1) // groups) for g in range(groups)]
+
+    def _build(self, values: list) -> _Node:
+        """Construye un árbol nuevo a partir de valores ordenados por placa sin duplicados."""
+        keys = [value.plate for value in values]
+        nodes: List[_Node] = [_Leaf(keys[a:b], values[a:b]) for a, b in self._chunks(len(values))]
+        lows = [keys[a] if a < b else "" for a, b in self._chunks(len(values))]
+        while len(nodes) > 1:
+            parents = []
+            parent_lows = []
+            for a, b in self._chunks(len(nodes)):
+                children = nodes[a:b]
+                parents.append(_Internal(lows[a + 1:b], children, [child.size for child in children]))
+                parent_lows.append(lows[a])
+            nodes, lows = parents, parent_lows
+        return nodes[0]
+
+    # ----- Estadísticas de orden -----
+
+    def height(self) -> int:
+        """Cantidad de niveles del árbol (0 si está vacío)."""
+        node = self.root
+        if node.size == 0:
+            return 0
+        levels = 1
+        while isinstance(node, _Internal):
+            node = node.children[0]
+            levels += 1
+        return levels
+
+    def average_depth(self) -> float:
+        """Niveles visitados por una búsqueda exitosa: todas las hojas están a la misma profundidad."""
+        return float(self.height())
+
+    def __len__(self) -> int:
+        """Cantidad de vehículos del árbol. Complejidad de tiempo: O(1)"""
+        return self.root.size
+
+    def _rank(self, root: _Node, plate: str) -> int:
+        position = 0
+        node = root
+        while isinstance(node, _Internal):
+            i = bisect_right(node.keys, plate)
+            position += sum(node.counts[:i])
+            node = node.children[i]
+        return position + bisect_left(node.keys, plate)
+
+    def rank(self, plate: str) -> int:
+        """Cantidad de vehículos con placa menor que la dada. Complejidad de tiempo: O(fanout * log n)"""
+        return self._rank(self.root, plate)
+
+    def _select(self, root: _Node, index: int) -> Vehicle:
+        if not 0 <= index < root.size:
+            raise IndexError("tree index out of range")
+        node = root
+        while isinstance(node, _Internal):
+            i = 0
+            while index >= node.counts[i]:
+                index -= node.counts[i]
+                i += 1
+            node = node.children[i]
+        return self._load(node.values[index])
+
+    def select(self, index: int) -> Vehicle:
+        """
+        Retorna el vehículo en la posición `index` del orden de placas.
+
+        Raises:
+            IndexError: Si la posición está fuera del árbol.
+        """
+        return self._select(self.root, index)
+
+    def floor(self, plate: str) -> Optional[Vehicle]:
+        """Vehículo con la mayor placa menor o igual a la dada, o None."""
+        root = self.root
+        # Posición siguiente a la última placa <= plate
+        position = self._rank(root, plate + "\0")
+        return self._select(root, position - 1) if position > 0 else None
+
+    def ceiling(self, plate: str) -> Optional[Vehicle]:
+        """Vehículo con la menor placa mayor o igual a la dada, o None."""
+        root = self.root
+        position = self._rank(root, plate)
+        return self._select(root, position) if position < root.size else None
+
+    def range(self, low: Optional[str] = None, high: Optional[str] = None) -> Iterator[Vehicle]:
+        """Generador de los vehículos con placa entre `low` y `high` (ambos inclusive)."""
+        return self.iter_inorder(low=low, high=high)
+
+    def count_range(self, low: Optional[str] = None, high: Optional[str] = None) -> int:
+        """Cuenta los vehículos con placa entre `low` y `high` (ambos inclusive)."""
+        root = self.root
+        first = self._rank(root, low) if low is not None else 0
+        # Placas <= high: ninguna cadena queda entre high y high + "\0"
+        last = self._rank(root, high + "\0") if high is not None else root.size
+        return max(0, last - first)
+
+    # ----- Estadísticas de precio -----
+
+    def _summary(self, node: _Node) -> PriceSummary:
+        """
+        Estadísticas de precio de un subárbol, guardadas en el nodo.
+
+        Los nodos publicados no cambian, así que el resumen se calcula una
+        sola vez por nodo: tras una escritura solo se recalculan los nodos
+        nuevos del camino copiado, y no se agrega costo a las escrituras.
+        """
+        summary = node.summary
+        if summary is None:
+            if isinstance(node, _Leaf):
+                summary = PriceSummary.of([value.price for value in node.values])
+            else:
+                summary = merge(self._summary(child) for child in node.children)
+            node.summary = summary
+        return summary
+
+    def _range_summary(self, node: _Node, low: Optional[str], high: Optional[str]) -> PriceSummary:
+        """Estadísticas de los vehículos de un subárbol con placa entre `low` y `high`."""
+        if low is None and high is None:
+            return self._summary(node)
+        if isinstance(node, _Leaf):
+            first = bisect_left(node.keys, low) if low is not None else 0
+            end = bisect_right(node.keys, high) if high is not None else node.size
+            return PriceSummary.of([value.price for value in node.values[first:end]])
+        first = bisect_right(node.keys, low) if low is not None else 0
+        last = bisect_right(node.keys, high) if high is not None else len(node.children) - 1
+        if first == last:
+            return self._range_summary(node.children[first], low, high)
+        # Los hijos entre los dos bordes están completos dentro del rango
+        return merge(chain(
+            [self._range_summary(node.children[first], low, None)],
+            (self._summary(child) for child in node.children[first + 1:last]),
+            [self._range_summary(node.children[last], None, high)],
+        ))
+
+    def price_stats(self, low: Optional[str] = None, high: Optional[str] = None) -> PriceSummary:
+        """
+        Cantidad, suma, mínimo y máximo de precio de los vehículos con placa entre `low` y `high`.
+
+        Combina los resúmenes de los hijos completamente dentro del rango y
+        solo baja por los dos bordes.
+
+        Complejidad de tiempo: O(fanout * log_fanout(n)) una vez calculados los resúmenes
+        """
+        if low is not None and high is not None and low > high:
+            return PriceSummary()
+        return self._range_summary(self.root, low, high)
+
+    def recompute_price_stats(self, low: Optional[str] = None, high: Optional[str] = None) -> PriceSummary:
+        """Las mismas estadísticas que price_stats, recorriendo todos los vehículos del rango."""
+        return summarize(
+            value.price for leaf, first, end in self._entries(0, low, high) for value in leaf.values[first:end]
+        )
+
+    # ----- Recorridos -----
+
+    def _leaves_from(self, root: _Node, start: int) -> Iterator[Tuple[_Leaf, int]]:
+        """
+        Generador de (hoja, primera posición) desde el vehículo número `start`.
+
+        Baja usando los contadores de los hijos hasta la hoja que contiene la
+        posición `start`; después avanza de hoja en hoja con una pila de
+        (nodo interno, índice del hijo actual).
+        """
+        stack: List[Tuple[_Internal, int]] = []
+        node = root
+        while isinstance(node, _Internal):
+            i = 0
+            last = len(node.children) - 1
+            while i < last and start >= node.counts[i]:
+                start -= node.counts[i]
+                i += 1
+            stack.append((node, i))
+            node = node.children[i]
+        yield node, start
+
+        while stack:
+            parent, i = stack.pop()
+            i += 1
+            if i < len(parent.children):
+                stack.append((parent, i))
+                node = parent.children[i]
+                while isinstance(node, _Internal):
+                    stack.append((node, 0))
+                    node = node.children[0]
+                yield node, 0
+
+    def _entries(
+        self, start: int, low: Optional[str], high: Optional[str]
+    ) -> Iterator[Tuple[_Leaf, int, int]]:
+        """Generador de (hoja, desde, hasta) con los tramos de hojas del recorrido inorden."""
+        root = self.root
+        if low is not None:
+            start += self._rank(root, low)
+        for leaf, first in self._leaves_from(root, start):
+            end = leaf.size if high is None else bisect_right(leaf.keys, high)
+            if first < end:
+                yield leaf, first, end
+            if end < leaf.size:
+                return
+
+    def iter_inorder(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Vehicle]:
+        """
+        Generador de los vehículos en orden de placa.
+
+        Salta directamente al vehículo número `start` (sumando el rank de
+        `low`) y termina al pasar de `high`. Cada hoja se lee con un slice.
+        """
+        for leaf, first, end in self._entries(start, low, high):
+            if self.compact:
+                for value in leaf.values[first:end]:
+                    yield self._load(value, cache=False)
+            else:
+                yield from leaf.values[first:end]
+
+    def iter_json(
+        self, order: str = "inorder", start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        Generador con el JSON de cada vehículo en orden de placa.
+
+        Raises:
+            NotImplementedError: Si se pide preorden o postorden.
+            ValueError: Si el recorrido no existe.
+        """
+        if order in ("preorder", "postorder"):
+            self._no_tree_order(order)
+        if order != "inorder":
+            raise ValueError(f"Unknown traversal '{order}'")
+        return self._iter_json(start, low, high)
+
+    def _iter_json(self, start: int, low: Optional[str], high: Optional[str]) -> Iterator[bytes]:
+        for leaf, first, end in self._entries(start, low, high):
+            for i in range(first, end):
+                yield self._entry_json(leaf, i)
+
+    def iter_json_items(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Generador de pares (placa, JSON) en orden de placa, para mezclar varios índices."""
+        for leaf, first, end in self._entries(start, low, high):
+            keys = leaf.keys
+            for i in range(first, end):
+                yield keys[i], self._entry_json(leaf, i)
+
+    @staticmethod
+    def _no_tree_order(order: str):
+        raise NotImplementedError(f"{order} traversal is not available on the B+tree engine")
+
+    def iter_preorder(self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None) -> Iterator[Vehicle]:
+        """No disponible: los vehículos viven solo en las hojas. Lanza NotImplementedError."""
+        self._no_tree_order("preorder")
+
+    def iter_postorder(self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None) -> Iterator[Vehicle]:
+        """No disponible: los vehículos viven solo en las hojas. Lanza NotImplementedError."""
+        self._no_tree_order("postorder")
+
+    def inorder(self) -> List[Vehicle]:
+        """Lista de vehículos ordenados por placa."""
+        return list(self.iter_inorder())
+
+    def preorder(self) -> List[Vehicle]:
+        """No disponible en un árbol B+. Lanza NotImplementedError."""
+        self._no_tree_order("preorder")
+
+    def postorder(self) -> List[Vehicle]:
+        """No disponible en un árbol B+. Lanza NotImplementedError."""
+        self._no_tree_order("postorder")
+
+    def get_all(self) -> List[Vehicle]:
+        """Todos los vehículos ordenados por placa."""
+        return self.inorder()
@@ -1,12 +1,18 @@
-from typing import Optional, List
+from operator import attrgetter
+from typing import Iterable, Iterator, Optional, List, Tuple
 from models.vehicle import Vehicle
+from models.serialization import vehicle_to_json
 from core.bst_node import BSTNode
+from core.price_summary import PriceSummary, summarize
+from core.record_store import RecordStore
+from core.tree_base import TreeBase
+
 
 class Motorcycle:
     pass
 
 
-class BinarySearchTree:
+class BinarySearchTree(TreeBase):
     """
     Implementación de un Árbol Binario de Búsqueda (BST) para gestionar vehículos.
     
@@ -19,25 +25,64 @@ class BinarySearchTree:
     - Para cada nodo, todos los valores en el subárbol izquierdo son menores
     - Para cada nodo, todos los valores en el subárbol derecho son mayores
     - No hay duplicados (cada placa es única)
+    
+    Versiones persistentes (MVCC):
+    Las modificaciones nunca cambian un nodo alcanzable desde la raíz publicada.
+    Copian los nodos del camino que modifican (path copying), arman la nueva
+    versión sobre las copias y la publican al final asignando self.root, una
+    operación atómica. Los lectores que ya tomaron la raíz anterior siguen
+    recorriendo esa versión completa y estable, sin bloqueos. Los escritores
+    se serializan entre sí con un lock.
     """
 
-    def __init__(self):
+    def __init__(self, compact: bool = False, records: Optional[RecordStore] = None):
         """
         Inicializa un árbol binario de búsqueda vacío.
         
+        Args:
+            compact (bool): Si es True, los nodos guardan VehicleRecord (tuplas
+                con cadenas internadas) en lugar de modelos pydantic, y los
+                Vehicle se construyen solo al devolverlos.
+            records (Optional[RecordStore]): Modo disco: los vehículos se
+                escriben en este archivo y los nodos guardan solo un DiskRef
+                (placa, precio y posición). Implica el modo compacto.
+        
         Atributos:
             root (Optional[BSTNode]): La raíz del árbol. Inicialmente es None.
+            El resto (listeners, compact, records, version, stats, filter)
+            se describe en TreeBase.
         """
+        super().__init__(compact, records)
         self.root: Optional[BSTNode] = None
 
+    def _plates(self) -> Iterator[str]:
+        """Placas de la versión publicada, en orden."""
+        return (node.vehicle.plate for node in self._inorder_nodes(self.root))
+
+    def _comparisons(self, plate: str) -> int:
+        """Cantidad de nodos comparados al descender buscando `plate`."""
+        count = 0
+        node = self.root
+        while node is not None:
+            count += 1
+            if plate < node.vehicle.plate:
+                node = node.left
+            elif plate > node.vehicle.plate:
+                node = node.right
+            else:
+                break
+        return count
+
     def insert(self, vehicle: Vehicle) -> bool:
         """
         Inserta un vehículo en el árbol binario de búsqueda.
         
         Si el árbol está vacío, el vehículo se convierte en la raíz.
-        Si no, se llama a la función recursiva para encontrar la posición correcta.
+        Si no, desciende iterativamente guardando el camino recorrido hasta
+        encontrar la posición correcta, y luego recalcula los nodos de ese camino.
         
         Complejidad de tiempo: O(log n) en promedio, O(n) en el peor caso
+        Complejidad de espacio: O(h) - el camino desde la raíz (sin recursión)
         
         Args:
             vehicle (Vehicle): El vehículo a insertar con su placa única.
@@ -52,42 +97,63 @@ class BinarySearchTree:
             >>> bst.insert(vehicle)
             True
         """
-        if self.root is None:
-            self.root = BSTNode(vehicle)
-            return True
-        return self._insert_recursive(self.root, vehicle)
+        with self._write_lock:
+            if self.stats is not None and self.stats.should_sample():
+                return self._sampled("insert", vehicle.plate, self._insert, vehicle)
+            return self._insert(vehicle)
+
+    def _insert(self, vehicle: Vehicle) -> bool:
+        """Implementación de insert, sin lock ni medición."""
+        root, stored = self._insert_into(self.root, vehicle)
+        if stored is None:
+            return False
+        if self.filter is not None:
+            self._filter_add([vehicle.plate])
+        # Publica la nueva versión antes de cambiar el contador
+        self.root = root
+        self.version += 1
+        for listener in self.listeners:
+            # En modo disco se notifica el vehículo recibido, sin releerlo del archivo
+            listener.on_insert(stored if self.records is None else vehicle)
+        return True
 
-    def _insert_recursive(self, node: BSTNode, vehicle: Vehicle) -> bool:
+    def _insert_into(self, root: Optional[BSTNode], vehicle: Vehicle) -> Tuple[Optional[BSTNode], object]:
         """
-        Función auxiliar recursiva para insertar un vehículo en el árbol.
+        Inserta un vehículo en la versión con raíz `root` sin publicar el resultado.
         
-        Compara la placa del vehículo con la del nodo actual:
-        - Si es menor, intenta insertar en el subárbol izquierdo
-        - Si es mayor, intenta insertar en el subárbol derecho
-        - Si es igual, retorna False (placa duplicada)
-        
-        Args:
-            node (BSTNode): El nodo actual donde se está evaluando la inserción.
-            vehicle (Vehicle): El vehículo a insertar.
+        Copia el camino desde `root`, así que ningún nodo de esa versión cambia.
         
         Returns:
-            bool: True si se insertó, False si la placa ya existe.
-        """
-        if vehicle.plate < node.vehicle.plate:
-            # La placa es menor, va al lado izquierdo
-            if node.left is None:
-                node.left = BSTNode(vehicle)
-                return True
-            return self._insert_recursive(node.left, vehicle)
-        elif vehicle.plate > node.vehicle.plate:
-            # La placa es mayor, va al lado derecho
-            if node.right is None:
-                node.right = BSTNode(vehicle)
-                return True
-            return self._insert_recursive(node.right, vehicle)
+            Tuple[Optional[BSTNode], object]: La raíz de la versión nueva y lo
+                que se guardó en el nodo, o (root, None) si la placa ya existe.
+        """
+        plate = vehicle.plate
+        path: List[BSTNode] = []
+        node = root
+        while node is not None:
+            path.append(node)
+            if plate < node.vehicle.plate:
+                # La placa es menor, va al lado izquierdo
+                node = node.left
+            elif plate > node.vehicle.plate:
+                # La placa es mayor, va al lado derecho
+                node = node.right
+            else:
+                # La placa ya existe en el árbol
+                return root, None
+
+        stored = self._store(vehicle)
+        new_node = BSTNode(stored)
+        if not path:
+            return new_node, stored
+        # Se trabaja sobre copias del camino; la versión publicada no cambia
+        path = self._copy_path(path)
+        parent = path[-1]
+        if plate < parent.vehicle.plate:
+            parent.left = new_node
         else:
-            # La placa ya existe en el árbol
-            return False
+            parent.right = new_node
+        return self._retrace(path), stored
 
     def search(self, plate: str) -> Optional[Vehicle]:
         """
@@ -106,37 +172,53 @@ class BinarySearchTree:
             >>> if vehicle:
             ...     print(f"Encontrado: {vehicle.brand} {vehicle.model}")
         """
-        node = self._search_recursive(self.root, plate)
-        return node.vehicle if node else None
+        if self.stats is not None and self.stats.should_sample():
+            node = self._sampled("search", plate, self._find_node, plate)
+        else:
+            node = self._find_node(plate)
+        return self._load(node.vehicle) if node else None
 
-    def _search_recursive(self, node: Optional[BSTNode], plate: str) -> Optional[BSTNode]:
+    def __contains__(self, plate: str) -> bool:
         """
-        Función auxiliar recursiva para buscar un vehículo por placa.
+        Indica si la placa está en el árbol, sin materializar el vehículo.
+        
+        En modo disco no lee el archivo de registros: basta la placa del nodo.
+        """
+        return self._find_node(plate) is not None
+
+    def _find_node(self, plate: str) -> Optional[BSTNode]:
+        """
+        Función auxiliar iterativa para buscar el nodo de una placa.
         
         Navega por el árbol comparando la placa buscada con la del nodo actual:
-        - Si es menor, busca en el subárbol izquierdo
-        - Si es mayor, busca en el subárbol derecho
+        - Si es menor, continúa por el subárbol izquierdo
+        - Si es mayor, continúa por el subárbol derecho
         - Si es igual, retorna el nodo encontrado
         
+        Si el filtro de Bloom está activo, se consulta antes: una placa que
+        el filtro descarta no está en el árbol y no hace falta descender.
+        
         Args:
-            node (Optional[BSTNode]): El nodo actual en la búsqueda.
             plate (str): La placa a buscar.
         
         Returns:
             Optional[BSTNode]: El nodo con la placa, o None si no existe.
         """
-        if node is None:
+        bloom = self.filter
+        if bloom is not None and not bloom.might_contain(plate):
             return None
-
-        if plate < node.vehicle.plate:
-            # Buscar en el subárbol izquierdo
-            return self._search_recursive(node.left, plate)
-        elif plate > node.vehicle.plate:
-            # Buscar en el subárbol derecho
-            return self._search_recursive(node.right, plate)
-        else:
-            # Placa encontrada
-            return node
+        node = self.root
+        while node is not None:
+            if plate < node.vehicle.plate:
+                node = node.left
+            elif plate > node.vehicle.plate:
+                node = node.right
+            else:
+                # Placa encontrada
+                return node
+        if bloom is not None:
+            bloom.record_false_positive()
+        return None
 
     def delete(self, plate: str) -> bool:
         """
@@ -147,6 +229,9 @@ class BinarySearchTree:
         2. Nodo con un hijo: Se reemplaza por su hijo
         3. Nodo con dos hijos: Se reemplaza por el sucesor inorden (mínimo del subárbol derecho)
         
+        El descenso es iterativo y guarda el camino recorrido, que luego se
+        recalcula de abajo hacia arriba con _retrace.
+        
         Complejidad de tiempo: O(log n) en promedio, O(n) en el peor caso
         
         Args:
@@ -159,66 +244,448 @@ class BinarySearchTree:
             >>> bst.delete("ABC-123")
             True
         """
-        self.root, deleted = self._delete_recursive(self.root, plate)
-        return deleted
+        with self._write_lock:
+            if self.stats is not None and self.stats.should_sample():
+                return self._sampled("delete", plate, self._delete, plate)
+            return self._delete(plate)
+
+    def _delete(self, plate: str) -> bool:
+        """Implementación de delete, sin lock ni medición."""
+        path: List[BSTNode] = []
+        node = self.root
+        while node is not None and node.vehicle.plate != plate:
+            path.append(node)
+            node = node.left if plate < node.vehicle.plate else node.right
+
+        if node is None:
+            return False
 
-    def _delete_recursive(self, node: Optional[BSTNode], plate: str) -> tuple[Optional[BSTNode], bool]:
+        removed = node.vehicle
+        target = len(path)
+        if node.left is not None and node.right is not None:
+            # Caso 3: Nodo con dos hijos
+            # Encuentra el sucesor inorden (el mínimo del subárbol derecho)
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            # El sucesor no tiene hijo izquierdo: se elimina con el caso 1 o 2
+            node = successor
+
+        # Se trabaja sobre copias del camino; la versión publicada no cambia
+        path = self._copy_path(path)
+        # Caso 1 y 2: el nodo se reemplaza por su único hijo (o por None si es hoja)
+        child = node.left if node.left is not None else node.right
+        if not path:
+            root = child
+        else:
+            if target < len(path):
+                # Caso 3: la copia del nodo eliminado toma el vehículo del sucesor
+                path[target].vehicle = node.vehicle
+                path[target].json = node.json
+            self._replace_child(path[-1], node, child)
+            root = self._retrace(path)
+
+        # Publica la nueva versión antes de cambiar el contador
+        self.root = root
+        self.version += 1
+        if self.filter is not None:
+            self.filter.remove(plate)
+        for listener in self.listeners:
+            listener.on_delete(removed)
+        return True
+
+    def _copy_path(self, path: List[BSTNode]) -> List[BSTNode]:
         """
-        Función auxiliar recursiva para eliminar un vehículo del árbol.
+        Copia los nodos de un camino y enlaza cada copia con la siguiente.
         
-        Proceso:
-        1. Navega hasta encontrar el nodo con la placa
-        2. Maneja los tres casos de eliminación
-        3. Retorna el árbol modificado y un booleano indicando si se eliminó
+        Los subárboles que salen del camino se comparten con la versión
+        anterior; solo los O(h) nodos del camino se duplican.
         
         Args:
-            node (Optional[BSTNode]): El nodo actual en la búsqueda.
-            plate (str): La placa del vehículo a eliminar.
+            path (List[BSTNode]): Nodos desde la raíz, cada uno hijo del anterior.
         
         Returns:
-            tuple[Optional[BSTNode], bool]: El árbol actualizado y si se eliminó.
+            List[BSTNode]: Las copias, en el mismo orden.
         """
-        if node is None:
-            return None, False
-
-        if plate < node.vehicle.plate:
-            # El nodo a eliminar está en el subárbol izquierdo
-            node.left, deleted = self._delete_recursive(node.left, plate)
-            return node, deleted
-        elif plate > node.vehicle.plate:
-            # El nodo a eliminar está en el subárbol derecho
-            node.right, deleted = self._delete_recursive(node.right, plate)
-            return node, deleted
+        copies = [node.copy() for node in path]
+        for parent, old, new in zip(copies, path[1:], copies[1:]):
+            if parent.left is old:
+                parent.left = new
+            else:
+                parent.right = new
+        return copies
+
+    def _replace_child(self, parent: BSTNode, old: BSTNode, new: Optional[BSTNode]) -> None:
+        """
+        Sustituye el hijo `old` de `parent` por `new`.
+        
+        Args:
+            parent (BSTNode): El padre de `old` (una copia, nunca un nodo publicado).
+            old (BSTNode): El hijo actual.
+            new (Optional[BSTNode]): El nuevo hijo.
+        """
+        if parent.left is old:
+            parent.left = new
         else:
-            # Nodo a eliminar encontrado
-            
-            # Caso 1: Nodo sin hijos (hoja)
-            if node.left is None and node.right is None:
-                return None, True
-            
-            # Caso 2: Nodo con solo hijo derecho
-            if node.left is None:
-                return node.right, True
-            
-            # Caso 2: Nodo con solo hijo izquierdo
-            if node.right is None:
-                return node.left, True
-            
-            # Caso 3: Nodo con dos hijos
-            # Encuentra el sucesor inorden (el mínimo del subárbol derecho)
-            min_node = self._find_min(node.right)
-            # Reemplaza el vehículo del nodo actual con el del sucesor
-            node.vehicle = min_node.vehicle
-            # Elimina el sucesor del subárbol derecho
-            node.right, _ = self._delete_recursive(node.right, min_node.vehicle.plate)
-            return node, True
+            parent.right = new
+
+    def _retrace(self, path: List[BSTNode]) -> BSTNode:
+        """
+        Recalcula los nodos de un camino desde el más profundo hasta la raíz.
+        
+        Cada nodo pasa por _rebalance; si este devuelve una nueva raíz para el
+        subárbol (por ejemplo tras una rotación), se enlaza con el padre.
+        
+        Args:
+            path (List[BSTNode]): Copias de los nodos desde la raíz hasta el punto modificado.
+        
+        Returns:
+            BSTNode: La raíz de la nueva versión, lista para publicarse.
+        """
+        subtree = path[0]
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree = self._rebalance(node)
+            if subtree is not node and i > 0:
+                self._replace_child(path[i - 1], node, subtree)
+        return subtree
+
+    def _rebalance(self, node: BSTNode) -> BSTNode:
+        """
+        Punto de extensión para los motores balanceados.
+        
+        El BST simple no rota: solo actualiza los datos derivados del nodo.
+        
+        Args:
+            node (BSTNode): El nodo a recalcular.
+        
+        Returns:
+            BSTNode: La raíz del subárbol (el mismo nodo en el BST simple).
+        """
+        self._update(node)
+        return node
+
+    @staticmethod
+    def _height(node: Optional[BSTNode]) -> int:
+        """Retorna la altura de un subárbol (0 si está vacío)."""
+        return node.height if node is not None else 0
+
+    @staticmethod
+    def _size(node: Optional[BSTNode]) -> int:
+        """Retorna la cantidad de nodos de un subárbol (0 si está vacío)."""
+        return node.size if node is not None else 0
+
+    def _update(self, node: BSTNode) -> None:
+        """
+        Recalcula los datos derivados de un nodo a partir de sus hijos.
+        
+        Son la altura, el tamaño, la longitud de caminos y los agregados de
+        precio (suma, mínimo y máximo). Como solo dependen del nodo y de sus
+        hijos, cada escritura los corrige recalculando los nodos del camino
+        modificado, y las rotaciones recalculando los dos nodos que mueven.
+        """
+        left, right = node.left, node.right
+        height = size = 1
+        path_length = 0
+        total = low = high = node.vehicle.price
+        if left is not None:
+            height += left.height
+            size += left.size
+            # Cada nodo de los hijos queda un nivel más abajo al colgar de este nodo
+            path_length += left.path_length + left.size
+            total += left.price_total
+            if left.price_min < low:
+                low = left.price_min
+            if left.price_max > high:
+                high = left.price_max
+        if right is not None:
+            if right.height >= height:
+                height = right.height + 1
+            size += right.size
+            path_length += right.path_length + right.size
+            total += right.price_total
+            if right.price_min < low:
+                low = right.price_min
+            if right.price_max > high:
+                high = right.price_max
+        node.height = height
+        node.size = size
+        node.path_length = path_length
+        node.price_total = total
+        node.price_min = low
+        node.price_max = high
+
+    @staticmethod
+    def _update_price_range(node: BSTNode) -> None:
+        """Recalcula el precio mínimo y máximo de un nodo a partir de sus hijos."""
+        low = high = node.vehicle.price
+        for child in (node.left, node.right):
+            if child is not None:
+                low = min(low, child.price_min)
+                high = max(high, child.price_max)
+        node.price_min = low
+        node.price_max = high
+
+    def height(self) -> int:
+        """
+        Retorna la altura del árbol (0 si está vacío).
+        
+        Complejidad de tiempo: O(1) - la altura se mantiene en cada nodo
+        """
+        return self._height(self.root)
+
+    def average_depth(self) -> float:
+        """
+        Retorna la profundidad promedio de los nodos (la raíz tiene profundidad 1).
+        
+        Es el costo promedio de una búsqueda exitosa: cerca de log2(n) en un
+        árbol balanceado y de n/2 si el árbol degeneró en una lista.
+        
+        Complejidad de tiempo: O(1) - la longitud de caminos se mantiene en cada nodo
+        """
+        root = self.root
+        if root is None:
+            return 0.0
+        return 1 + root.path_length / root.size
+
+    def __len__(self) -> int:
+        """
+        Retorna la cantidad de vehículos del árbol.
+        
+        Complejidad de tiempo: O(1) - el tamaño se mantiene en cada nodo
+        """
+        return self._size(self.root)
+
+    def rank(self, plate: str) -> int:
+        """
+        Cuenta cuántos vehículos tienen una placa menor que la dada.
+        
+        Usa el tamaño de los subárboles: cada vez que se baja a la derecha se
+        suman el subárbol izquierdo y el nodo actual.
+        
+        Complejidad de tiempo: O(h)
+        
+        Args:
+            plate (str): La placa de referencia (no tiene que existir).
+        
+        Returns:
+            int: La posición (desde 0) que ocupa o ocuparía la placa en inorden.
+        
+        Ejemplo:
+            >>> bst.rank("ABC-123")
+            0
+        """
+        return self._rank(self.root, plate)
+
+    def _rank(self, root: Optional[BSTNode], plate: str) -> int:
+        """Implementación de rank sobre el subárbol con raíz `root`."""
+        position = 0
+        node = root
+        while node is not None:
+            if plate < node.vehicle.plate:
+                node = node.left
+            elif plate > node.vehicle.plate:
+                position += self._size(node.left) + 1
+                node = node.right
+            else:
+                return position + self._size(node.left)
+        return position
+
+    def select(self, index: int) -> Vehicle:
+        """
+        Retorna el vehículo que ocupa la posición `index` en inorden.
+        
+        Complejidad de tiempo: O(h)
+        
+        Args:
+            index (int): Posición desde 0 en el orden de placas.
+        
+        Returns:
+            Vehicle: El vehículo en esa posición.
+        
+        Raises:
+            IndexError: Si la posición está fuera del árbol.
+        
+        Ejemplo:
+            >>> bst.select(0).plate  # la placa menor
+            'ABC-123'
+        """
+        node = self.root
+        if not 0 <= index < self._size(node):
+            raise IndexError("tree index out of range")
+        while True:
+            left_size = self._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index > left_size:
+                index -= left_size + 1
+                node = node.right
+            else:
+                return self._load(node.vehicle)
+
+    def floor(self, plate: str) -> Optional[Vehicle]:
+        """
+        Retorna el vehículo con la mayor placa menor o igual a la dada.
+        
+        Complejidad de tiempo: O(h)
+        
+        Args:
+            plate (str): La placa de referencia.
+        
+        Returns:
+            Optional[Vehicle]: El vehículo encontrado, o None si no hay ninguno.
+        """
+        result: Optional[BSTNode] = None
+        node = self.root
+        while node is not None:
+            if plate < node.vehicle.plate:
+                node = node.left
+            else:
+                result = node
+                if plate == node.vehicle.plate:
+                    break
+                node = node.right
+        return self._load(result.vehicle) if result else None
+
+    def ceiling(self, plate: str) -> Optional[Vehicle]:
+        """
+        Retorna el vehículo con la menor placa mayor o igual a la dada.
+        
+        Complejidad de tiempo: O(h)
+        
+        Args:
+            plate (str): La placa de referencia.
+        
+        Returns:
+            Optional[Vehicle]: El vehículo encontrado, o None si no hay ninguno.
+        """
+        result: Optional[BSTNode] = None
+        node = self.root
+        while node is not None:
+            if plate > node.vehicle.plate:
+                node = node.right
+            else:
+                result = node
+                if plate == node.vehicle.plate:
+                    break
+                node = node.left
+        return self._load(result.vehicle) if result else None
+
+    def range(self, low: Optional[str] = None, high: Optional[str] = None) -> Iterator[Vehicle]:
+        """
+        Generador de los vehículos con placa entre `low` y `high` (ambos inclusive).
+        
+        Complejidad de tiempo: O(h + k) - donde k es la cantidad de resultados
+        
+        Args:
+            low (Optional[str]): Placa mínima, o None para empezar desde el inicio.
+            high (Optional[str]): Placa máxima, o None para llegar hasta el final.
+        
+        Ejemplo:
+            >>> [v.plate for v in bst.range("A", "C")]
+            ['ABC-123', 'BCD-234']
+        """
+        return self.iter_inorder(low=low, high=high)
+
+    def count_range(self, low: Optional[str] = None, high: Optional[str] = None) -> int:
+        """
+        Cuenta los vehículos con placa entre `low` y `high` (ambos inclusive).
+        
+        Complejidad de tiempo: O(h)
+        """
+        root = self.root
+        first = self._rank(root, low) if low is not None else 0
+        if high is None:
+            last = self._size(root)
+        else:
+            # Placas <= high: ninguna cadena queda entre high y high + "\0"
+            last = self._rank(root, high + "\0")
+        return max(0, last - first)
+
+    def price_stats(self, low: Optional[str] = None, high: Optional[str] = None) -> PriceSummary:
+        """
+        Cantidad, suma, mínimo y máximo de precio de los vehículos con placa entre `low` y `high`.
+        
+        Usa los agregados de cada nodo en lugar de visitar los vehículos:
+        baja hasta el primer nodo dentro del rango (el nodo donde se separan
+        los caminos hacia `low` y `high`) y desde ahí sigue los dos bordes.
+        En el borde izquierdo, cada nodo con placa >= low está en el rango
+        junto con todo su subárbol derecho, y se sigue por la izquierda; si no,
+        se sigue por la derecha. El borde derecho es simétrico.
+        
+        Complejidad de tiempo: O(h) - O(log n) en el AVL
+        
+        Args:
+            low (Optional[str]): Placa mínima (inclusive); None no limita.
+            high (Optional[str]): Placa máxima (inclusive); None no limita.
+        
+        Returns:
+            PriceSummary: Las estadísticas del rango.
+        """
+        node = self.root
+        while node is not None:
+            plate = node.vehicle.plate
+            if low is not None and plate < low:
+                node = node.right
+            elif high is not None and plate > high:
+                node = node.left
+            else:
+                break
+        if node is None:
+            return PriceSummary()
+
+        # Vehículos sueltos y subárboles completos dentro del rango
+        prices = [node.vehicle.price]
+        subtrees: List[BSTNode] = []
+        child = node.left
+        while child is not None:
+            if low is None:
+                subtrees.append(child)
+                break
+            if child.vehicle.plate >= low:
+                prices.append(child.vehicle.price)
+                if child.right is not None:
+                    subtrees.append(child.right)
+                child = child.left
+            else:
+                child = child.right
+        child = node.right
+        while child is not None:
+            if high is None:
+                subtrees.append(child)
+                break
+            if child.vehicle.plate <= high:
+                prices.append(child.vehicle.price)
+                if child.left is not None:
+                    subtrees.append(child.left)
+                child = child.right
+            else:
+                child = child.left
+
+        return PriceSummary(
+            len(prices) + sum(subtree.size for subtree in subtrees),
+            sum(prices) + sum(subtree.price_total for subtree in subtrees),
+            min(min(prices), min((subtree.price_min for subtree in subtrees), default=prices[0])),
+            max(max(prices), max((subtree.price_max for subtree in subtrees), default=prices[0])),
+        )
+
+    def recompute_price_stats(self, low: Optional[str] = None, high: Optional[str] = None) -> PriceSummary:
+        """
+        Las mismas estadísticas que price_stats, recorriendo todos los vehículos del rango.
+        
+        No usa los agregados de los nodos, así que sirve para verificarlos.
+        
+        Complejidad de tiempo: O(k + log n), con k vehículos en el rango
+        """
+        return summarize(node.vehicle.price for node in self._inorder_nodes(self.root, 0, low, high))
 
     def _find_min(self, node: BSTNode) -> BSTNode:
         """
         Encuentra el nodo con el valor mínimo en un subárbol.
         
         El nodo mínimo siempre está en el extremo izquierdo del árbol.
-        Se usa para encontrar el sucesor inorden en la eliminación de nodos.
         
         Complejidad de tiempo: O(log n) en promedio, O(n) en el peor caso
         
@@ -238,12 +705,109 @@ class BinarySearchTree:
             current = current.left
         return current
 
+    def bulk_load(self, vehicles: Iterable[Vehicle], presorted: bool = False) -> int:
+        """
+        Carga muchos vehículos a la vez construyendo un árbol perfectamente balanceado.
+        
+        En lugar de insertar uno por uno (O(n log n), u O(n²) con placas
+        ordenadas en el BST simple), ordena una sola vez si hace falta y
+        construye el árbol de abajo hacia arriba tomando el elemento central
+        de cada rango como raíz del subárbol.
+        
+        Si el árbol ya tiene datos, se mezclan en orden con los nuevos. Igual
+        que en insert, las placas duplicadas se descartan: se conserva el
+        vehículo que ya estaba en el árbol o, entre los nuevos, el primero.
+        Si llegan pocos vehículos comparados con los que ya hay, se insertan
+        uno por uno (copiando caminos) en lugar de reconstruir el árbol.
+        
+        Complejidad de tiempo: O(n) si presorted=True, O(n log n) si hay que ordenar;
+        O(m log n) para m vehículos pocos frente a los n existentes
+        
+        Args:
+            vehicles (Iterable[Vehicle]): Los vehículos a cargar.
+            presorted (bool): True si ya vienen ordenados por placa.
+        
+        Returns:
+            int: Cantidad de vehículos nuevos agregados al árbol.
+        
+        Ejemplo:
+            >>> bst.bulk_load(csv_service.load_all())
+            2
+        """
+        incoming = list(vehicles)
+        with self._write_lock:
+            return self._bulk_load(incoming, presorted)
+
+    def _bulk_load(self, incoming: List[Vehicle], presorted: bool) -> int:
+        """Implementación de bulk_load, sin lock."""
+        if not presorted:
+            # sort es estable: entre placas repetidas queda primero la original
+            incoming.sort(key=attrgetter("plate"))
+
+        added: List[Vehicle] = []
+        if self.root is not None and self._merges_incrementally(len(incoming)):
+            # Pocos vehículos: se insertan sobre copias de sus caminos
+            root = self.root
+            for vehicle in incoming:
+                root, stored = self._insert_into(root, vehicle)
+                if stored is not None:
+                    added.append(stored if self.records is None else vehicle)
+            return self._publish_bulk(root, added)
+
+        existing = [node.vehicle for node in self._inorder_nodes(self.root)]
+        merged: List[Vehicle] = []
+        i = 0
+        for vehicle in incoming:
+            # Copia los vehículos existentes con placa menor
+            while i < len(existing) and existing[i].plate < vehicle.plate:
+                merged.append(existing[i])
+                i += 1
+            if i < len(existing) and existing[i].plate == vehicle.plate:
+                # La placa ya existe en el árbol
+                continue
+            if merged and merged[-1].plate == vehicle.plate:
+                # Placa repetida dentro de la misma carga
+                continue
+            stored = self._store(vehicle)
+            merged.append(stored)
+            added.append(stored if self.records is None else vehicle)
+        merged.extend(existing[i:])
+        # Todos los nodos son nuevos: la versión anterior queda intacta
+        return self._publish_bulk(self._build_balanced(merged, 0, len(merged)), added)
+
+    def _build_balanced(self, vehicles: List[Vehicle], low: int, high: int) -> Optional[BSTNode]:
+        """
+        Construye un subárbol balanceado con los vehículos vehicles[low:high].
+        
+        El elemento central es la raíz y las dos mitades forman los subárboles.
+        La profundidad de la recursión es O(log n), así que no hay riesgo de
+        alcanzar el límite de recursión aunque haya millones de vehículos.
+        
+        Args:
+            vehicles (List[Vehicle]): Vehículos ordenados por placa sin duplicados.
+            low (int): Inicio del rango (inclusivo).
+            high (int): Fin del rango (exclusivo).
+        
+        Returns:
+            Optional[BSTNode]: La raíz del subárbol, o None si el rango está vacío.
+        """
+        if low >= high:
+            return None
+        mid = (low + high) // 2
+        node = BSTNode(vehicles[mid])
+        node.left = self._build_balanced(vehicles, low, mid)
+        node.right = self._build_balanced(vehicles, mid + 1, high)
+        self._update(node)
+        return node
+
     def update(self, plate: str, updated_vehicle: Vehicle) -> bool:
         """
         Actualiza la información de un vehículo existente.
         
-        Busca el vehículo por placa y actualiza todos sus campos excepto la placa
-        (ya que la placa es la clave del árbol y no puede cambiar).
+        Busca el vehículo por placa y reemplaza sus datos por los del vehículo
+        actualizado, conservando la placa (ya que la placa es la clave del árbol
+        y no puede cambiar). El vehículo anterior no se modifica, así que los
+        observadores reciben tanto la versión vieja como la nueva.
         
         Complejidad de tiempo: O(log n) en promedio, O(n) en el peor caso
         
@@ -259,15 +823,56 @@ class BinarySearchTree:
             >>> bst.update("ABC-123", updated)
             True
         """
-        node = self._search_recursive(self.root, plate)
+        with self._write_lock:
+            return self._update_vehicle(plate, updated_vehicle)
+
+    def _update_vehicle(self, plate: str, updated_vehicle: Vehicle) -> bool:
+        """Implementación de update, sin lock."""
+        path: List[BSTNode] = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            if plate < node.vehicle.plate:
+                node = node.left
+            elif plate > node.vehicle.plate:
+                node = node.right
+            else:
+                break
         if node is None:
             return False
         
+        old = node.vehicle
         # Actualiza todos los campos excepto la placa
-        node.vehicle.brand = updated_vehicle.brand
-        node.vehicle.color = updated_vehicle.color
-        node.vehicle.model = updated_vehicle.model
-        node.vehicle.price = updated_vehicle.price
+        if updated_vehicle.plate != old.plate:
+            updated_vehicle = updated_vehicle.model_copy(update={"plate": old.plate})
+        # Reemplaza el vehículo en una copia del camino, no en el nodo publicado
+        path = self._copy_path(path)
+        node = path[-1]
+        node.vehicle = self._store(updated_vehicle)
+        # El JSON guardado corresponde a la versión anterior
+        node.json = None
+        price, old_price = node.vehicle.price, old.price
+        if price != old_price:
+            # Se corrigen los agregados de precio del camino: la suma cambia en
+            # la diferencia, y el mínimo o el máximo solo se recalculan desde
+            # los hijos si el precio anterior era el extremo del subárbol
+            delta = price - old_price
+            for copy_node in reversed(path):
+                copy_node.price_total += delta
+                if price <= copy_node.price_min:
+                    copy_node.price_min = price
+                elif old_price == copy_node.price_min:
+                    self._update_price_range(copy_node)
+                if price >= copy_node.price_max:
+                    copy_node.price_max = price
+                elif old_price == copy_node.price_max:
+                    self._update_price_range(copy_node)
+
+        # La forma del árbol no cambia: basta con publicar la copia de la raíz
+        self.root = path[0]
+        self.version += 1
+        for listener in self.listeners:
+            listener.on_update(old, node.vehicle if self.records is None else updated_vehicle)
         return True
 
     def inorder(self) -> List[Vehicle]:
@@ -278,7 +883,7 @@ class BinarySearchTree:
         Es el recorrido más útil para obtener datos ordenados.
         
         Complejidad de tiempo: O(n) - visita cada nodo una vez
-        Complejidad de espacio: O(h) - donde h es la altura del árbol (pila de recursión)
+        Complejidad de espacio: O(h) - donde h es la altura del árbol (pila explícita)
         
         Returns:
             List[Vehicle]: Lista de vehículos ordenados por placa.
@@ -288,29 +893,162 @@ class BinarySearchTree:
             >>> for v in vehicles:
             ...     print(f"{v.plate}: {v.brand} {v.model}")
         """
-        result = []
-        self._inorder_recursive(self.root, result)
-        return result
+        return list(self.iter_inorder())
+
+    def iter_inorder(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Vehicle]:
+        """
+        Generador que produce los vehículos en inorden sin construir una lista.
+        
+        Útil para recorrer árboles grandes de forma perezosa: cada vehículo se
+        entrega en cuanto se visita y la memoria adicional es O(h).
+        
+        Permite paginar: `start` salta directamente a esa posición usando el
+        tamaño de los subárboles, y `low`/`high` limitan el rango de placas
+        (ambos inclusive). Obtener una página cuesta O(h + tamaño de página).
+        
+        Args:
+            start (int): Cantidad de vehículos a omitir (dentro del rango).
+            low (Optional[str]): Placa mínima del recorrido.
+            high (Optional[str]): Placa máxima del recorrido.
+        
+        Ejemplo:
+            >>> for v in bst.iter_inorder(start=20):
+            ...     print(v.plate)
+        """
+        for node in self._inorder_nodes(self.root, start, low, high):
+            yield self._load(node.vehicle, cache=False)
 
-    def _inorder_recursive(self, node: Optional[BSTNode], result: List[Vehicle]) -> None:
+    def _inorder_nodes(
+        self, root: Optional[BSTNode], start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[BSTNode]:
         """
-        Función auxiliar recursiva para el recorrido inorden.
+        Recorrido inorden iterativo con una pila explícita.
         
         Orden: Izquierda -> Nodo Actual -> Derecha
         
-        Esto garantiza que los vehículos se procesen en orden ascendente de placa.
+        Antes de empezar, baja hasta el nodo en la posición `start` (sumando
+        el rank de `low` si hay rango) dejando en la pila solo los ancestros
+        que aún faltan por visitar. El recorrido termina al pasar de `high`.
         
         Args:
-            node (Optional[BSTNode]): El nodo actual en el recorrido.
-            result (List[Vehicle]): Lista donde se acumulan los vehículos.
+            root (Optional[BSTNode]): La raíz del subárbol a recorrer.
+            start (int): Cantidad de nodos a omitir al inicio.
+            low (Optional[str]): Placa mínima del recorrido.
+            high (Optional[str]): Placa máxima del recorrido.
+        """
+        if low is not None:
+            start += self._rank(root, low)
+        stack: List[BSTNode] = []
+        node = root
+        while node is not None:
+            left_size = self._size(node.left)
+            if start < left_size:
+                stack.append(node)
+                node = node.left
+            elif start > left_size:
+                # El nodo y su subárbol izquierdo quedan antes de `start`
+                start -= left_size + 1
+                node = node.right
+            else:
+                stack.append(node)
+                break
+
+        while stack:
+            node = stack.pop()
+            if high is not None and node.vehicle.plate > high:
+                return
+            yield node
+            # Continúa con el subárbol derecho, bajando por la izquierda
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def _node_json(self, node: BSTNode) -> bytes:
+        """
+        Retorna el JSON del vehículo de un nodo, usando la copia guardada en el nodo.
+        
+        El JSON se calcula la primera vez que se pide y se guarda en node.json;
+        update lo invalida al reemplazar el vehículo. En modo compacto no se
+        guarda, para no duplicar la memoria de cada registro, y en modo disco
+        se copia directo del archivo de registros.
         """
-        if node is not None:
-            # Procesa el subárbol izquierdo
-            self._inorder_recursive(node.left, result)
-            # Procesa el nodo actual
-            result.append(node.vehicle)
-            # Procesa el subárbol derecho
-            self._inorder_recursive(node.right, result)
+        if self.records is not None:
+            return self.records.read_json(node.vehicle)
+        data = node.json
+        if data is None:
+            data = vehicle_to_json(node.vehicle)
+            if not self.compact:
+                node.json = data
+        return data
+
+    def search_json(self, plate: str) -> Optional[bytes]:
+        """
+        Busca un vehículo por placa y retorna su JSON ya serializado.
+        
+        Complejidad de tiempo: O(h); la serialización solo ocurre una vez por versión del vehículo
+        """
+        node = self._find_node(plate)
+        return self._node_json(node) if node else None
+
+    def iter_json(
+        self, order: str = "inorder", start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        Generador con el JSON de cada vehículo en el recorrido indicado.
+        
+        Admite los mismos `start`, `low` y `high` que iter_inorder, iter_preorder
+        e iter_postorder. Permite construir respuestas concatenando bytes sin
+        volver a serializar los vehículos que no cambiaron.
+        
+        Args:
+            order (str): "inorder", "preorder" o "postorder".
+        
+        Raises:
+            ValueError: Si el recorrido no existe.
+        """
+        traversals = {
+            "inorder": self._inorder_nodes,
+            "preorder": self._preorder_nodes,
+            "postorder": self._postorder_nodes,
+        }
+        if order not in traversals:
+            raise ValueError(f"Unknown traversal '{order}'")
+        for node in traversals[order](self.root, start, low, high):
+            yield self._node_json(node)
+
+    def iter_json_items(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Tuple[str, bytes]]:
+        """
+        Generador de pares (placa, JSON) en orden de placa.
+        
+        Es el recorrido inorden de iter_json acompañado de la clave, para
+        mezclar varios árboles por placa (ShardedTree) sin volver a leer
+        la placa del JSON ni construir los Vehicle.
+        """
+        for node in self._inorder_nodes(self.root, start, low, high):
+            yield node.vehicle.plate, self._node_json(node)
+
+    def _clip(self, node: Optional[BSTNode], low: Optional[str], high: Optional[str]) -> Optional[BSTNode]:
+        """
+        Retorna el primer nodo de un subárbol cuya placa está entre `low` y `high`.
+        
+        Un nodo fuera del rango solo puede tener resultados en uno de sus
+        subárboles, así que se salta bajando por ese lado. Recorrer el árbol
+        "recortado" de esta forma mantiene el orden relativo de los nodos.
+        """
+        while node is not None:
+            plate = node.vehicle.plate
+            if low is not None and plate < low:
+                node = node.right
+            elif high is not None and plate > high:
+                node = node.left
+            else:
+                return node
+        return None
 
     def preorder(self) -> List[Vehicle]:
         """
@@ -330,27 +1068,58 @@ class BinarySearchTree:
             >>> for v in vehicles:
             ...     print(v.plate)
         """
-        result = []
-        self._preorder_recursive(self.root, result)
-        return result
+        return list(self.iter_preorder())
 
-    def _preorder_recursive(self, node: Optional[BSTNode], result: List[Vehicle]) -> None:
+    def iter_preorder(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Vehicle]:
         """
-        Función auxiliar recursiva para el recorrido preorden.
+        Generador que produce los vehículos en preorden de forma perezosa.
+        
+        `low`/`high` recorren solo las placas del rango (en el mismo orden
+        relativo del preorden completo). Sin rango, `start` salta subárboles
+        enteros usando su tamaño; con rango, los primeros `start` se omiten
+        uno por uno.
+        """
+        for node in self._preorder_nodes(self.root, start, low, high):
+            yield self._load(node.vehicle, cache=False)
+
+    def _preorder_nodes(
+        self, root: Optional[BSTNode], start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[BSTNode]:
+        """
+        Recorrido preorden iterativo con una pila explícita.
         
         Orden: Nodo Actual -> Izquierda -> Derecha
         
         Args:
-            node (Optional[BSTNode]): El nodo actual en el recorrido.
-            result (List[Vehicle]): Lista donde se acumulan los vehículos.
+            root (Optional[BSTNode]): La raíz del subárbol a recorrer.
+            start (int): Cantidad de nodos a omitir al inicio.
+            low (Optional[str]): Placa mínima del recorrido.
+            high (Optional[str]): Placa máxima del recorrido.
         """
-        if node is not None:
-            # Procesa el nodo actual primero
-            result.append(node.vehicle)
-            # Procesa el subárbol izquierdo
-            self._preorder_recursive(node.left, result)
-            # Procesa el subárbol derecho
-            self._preorder_recursive(node.right, result)
+        bounded = low is not None or high is not None
+        if bounded:
+            root = self._clip(root, low, high)
+        stack: List[BSTNode] = [root] if root is not None else []
+        while stack:
+            node = stack.pop()
+            if start > 0:
+                if not bounded and start >= node.size:
+                    # Todo el subárbol queda antes de la posición inicial
+                    start -= node.size
+                    continue
+                start -= 1
+            else:
+                yield node
+            left, right = node.left, node.right
+            if bounded:
+                left, right = self._clip(left, low, high), self._clip(right, low, high)
+            # Se apila primero el derecho para procesar antes el izquierdo
+            if right is not None:
+                stack.append(right)
+            if left is not None:
+                stack.append(left)
 
     def postorder(self) -> List[Vehicle]:
         """
@@ -371,27 +1140,90 @@ class BinarySearchTree:
             >>> for v in vehicles:
             ...     print(v.plate)
         """
-        result = []
-        self._postorder_recursive(self.root, result)
-        return result
+        return list(self.iter_postorder())
+
+    def iter_postorder(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Vehicle]:
+        """
+        Generador que produce los vehículos en postorden de forma perezosa.
+        
+        Admite `start`, `low` y `high` con el mismo significado que iter_preorder.
+        """
+        for node in self._postorder_nodes(self.root, start, low, high):
+            yield self._load(node.vehicle, cache=False)
 
-    def _postorder_recursive(self, node: Optional[BSTNode], result: List[Vehicle]) -> None:
+    def _postorder_nodes(
+        self, root: Optional[BSTNode], start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[BSTNode]:
         """
-        Función auxiliar recursiva para el recorrido postorden.
+        Recorrido postorden iterativo con una pila explícita.
         
         Orden: Izquierda -> Derecha -> Nodo Actual
         
+        Cada entrada de la pila indica si el subárbol derecho del nodo ya está
+        en proceso; en ese caso el nodo se emite al volver a él.
+        
         Args:
-            node (Optional[BSTNode]): El nodo actual en el recorrido.
-            result (List[Vehicle]): Lista donde se acumulan los vehículos.
-        """
-        if node is not None:
-            # Procesa el subárbol izquierdo
-            self._postorder_recursive(node.left, result)
-            # Procesa el subárbol derecho
-            self._postorder_recursive(node.right, result)
-            # Procesa el nodo actual al final
-            result.append(node.vehicle)
+            root (Optional[BSTNode]): La raíz del subárbol a recorrer.
+            start (int): Cantidad de nodos a omitir al inicio.
+            low (Optional[str]): Placa mínima del recorrido.
+            high (Optional[str]): Placa máxima del recorrido.
+        """
+        bounded = low is not None or high is not None
+        skip = 0
+        if bounded:
+            # Los tamaños no sirven para saltar dentro de un árbol recortado
+            root, skip, start = self._clip(root, low, high), start, 0
+        elif start >= self._size(root):
+            return
+        stack: List[tuple[BSTNode, bool]] = []
+        self._postorder_descend(stack, root, start, low, high)
+        while stack:
+            node, right_pending = stack.pop()
+            right = node.right
+            if bounded:
+                right = self._clip(right, low, high)
+            if right_pending or right is None:
+                if skip > 0:
+                    skip -= 1
+                else:
+                    yield node
+            else:
+                stack.append((node, True))
+                self._postorder_descend(stack, right, 0, low, high)
+
+    def _postorder_descend(
+        self,
+        stack: List[tuple[BSTNode, bool]],
+        node: Optional[BSTNode],
+        start: int,
+        low: Optional[str],
+        high: Optional[str],
+    ) -> None:
+        """
+        Baja desde `node` hasta el nodo en la posición `start` de su postorden.
+        
+        Apila los ancestros pendientes: (nodo, False) si falta su subárbol
+        derecho y (nodo, True) si solo falta el propio nodo.
+        """
+        bounded = low is not None or high is not None
+        while node is not None:
+            left, right = node.left, node.right
+            if bounded:
+                left, right = self._clip(left, low, high), self._clip(right, low, high)
+            left_size = self._size(left)
+            if start < left_size:
+                stack.append((node, False))
+                node = left
+            elif start < left_size + self._size(right):
+                # El subárbol izquierdo queda completo antes de `start`
+                start -= left_size
+                stack.append((node, True))
+                node = right
+            else:
+                stack.append((node, True))
+                return
 
     def get_all(self) -> List[Vehicle]:
         """
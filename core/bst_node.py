@@ -5,10 +5,43 @@ from models.vehicle import Vehicle
 class BSTNode:
     """Binary Search Tree Node for storing vehicles."""
 
+    # Sin __dict__ por nodo: con millones de vehículos reduce bastante la memoria
+    __slots__ = (
+        "vehicle", "left", "right", "height", "size", "path_length",
+        "price_total", "price_min", "price_max", "json",
+    )
+
     def __init__(self, vehicle: Vehicle):
         self.vehicle = vehicle
         self.left: Optional[BSTNode] = None
         self.right: Optional[BSTNode] = None
+        # Altura del subárbol con raíz en este nodo (una hoja tiene altura 1)
+        self.height: int = 1
+        # Cantidad de nodos del subárbol, usada para rank/select y paginación
+        self.size: int = 1
+        # Suma de las profundidades de los nodos del subárbol, relativa a este nodo
+        self.path_length: int = 0
+        # Suma, mínimo y máximo de los precios del subárbol (la cantidad es `size`)
+        self.price_total: float = vehicle.price
+        self.price_min: float = vehicle.price
+        self.price_max: float = vehicle.price
+        # JSON del vehículo serializado, calculado la primera vez que se pide
+        self.json: Optional[bytes] = None
 
     def __repr__(self) -> str:
         return f"BSTNode(plate={self.vehicle.plate})"
+
+    def copy(self) -> "BSTNode":
+        """Copia superficial del nodo: comparte el vehículo y los hijos."""
+        clone = BSTNode.__new__(BSTNode)
+        clone.vehicle = self.vehicle
+        clone.left = self.left
+        clone.right = self.right
+        clone.height = self.height
+        clone.size = self.size
+        clone.path_length = self.path_length
+        clone.price_total = self.price_total
+        clone.price_min = self.price_min
+        clone.price_max = self.price_max
+        clone.json = self.json
+        return clone
@@ -0,0 +1,151 @@
+import math
+from typing import Iterable
+
+# Un contador que llega a este valor queda fijo: ya no se sabe cuántas
+# placas lo usan, así que decrementarlo podría producir falsos negativos
+_SATURATED = 255
+# Semilla del segundo hash del doble hashing
+_SALT = 0x9E3779B9
+
+
+class CountingBloomFilter:
+    """
+    Filtro de Bloom con contadores para descartar placas inexistentes en O(1).
+
+    Un filtro de Bloom representa un conjunto con `size` posiciones y
+    `hashes` funciones hash: agregar una placa marca sus posiciones, y una
+    placa con alguna posición sin marcar seguro no está en el conjunto. Si
+    todas están marcadas, probablemente esté (puede ser un falso positivo),
+    y hay que confirmarlo en el árbol.
+
+    En lugar de bits se usan contadores de un byte, así que las placas
+    también se pueden quitar: remove decrementa lo que add incrementó. Un
+    contador que se satura no vuelve a bajar, lo que solo puede producir
+    falsos positivos, nunca falsos negativos.
+
+    El tamaño se calcula a partir de la capacidad esperada y de la tasa de
+    falsos positivos deseada:
+    - size = -capacidad * ln(tasa) / ln(2)²
+    - hashes = size / capacidad * ln(2)
+
+    Las posiciones se obtienen por doble hashing (h1 + i * h2) a partir del
+    hash de la cadena, que Python guarda en cada str después de calcularlo.
+    Ese hash cambia entre procesos, así que el filtro nunca se persiste: se
+    reconstruye a partir de las placas del árbol.
+
+    Por encima de la capacidad la tasa de falsos positivos crece; el árbol
+    dueño del filtro lo reemplaza por uno más grande (grown) al llenarse.
+    """
+
+    def __init__(self, capacity: int = 100000, false_positive_rate: float = 0.01):
+        """
+        Args:
+            capacity (int): Cantidad de placas para la que se dimensiona el filtro.
+            false_positive_rate (float): Probabilidad de falso positivo con
+                `capacity` placas, entre 0 y 1.
+
+        Raises:
+            ValueError: Si la capacidad o la tasa están fuera de rango.
+        """
+        if capacity < 1:
+            raise ValueError("Filter capacity must be at least 1")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("False positive rate must be between 0 and 1")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._counters = bytearray(self.size)
+        # Placas representadas actualmente
+        self.count = 0
+        # Estadísticas de las consultas: cuántas hubo, cuántas se respondieron
+        # como ausentes sin tocar el árbol y cuántas el árbol desmintió
+        self.lookups = 0
+        self.negatives = 0
+        self.false_positives = 0
+
+    def _positions(self, plate: str) -> Iterable[int]:
+        """Posiciones de los contadores de una placa."""
+        position = hash(plate)
+        step = hash((plate, _SALT)) | 1
+        for _ in range(self.hashes):
+            yield position % self.size
+            position += step
+
+    def add(self, plate: str) -> None:
+        """Agrega una placa incrementando sus contadores."""
+        counters = self._counters
+        for position in self._positions(plate):
+            if counters[position] < _SATURATED:
+                counters[position] += 1
+        self.count += 1
+
+    def update(self, plates: Iterable[str]) -> None:
+        """Agrega varias placas."""
+        for plate in plates:
+            self.add(plate)
+
+    def remove(self, plate: str) -> None:
+        """
+        Quita una placa agregada antes decrementando sus contadores.
+
+        Quitar una placa que no se agregó corrompe el filtro; el árbol solo
+        lo hace con placas que acaba de eliminar.
+        """
+        counters = self._counters
+        for position in self._positions(plate):
+            if 0 < counters[position] < _SATURATED:
+                counters[position] -= 1
+        self.count -= 1
+
+    def might_contain(self, plate: str) -> bool:
+        """
+        Consulta el filtro y cuenta la consulta en las estadísticas.
+
+        Complejidad de tiempo: O(hashes); una placa ausente suele descartarse
+        en los primeros contadores.
+
+        Returns:
+            bool: False si la placa seguro no está; True si puede estar.
+        """
+        self.lookups += 1
+        counters = self._counters
+        size = self.size
+        position = hash(plate)
+        step = hash((plate, _SALT)) | 1
+        for _ in range(self.hashes):
+            if not counters[position % size]:
+                self.negatives += 1
+                return False
+            position += step
+        return True
+
+    def record_false_positive(self) -> None:
+        """Registra que una placa que el filtro dejó pasar no estaba en el árbol."""
+        self.false_positives += 1
+
+    def estimated_false_positive_rate(self) -> float:
+        """Probabilidad de falso positivo con la cantidad actual de placas: (1 - e^(-k*n/m))^k."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def grown(self, plates: Iterable[str], count: int) -> "CountingBloomFilter":
+        """
+        Crea un filtro más grande con la misma tasa de falsos positivos.
+
+        La capacidad nueva es el doble de la actual o de `count`, la que sea
+        mayor, así que repartido entre las inserciones crecer cuesta O(1) por placa.
+        Las estadísticas de consulta se conservan.
+
+        Args:
+            plates (Iterable[str]): Todas las placas que debe representar.
+            count (int): Cantidad de placas en `plates`.
+
+        Returns:
+            CountingBloomFilter: El filtro nuevo, ya cargado.
+        """
+        bigger = CountingBloomFilter(max(self.capacity, count) * 2, self.false_positive_rate)
+        bigger.update(plates)
+        bigger.lookups = self.lookups
+        bigger.negatives = self.negatives
+        bigger.false_positives = self.false_positives
+        return bigger
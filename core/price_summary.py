@@ -0,0 +1,72 @@
+import math
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # numpy es opcional: solo acelera el recálculo completo
+    numpy = None
+
+
+class PriceSummary(NamedTuple):
+    """
+    Estadísticas de precio de un conjunto de vehículos.
+
+    Los árboles guardan un resumen por subárbol y responden las consultas
+    por rango combinando O(log n) resúmenes; el mínimo y el máximo de un
+    conjunto vacío son None.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    @property
+    def average(self) -> Optional[float]:
+        """Precio promedio, o None si no hay vehículos."""
+        return self.total / self.count if self.count else None
+
+    @classmethod
+    def of(cls, prices: Sequence[float]) -> "PriceSummary":
+        """Resumen de una lista corta de precios (por ejemplo, los de una hoja)."""
+        if not prices:
+            return cls()
+        return cls(len(prices), sum(prices), min(prices), max(prices))
+
+
+def merge(summaries: Iterable[PriceSummary]) -> PriceSummary:
+    """Combina resúmenes de conjuntos disjuntos en el resumen de su unión."""
+    count = 0
+    total = 0.0
+    minimum = maximum = None
+    for summary in summaries:
+        if not summary.count:
+            continue
+        count += summary.count
+        total += summary.total
+        if minimum is None or summary.minimum < minimum:
+            minimum = summary.minimum
+        if maximum is None or summary.maximum > maximum:
+            maximum = summary.maximum
+    return PriceSummary(count, total, minimum, maximum)
+
+
+def summarize(prices: Iterable[float]) -> PriceSummary:
+    """
+    Recalcula el resumen recorriendo todos los precios, sin usar los agregados.
+
+    Sirve para verificar los resúmenes mantenidos por los árboles. Con numpy
+    instalado las operaciones se hacen sobre un arreglo (vectorizadas); si
+    no, con math.fsum, que suma sin acumular error de redondeo.
+
+    Complejidad de tiempo: O(n)
+    """
+    if numpy is not None:
+        values = numpy.fromiter(prices, dtype=float)
+        if not len(values):
+            return PriceSummary()
+        return PriceSummary(len(values), float(values.sum()), float(values.min()), float(values.max()))
+    values = list(prices)
+    if not values:
+        return PriceSummary()
+    return PriceSummary(len(values), math.fsum(values), min(values), max(values))
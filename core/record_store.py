@@ -0,0 +1,175 @@
+import mmap
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+from models.vehicle import Vehicle
+from models.serialization import loads, vehicle_to_json
+from core.vehicle_record import VehicleRecord
+
+
+class DiskRef:
+    """
+    Referencia a un vehículo guardado en un RecordStore.
+
+    Es lo que guardan los nodos del árbol en modo disco: la placa (la clave)
+    y el precio (lo necesitan los agregados de precio de cada subárbol),
+    más la posición del registro en el archivo. Marca, color y modelo se
+    leen del archivo al pedirlos, pasando por la caché del almacén.
+    """
+
+    __slots__ = ("plate", "price", "offset", "store")
+
+    def __init__(self, plate: str, price: float, offset: int, store: "RecordStore"):
+        self.plate = plate
+        self.price = price
+        self.offset = offset
+        self.store = store
+
+    def __repr__(self) -> str:
+        return f"DiskRef(plate={self.plate!r}, offset={self.offset})"
+
+    @property
+    def brand(self) -> str:
+        return self.to_vehicle().brand
+
+    @property
+    def color(self) -> str:
+        return self.to_vehicle().color
+
+    @property
+    def model(self) -> str:
+        return self.to_vehicle().model
+
+    def to_vehicle(self) -> Vehicle:
+        """Materializa el vehículo completo (desde la caché o el archivo)."""
+        return self.store.load(self)
+
+
+class RecordStore:
+    """
+    Archivo de registros de vehículos de solo agregado, leído con mmap.
+
+    Cada vehículo se escribe al final del archivo como una línea JSON y el
+    árbol guarda solo un DiskRef con su posición, así que la memoria del
+    árbol crece con la cantidad de placas y no con el tamaño de los datos.
+    Las lecturas usan un mapa en memoria del archivo (mmap): el sistema
+    operativo trae a RAM las páginas que se leen y las descarta bajo
+    presión, sin que el proceso las cuente como propias.
+
+    Un update nunca sobrescribe: agrega una versión nueva del registro en
+    otra posición. Así las versiones anteriores del árbol (snapshots MVCC)
+    siguen leyendo datos válidos sin ningún lock. El espacio de las
+    versiones viejas no se recupera mientras el proceso corre; el archivo
+    no es la copia durable de los datos (esa es el CSV, el journal o el
+    snapshot) y se vacía al abrirlo, al cargar los datos en cada arranque.
+
+    Los vehículos pedidos como objeto pasan por una caché LRU de
+    `cache_size` entradas, indexada por la posición del registro (cada
+    versión tiene la suya). El JSON de las respuestas se copia directo del
+    archivo, sin decodificarlo ni pasar por la caché.
+    """
+
+    def __init__(self, path: str, cache_size: int = 10000):
+        """
+        Args:
+            path (str): Archivo de registros; se crea o se vacía.
+            cache_size (int): Vehículos materializados que se conservan (0 desactiva la caché).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.cache_size = cache_size
+        self._file = open(path, "w+b")
+        # Bytes escritos; el mapa cubre un prefijo del archivo y se renueva al leer más allá
+        self.size = 0
+        self.records = 0
+        self._map: Optional[mmap.mmap] = None
+        # Serializa las escrituras al archivo y la renovación del mapa
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, Vehicle]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def append(self, vehicle: Union[Vehicle, VehicleRecord]) -> DiskRef:
+        """
+        Escribe un vehículo al final del archivo.
+
+        Returns:
+            DiskRef: La referencia a guardar en el árbol.
+        """
+        data = vehicle_to_json(vehicle) + b"\n"
+        with self._lock:
+            offset = self.size
+            self._file.write(data)
+            self.size += len(data)
+            self.records += 1
+        return DiskRef(vehicle.plate, float(vehicle.price), offset, self)
+
+    def _mapping(self, offset: int) -> mmap.mmap:
+        """
+        Mapa que contiene la posición dada.
+
+        Los registros se escriben enteros bajo el lock, así que un mapa que
+        alcanza el inicio de un registro lo contiene completo. El mapa
+        anterior no se cierra: un lector puede estar usándolo y se libera
+        solo al dejar de estar referenciado.
+        """
+        mapping = self._map
+        if mapping is None or offset >= len(mapping):
+            with self._lock:
+                mapping = self._map
+                if mapping is None or offset >= len(mapping):
+                    self._file.flush()
+                    mapping = self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapping
+
+    def read_json(self, ref: DiskRef) -> bytes:
+        """JSON del registro, copiado del archivo."""
+        mapping = self._mapping(ref.offset)
+        return mapping[ref.offset:mapping.find(b"\n", ref.offset)]
+
+    def load(self, ref: DiskRef, cache: bool = True) -> Vehicle:
+        """
+        Vehículo de un registro, desde la caché o decodificando el archivo.
+
+        Args:
+            ref (DiskRef): La referencia del registro.
+            cache (bool): Guardar el vehículo en la caché si no estaba. Los
+                recorridos completos pasan False para no desalojar los
+                vehículos más usados.
+        """
+        with self._cache_lock:
+            vehicle = self._cache.get(ref.offset)
+            if vehicle is not None:
+                self._cache.move_to_end(ref.offset)
+                self.hits += 1
+                return vehicle
+            self.misses += 1
+        fields = loads(self.read_json(ref))
+        vehicle = VehicleRecord(
+            fields["plate"],
+            sys.intern(fields["brand"]),
+            sys.intern(fields["color"]),
+            sys.intern(fields["model"]),
+            float(fields["price"]),
+        ).to_vehicle()
+        if cache and self.cache_size:
+            with self._cache_lock:
+                self._cache[ref.offset] = vehicle
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return vehicle
+
+    def cached(self) -> int:
+        """Cantidad de vehículos en la caché."""
+        return len(self._cache)
+
+    def close(self) -> None:
+        """Cierra el archivo; las referencias existentes dejan de poder leerse."""
+        with self._lock:
+            self._map = None
+            self._file.close()
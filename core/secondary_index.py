@@ -0,0 +1,151 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Set, Tuple
+from models.vehicle import Vehicle
+from core.tree_listener import TreeListener
+
+
+class SecondaryIndexes(TreeListener):
+    """
+    Índices secundarios sobre marca, color y precio de los vehículos del árbol.
+
+    - brand y color: índices hash (valor normalizado -> conjunto de placas)
+    - price: índice ordenado, una lista de (precio, placa) ordenada
+
+    Se registra como listener del árbol, así que se mantiene consistente con
+    cada insert, update, delete y bulk_load. Las consultas combinan los
+    filtros partiendo del índice más selectivo y nunca recorren el árbol.
+
+    Los listeners pueden llamarse desde otro hilo (importaciones, el hilo que
+    sigue el journal compartido) mientras se consulta en el event loop, así
+    que las modificaciones y las consultas se serializan con un lock.
+    """
+
+    def __init__(self):
+        self._by_brand: Dict[str, Set[str]] = {}
+        self._by_color: Dict[str, Set[str]] = {}
+        self._by_price: List[Tuple[float, str]] = []
+        # Precio actual de cada placa, para filtrar candidatos por precio
+        self._price_of: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(value: str) -> str:
+        """Las marcas y colores se comparan sin distinguir mayúsculas."""
+        return value.casefold()
+
+    @staticmethod
+    def _add_to(index: Dict[str, Set[str]], key: str, plate: str) -> None:
+        index.setdefault(key, set()).add(plate)
+
+    @staticmethod
+    def _remove_from(index: Dict[str, Set[str]], key: str, plate: str) -> None:
+        plates = index.get(key)
+        if plates is not None:
+            plates.discard(plate)
+            if not plates:
+                del index[key]
+
+    def _remove_price(self, price: float, plate: str) -> None:
+        position = bisect_left(self._by_price, (price, plate))
+        if position < len(self._by_price) and self._by_price[position] == (price, plate):
+            del self._by_price[position]
+
+    def _insert(self, vehicle: Vehicle) -> None:
+        self._add_to(self._by_brand, self._normalize(vehicle.brand), vehicle.plate)
+        self._add_to(self._by_color, self._normalize(vehicle.color), vehicle.plate)
+        insort(self._by_price, (vehicle.price, vehicle.plate))
+        self._price_of[vehicle.plate] = vehicle.price
+
+    def _delete(self, vehicle: Vehicle) -> None:
+        self._remove_from(self._by_brand, self._normalize(vehicle.brand), vehicle.plate)
+        self._remove_from(self._by_color, self._normalize(vehicle.color), vehicle.plate)
+        self._remove_price(vehicle.price, vehicle.plate)
+        self._price_of.pop(vehicle.plate, None)
+
+    def on_insert(self, vehicle: Vehicle) -> None:
+        with self._lock:
+            self._insert(vehicle)
+
+    def on_update(self, old: Vehicle, new: Vehicle) -> None:
+        with self._lock:
+            self._delete(old)
+            self._insert(new)
+
+    def on_delete(self, vehicle: Vehicle) -> None:
+        with self._lock:
+            self._delete(vehicle)
+
+    def on_bulk_load(self, vehicles: List[Vehicle]) -> None:
+        # Se ordena una sola vez en lugar de hacer un insort por vehículo
+        with self._lock:
+            for vehicle in vehicles:
+                self._add_to(self._by_brand, self._normalize(vehicle.brand), vehicle.plate)
+                self._add_to(self._by_color, self._normalize(vehicle.color), vehicle.plate)
+                self._price_of[vehicle.plate] = vehicle.price
+            self._by_price.extend((vehicle.price, vehicle.plate) for vehicle in vehicles)
+            self._by_price.sort()
+
+    def _price_bounds(self, min_price: Optional[float], max_price: Optional[float]) -> Tuple[int, int]:
+        """Posiciones [inicio, fin) del índice de precios dentro del rango pedido."""
+        low = 0 if min_price is None else bisect_left(self._by_price, (min_price,))
+        high = len(self._by_price)
+        if max_price is not None:
+            # (max_price, chr(0x10FFFF)) queda después de cualquier placa con ese precio
+            high = bisect_right(self._by_price, (max_price, chr(0x10FFFF)))
+        return low, max(low, high)
+
+    def query(
+        self,
+        brand: Optional[str] = None,
+        color: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Retorna las placas que cumplen todos los filtros indicados, ordenadas.
+
+        Se estima el tamaño de cada filtro (O(1) para los hash, O(log n) para
+        el rango de precios), se toman como candidatos los del más pequeño y
+        se descartan los que no cumplen el resto.
+
+        Raises:
+            ValueError: Si no se indica ningún filtro.
+        """
+        with self._lock:
+            candidates: List[Tuple[int, str]] = []
+            brand_plates = color_plates = None
+            if brand is not None:
+                brand_plates = self._by_brand.get(self._normalize(brand), set())
+                candidates.append((len(brand_plates), "brand"))
+            if color is not None:
+                color_plates = self._by_color.get(self._normalize(color), set())
+                candidates.append((len(color_plates), "color"))
+            has_price = min_price is not None or max_price is not None
+            low, high = self._price_bounds(min_price, max_price)
+            if has_price:
+                candidates.append((high - low, "price"))
+            if not candidates:
+                raise ValueError("At least one filter is required")
+
+            _, most_selective = min(candidates)
+            if most_selective == "brand":
+                plates = brand_plates
+            elif most_selective == "color":
+                plates = color_plates
+            else:
+                plates = (plate for _, plate in self._by_price[low:high])
+
+            result = []
+            for plate in plates:
+                if brand_plates is not None and plate not in brand_plates:
+                    continue
+                if color_plates is not None and plate not in color_plates:
+                    continue
+                if has_price and most_selective != "price":
+                    price = self._price_of[plate]
+                    if (min_price is not None and price < min_price) or (max_price is not None and price > max_price):
+                        continue
+                result.append(plate)
+        result.sort()
+        return result
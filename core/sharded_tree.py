@@ -0,0 +1,360 @@
+import heapq
+import math
+import threading
+import zlib
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from models.vehicle import Vehicle
+from core.plate_filter import CountingBloomFilter
+from core.price_summary import PriceSummary, merge
+from core.tree_listener import TreeListener
+from core.tree_stats import TreeStats
+from core.vehicle_index import VehicleIndex
+
+_plate_of = attrgetter("plate")
+
+
+class _SerializedListener(TreeListener):
+    """
+    Envuelve un observador para que las particiones lo llamen de a una.
+
+    Cada partición notifica a sus observadores con su propio lock tomado, y
+    las particiones escriben en paralelo; los observadores (SecondaryIndexes,
+    TrigramIndex) no son seguros entre hilos, así que sus llamadas se
+    serializan con un lock compartido.
+    """
+
+    def __init__(self, listener: TreeListener, lock: threading.Lock):
+        self.listener = listener
+        self._lock = lock
+
+    def on_insert(self, vehicle: Vehicle) -> None:
+        with self._lock:
+            self.listener.on_insert(vehicle)
+
+    def on_update(self, old: Vehicle, new: Vehicle) -> None:
+        with self._lock:
+            self.listener.on_update(old, new)
+
+    def on_delete(self, vehicle: Vehicle) -> None:
+        with self._lock:
+            self.listener.on_delete(vehicle)
+
+    def on_bulk_load(self, vehicles: List[Vehicle]) -> None:
+        with self._lock:
+            self.listener.on_bulk_load(vehicles)
+
+
+class ShardedTree:
+    """
+    Índice de vehículos repartido por hash de la placa entre N árboles independientes.
+
+    Cada placa vive en una sola partición, elegida con crc32(placa) % N. Las
+    particiones son árboles completos de cualquier motor (BinarySearchTree,
+    AVLTree o BPlusTree), cada uno con su propio lock de escritura, así que
+    escrituras a placas de particiones distintas no se esperan entre sí. En
+    CPython con GIL los hilos igual se turnan para ejecutar Python; en las
+    versiones sin GIL (free-threaded) las escrituras corren en paralelo.
+    Esto sirve a quien escribe en el árbol desde varios hilos; el servidor
+    de la API aplica las escrituras de a una en el event loop (ver
+    benchmarks/bench_shards.py).
+    Se usa crc32 y no hash() para que el reparto no se correlacione con las
+    posiciones del filtro de Bloom de cada partición, que usan hash().
+
+    Operaciones por placa (search, insert, update, delete): van a una sola
+    partición y cuestan lo mismo que en un árbol de n/N vehículos.
+
+    Recorridos en orden: cada partición está ordenada, y el orden global se
+    obtiene mezclando las N secuencias con un heap (heapq.merge), que cuesta
+    O(log N) por vehículo. Para empezar en la posición `start` se busca
+    primero la placa en esa posición con select y cada partición arranca
+    desde ella, sin recorrer los vehículos omitidos.
+
+    Consultas de orden (rank, count_range, price_stats): se suman o combinan
+    las respuestas de las N particiones, O(N log n). select no se puede
+    repartir así y se resuelve por búsqueda binaria sobre las particiones
+    (ver select).
+
+    Los recorridos preorden y postorden dependen de la forma de un único
+    árbol binario, así que no están disponibles (NotImplementedError).
+
+    snapshot() toma una vista de cada partición: cada escritura queda entera
+    de un lado o del otro, pero las vistas de particiones distintas pueden
+    tomarse entre dos escrituras.
+    """
+
+    def __init__(self, shards: Sequence[VehicleIndex]):
+        """
+        Args:
+            shards (Sequence[VehicleIndex]): Las particiones, árboles vacíos del mismo motor.
+
+        Raises:
+            ValueError: Si no hay ninguna partición.
+        """
+        if not shards:
+            raise ValueError("A sharded tree needs at least one shard")
+        self.shards: List[VehicleIndex] = list(shards)
+        self.compact = self.shards[0].compact
+        # Los filtros de Bloom, si se activan, están en cada partición
+        self.filter: Optional[CountingBloomFilter] = None
+        # Serializa las notificaciones a los observadores registrados
+        self._listener_lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Suma de las versiones de las particiones: crece con cada modificación de cualquiera."""
+        return sum(shard.version for shard in self.shards)
+
+    def _shard(self, plate: str) -> VehicleIndex:
+        """Partición que guarda la placa."""
+        return self.shards[zlib.crc32(plate.encode()) % len(self.shards)]
+
+    def add_listener(self, listener: TreeListener) -> None:
+        """Registra un observador en todas las particiones, con sus llamadas serializadas."""
+        wrapped = _SerializedListener(listener, self._listener_lock)
+        for shard in self.shards:
+            shard.add_listener(wrapped)
+
+    def set_stats(self, stats: Optional[TreeStats]) -> None:
+        """Asigna el mismo observador de costos a todas las particiones."""
+        for shard in self.shards:
+            shard.set_stats(stats)
+
+    def enable_filter(self, capacity: int = 100000, false_positive_rate: float = 0.01) -> None:
+        """Activa un filtro de Bloom por partición, cada uno con su parte de la capacidad."""
+        for shard in self.shards:
+            shard.enable_filter(math.ceil(capacity / len(self.shards)), false_positive_rate)
+
+    def snapshot(self) -> "ShardedTree":
+        """
+        Vista de solo lectura formada por una vista de cada partición.
+
+        Complejidad de tiempo: O(N)
+        """
+        view = ShardedTree([shard.snapshot() for shard in self.shards])
+        view.compact = self.compact
+        return view
+
+    def _views(self) -> List[VehicleIndex]:
+        """Vistas de las particiones, para consultas que leen varias veces cada una."""
+        return [shard.snapshot() for shard in self.shards]
+
+    def insert(self, vehicle: Vehicle) -> bool:
+        """Inserta un vehículo en su partición; False si la placa ya existe."""
+        return self._shard(vehicle.plate).insert(vehicle)
+
+    def search(self, plate: str) -> Optional[Vehicle]:
+        """Busca un vehículo en la partición de su placa."""
+        return self._shard(plate).search(plate)
+
+    def __contains__(self, plate: str) -> bool:
+        """Indica si la placa está en su partición."""
+        return plate in self._shard(plate)
+
+    def search_json(self, plate: str) -> Optional[bytes]:
+        """Busca un vehículo y retorna su JSON ya serializado."""
+        return self._shard(plate).search_json(plate)
+
+    def update(self, plate: str, updated_vehicle: Vehicle) -> bool:
+        """Reemplaza los datos de un vehículo; False si no existe."""
+        return self._shard(plate).update(plate, updated_vehicle)
+
+    def delete(self, plate: str) -> bool:
+        """Elimina un vehículo de su partición; False si no existe."""
+        return self._shard(plate).delete(plate)
+
+    def bulk_load(self, vehicles: Iterable[Vehicle], presorted: bool = False) -> int:
+        """
+        Reparte los vehículos entre las particiones y carga cada una de una vez.
+
+        El reparto conserva el orden de entrada, así que cada lote sigue
+        ordenado si la entrada lo estaba.
+
+        Returns:
+            int: Cantidad de vehículos nuevos agregados.
+        """
+        count = len(self.shards)
+        batches: List[list] = [[] for _ in range(count)]
+        for vehicle in vehicles:
+            batches[zlib.crc32(vehicle.plate.encode()) % count].append(vehicle)
+        return sum(
+            shard.bulk_load(batch, presorted=presorted)
+            for shard, batch in zip(self.shards, batches) if batch
+        )
+
+    def __len__(self) -> int:
+        """Cantidad de vehículos de todas las particiones."""
+        return sum(len(shard) for shard in self.shards)
+
+    def height(self) -> int:
+        """Altura de la partición más alta: el peor camino de una búsqueda."""
+        return max(shard.height() for shard in self.shards)
+
+    def average_depth(self) -> float:
+        """Niveles visitados en promedio por una búsqueda exitosa, ponderando cada partición por su tamaño."""
+        sizes = [len(shard) for shard in self.shards]
+        total = sum(sizes)
+        if not total:
+            return 0.0
+        return sum(size * shard.average_depth() for size, shard in zip(sizes, self.shards)) / total
+
+    def rank(self, plate: str) -> int:
+        """
+        Cantidad de placas menores que la dada, sumando las de cada partición.
+
+        Complejidad de tiempo: O(N log n)
+        """
+        return sum(shard.rank(plate) for shard in self.shards)
+
+    def select(self, index: int) -> Vehicle:
+        """
+        Retorna el vehículo en la posición `index` del orden global de placas.
+
+        Para cada partición se mantiene el intervalo [lo, hi) de posiciones
+        donde todavía puede estar la respuesta. En cada paso se toma como
+        pivote el vehículo del medio del intervalo más largo y se calcula su
+        posición global (la suma de su rank en cada partición): si es
+        `index`, es la respuesta; si no, el pivote acota el intervalo de
+        todas las particiones a la vez. Como las placas están repartidas al
+        azar, un pivote del medio de una partición cae cerca del medio de
+        las demás y todos los intervalos se achican a la par.
+
+        Complejidad de tiempo: O(N log n) por paso, O(log n) pasos en
+        promedio (O(N log n) en el peor caso).
+
+        Raises:
+            IndexError: Si la posición está fuera del índice.
+        """
+        shards = self._views()
+        lo = [0] * len(shards)
+        hi = [len(shard) for shard in shards]
+        if not 0 <= index < sum(hi):
+            raise IndexError("tree index out of range")
+        while True:
+            widest = max(range(len(shards)), key=lambda i: hi[i] - lo[i])
+            middle = (lo[widest] + hi[widest]) // 2
+            pivot = shards[widest].select(middle)
+            ranks = [
+                middle if i == widest else shard.rank(pivot.plate)
+                for i, shard in enumerate(shards)
+            ]
+            position = sum(ranks)
+            if position == index:
+                return pivot
+            if position < index:
+                # La respuesta es mayor que el pivote
+                ranks[widest] = middle + 1
+                lo = [max(a, b) for a, b in zip(lo, ranks)]
+            else:
+                hi = [min(a, b) for a, b in zip(hi, ranks)]
+
+    def floor(self, plate: str) -> Optional[Vehicle]:
+        """Vehículo con la mayor placa menor o igual a la dada, o None."""
+        found = [vehicle for vehicle in (shard.floor(plate) for shard in self.shards) if vehicle is not None]
+        return max(found, key=_plate_of) if found else None
+
+    def ceiling(self, plate: str) -> Optional[Vehicle]:
+        """Vehículo con la menor placa mayor o igual a la dada, o None."""
+        found = [vehicle for vehicle in (shard.ceiling(plate) for shard in self.shards) if vehicle is not None]
+        return min(found, key=_plate_of) if found else None
+
+    def range(self, low: Optional[str] = None, high: Optional[str] = None) -> Iterator[Vehicle]:
+        """Generador de los vehículos con placa entre `low` y `high` (ambos inclusive)."""
+        return self.iter_inorder(low=low, high=high)
+
+    def count_range(self, low: Optional[str] = None, high: Optional[str] = None) -> int:
+        """Cuenta los vehículos con placa entre `low` y `high` (ambos inclusive)."""
+        return sum(shard.count_range(low, high) for shard in self.shards)
+
+    def price_stats(self, low: Optional[str] = None, high: Optional[str] = None) -> PriceSummary:
+        """Combina las estadísticas de precio del rango en cada partición."""
+        return merge(shard.price_stats(low, high) for shard in self.shards)
+
+    def recompute_price_stats(self, low: Optional[str] = None, high: Optional[str] = None) -> PriceSummary:
+        """Las mismas estadísticas recorriendo el rango completo de cada partición."""
+        return merge(shard.recompute_price_stats(low, high) for shard in self.shards)
+
+    def _start(self, shards: List[VehicleIndex], start: int, low: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Placa desde la que cada partición empieza un recorrido que omite `start` vehículos.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Si queda algo por recorrer, y la placa inicial.
+        """
+        if not start:
+            return True, low
+        view = ShardedTree(shards)
+        position = start + (view.rank(low) if low is not None else 0)
+        if position >= len(view):
+            return False, None
+        return True, view.select(position).plate
+
+    def iter_inorder(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Vehicle]:
+        """
+        Generador de los vehículos en orden de placa, mezclando las particiones.
+
+        Complejidad de tiempo: O(N log n) para ubicar el inicio y O(log N)
+        por vehículo recorrido.
+        """
+        shards = self._views()
+        found, first = self._start(shards, start, low)
+        if not found:
+            return iter(())
+        return heapq.merge(*(shard.iter_inorder(low=first, high=high) for shard in shards), key=_plate_of)
+
+    def iter_json_items(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Generador de pares (placa, JSON) en orden de placa, mezclando las particiones."""
+        shards = self._views()
+        found, first = self._start(shards, start, low)
+        if not found:
+            return iter(())
+        # Las placas no se repiten entre particiones: las tuplas nunca comparan el JSON
+        return heapq.merge(*(shard.iter_json_items(low=first, high=high) for shard in shards))
+
+    def iter_json(
+        self, order: str = "inorder", start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        Generador con el JSON de cada vehículo en orden de placa.
+
+        Raises:
+            NotImplementedError: Si se pide preorden o postorden.
+            ValueError: Si el recorrido no existe.
+        """
+        if order in ("preorder", "postorder"):
+            self._no_tree_order(order)
+        if order != "inorder":
+            raise ValueError(f"Unknown traversal '{order}'")
+        return (data for _, data in self.iter_json_items(start, low, high))
+
+    @staticmethod
+    def _no_tree_order(order: str):
+        raise NotImplementedError(f"{order} traversal is not available on a sharded tree")
+
+    def iter_preorder(self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None) -> Iterator[Vehicle]:
+        """No disponible en un índice particionado. Lanza NotImplementedError."""
+        self._no_tree_order("preorder")
+
+    def iter_postorder(self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None) -> Iterator[Vehicle]:
+        """No disponible en un índice particionado. Lanza NotImplementedError."""
+        self._no_tree_order("postorder")
+
+    def inorder(self) -> List[Vehicle]:
+        """Lista de vehículos ordenados por placa."""
+        return list(self.iter_inorder())
+
+    def preorder(self) -> List[Vehicle]:
+        """No disponible en un índice particionado. Lanza NotImplementedError."""
+        self._no_tree_order("preorder")
+
+    def postorder(self) -> List[Vehicle]:
+        """No disponible en un índice particionado. Lanza NotImplementedError."""
+        self._no_tree_order("postorder")
+
+    def get_all(self) -> List[Vehicle]:
+        """Todos los vehículos ordenados por placa."""
+        return self.inorder()
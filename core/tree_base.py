@@ -0,0 +1,215 @@
+import copy
+import threading
+from itertools import chain
+from time import perf_counter_ns
+from typing import Iterator, List, Optional
+from models.vehicle import Vehicle
+from core.plate_filter import CountingBloomFilter
+from core.record_store import RecordStore
+from core.tree_listener import TreeListener
+from core.tree_stats import TreeStats
+from core.vehicle_record import VehicleRecord
+
+
+class TreeBase:
+    """
+    Base común de los motores de árbol (BinarySearchTree y BPlusTree).
+
+    Reúne lo que no depende de la forma de los nodos: la representación de
+    los vehículos guardados (modelos, VehicleRecord o DiskRef del modo
+    disco), los observadores, las vistas de solo lectura, el filtro de Bloom
+    y la medición de operaciones. Cada motor implementa las piezas que sí
+    dependen de su estructura:
+
+    - _plates(): placas de la versión publicada, en orden
+    - _comparisons(plate): costo de descender hasta una placa
+    - __len__(): cantidad de vehículos
+    """
+
+    def __init__(self, compact: bool = False, records: Optional[RecordStore] = None):
+        """
+        Inicializa el estado común de un árbol vacío.
+
+        Args:
+            compact (bool): Si es True, los nodos guardan VehicleRecord (tuplas
+                con cadenas internadas) en lugar de modelos pydantic, y los
+                Vehicle se construyen solo al devolverlos.
+            records (Optional[RecordStore]): Modo disco: los vehículos se
+                escriben en este archivo y los nodos guardan solo un DiskRef
+                (placa, precio y posición). Implica el modo compacto.
+
+        Atributos:
+            listeners (List[TreeListener]): Observadores notificados de cada cambio.
+            compact (bool): Modo de almacenamiento compacto.
+            records (Optional[RecordStore]): Archivo de registros del modo disco, o None.
+            version (int): Contador de modificaciones; cambia con cada insert,
+                update, delete o bulk_load exitoso. Sirve para invalidar cachés.
+            stats (Optional[TreeStats]): Observador que mide una muestra de
+                las operaciones; None desactiva la medición.
+            filter (Optional[CountingBloomFilter]): Filtro de pertenencia que
+                descarta en O(1) las búsquedas de placas inexistentes; None
+                (por defecto) lo desactiva.
+        """
+        self.listeners: List[TreeListener] = []
+        self.records = records
+        self.compact = compact or records is not None
+        self.version = 0
+        self.stats: Optional[TreeStats] = None
+        self.filter: Optional[CountingBloomFilter] = None
+        # Serializa a los escritores; los lectores nunca lo toman
+        self._write_lock = threading.Lock()
+
+    def _store(self, vehicle: Vehicle):
+        """
+        Convierte un vehículo a la representación que se guarda en los nodos.
+
+        Acepta tanto Vehicle como VehicleRecord (por ejemplo, los registros
+        leídos de un snapshot binario). En modo disco escribe el vehículo en
+        el archivo de registros y retorna la referencia.
+        """
+        if self.records is not None:
+            return self.records.append(vehicle)
+        if self.compact:
+            return VehicleRecord.from_vehicle(vehicle)
+        if isinstance(vehicle, VehicleRecord):
+            return vehicle.to_vehicle()
+        return vehicle
+
+    def _load(self, stored, cache: bool = True) -> Vehicle:
+        """
+        Convierte el contenido de un nodo en el Vehicle que expone la API.
+
+        En modo disco, `cache` indica si el vehículo leído entra en la caché
+        de registros; los recorridos pasan False.
+        """
+        if self.records is not None:
+            return self.records.load(stored, cache)
+        return stored.to_vehicle() if self.compact else stored
+
+    def add_listener(self, listener: TreeListener) -> None:
+        """
+        Registra un observador que se mantiene sincronizado con el árbol.
+
+        El observador recibe on_insert, on_update, on_delete y on_bulk_load
+        después de cada modificación exitosa.
+
+        Args:
+            listener (TreeListener): El observador a registrar.
+        """
+        self.listeners.append(listener)
+
+    def snapshot(self):
+        """
+        Retorna una vista de solo lectura de la versión actual del árbol.
+
+        La vista comparte todos los nodos con el árbol (no copia nada), así que
+        cuesta O(1). Como los nodos publicados nunca se modifican, varias
+        consultas sobre la vista (por ejemplo count_range y un recorrido)
+        ven exactamente los mismos datos aunque haya escrituras concurrentes.
+
+        Returns:
+            Un árbol del mismo motor con la misma raíz y versión.
+        """
+        view = copy.copy(self)
+        view.listeners = []
+        view.stats = None
+        # El filtro sigue a la versión más reciente, no a la de la vista
+        view.filter = None
+        view._write_lock = threading.Lock()
+        return view
+
+    def set_stats(self, stats: Optional[TreeStats]) -> None:
+        """
+        Asigna el observador que mide el costo de search, insert y delete.
+
+        Args:
+            stats (Optional[TreeStats]): El observador, o None para no medir.
+        """
+        self.stats = stats
+
+    def enable_filter(self, capacity: int = 100000, false_positive_rate: float = 0.01) -> None:
+        """
+        Activa el filtro de Bloom que responde en O(1) las búsquedas de placas inexistentes.
+
+        El filtro se carga con las placas actuales y desde entonces insert,
+        delete y bulk_load lo mantienen al día. Si el árbol supera la
+        capacidad, el filtro se reemplaza por uno más grande.
+
+        El filtro se actualiza siempre del lado seguro para los lectores
+        concurrentes: las placas nuevas se agregan antes de publicar la
+        versión que las contiene, y las eliminadas se quitan después de
+        publicar la versión sin ellas. Así nunca descarta una placa presente
+        en la raíz publicada.
+
+        Args:
+            capacity (int): Placas esperadas (se usa al menos el doble de las actuales).
+            false_positive_rate (float): Tasa de falsos positivos deseada.
+        """
+        with self._write_lock:
+            bloom = CountingBloomFilter(max(capacity, 2 * len(self)), false_positive_rate)
+            bloom.update(self._plates())
+            self.filter = bloom
+
+    def _plates(self) -> Iterator[str]:
+        """Placas de la versión publicada, en orden."""
+        raise NotImplementedError
+
+    def _merges_incrementally(self, count: int) -> bool:
+        """
+        Si bulk_load debe insertar `count` vehículos uno por uno en lugar de reconstruir el árbol.
+
+        Reconstruir cuesta O(n + m) aunque lleguen pocos vehículos; insertarlos
+        copiando caminos cuesta O(m log n). Se inserta cuando eso es menor,
+        por ejemplo una importación de unas filas sobre una flota grande.
+        """
+        size = len(self)
+        return count * size.bit_length() < size
+
+    def _filter_add(self, plates: List[str]) -> None:
+        """
+        Agrega al filtro las placas de la versión que está por publicarse.
+
+        Si no entran en la capacidad del filtro, arma uno más grande con todas
+        las placas y recién entonces lo reemplaza.
+        """
+        bloom = self.filter
+        if bloom.count + len(plates) <= bloom.capacity:
+            bloom.update(plates)
+        else:
+            self.filter = bloom.grown(chain(self._plates(), plates), len(self) + len(plates))
+
+    def _publish_bulk(self, root, added: List[Vehicle]) -> int:
+        """
+        Publica la versión armada por bulk_load y notifica a los observadores.
+
+        Las placas nuevas entran al filtro antes de publicar la raíz, como en insert.
+
+        Returns:
+            int: Cantidad de vehículos agregados.
+        """
+        if self.filter is not None and added:
+            self._filter_add([vehicle.plate for vehicle in added])
+        self.root = root
+        if added:
+            self.version += 1
+        for listener in self.listeners:
+            listener.on_bulk_load(added)
+        return len(added)
+
+    def _sampled(self, operation: str, plate: str, func, *args):
+        """
+        Ejecuta una operación midiendo su duración y sus comparaciones.
+
+        Las comparaciones se cuentan antes de ejecutarla, recorriendo el mismo
+        camino que seguirá el descenso, para no tocar el bucle principal ni
+        incluir ese conteo en el tiempo medido.
+        """
+        comparisons = self._comparisons(plate)
+        started = perf_counter_ns()
+        result = func(*args)
+        self.stats.record(operation, perf_counter_ns() - started, comparisons)
+        return result
+
+    def _comparisons(self, plate: str) -> int:
+        """Cantidad de placas comparadas al descender buscando `plate`."""
+        raise NotImplementedError
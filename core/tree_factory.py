@@ -0,0 +1,65 @@
+from core.bst import BinarySearchTree
+from core.avl_tree import AVLTree
+from core.bplus_tree import BPlusTree, DEFAULT_FANOUT
+from core.record_store import RecordStore
+from core.sharded_tree import ShardedTree
+from core.vehicle_index import VehicleIndex
+
+# Motores de árbol disponibles, seleccionables por nombre
+TREE_ENGINES = {
+    "bst": BinarySearchTree,
+    "avl": AVLTree,
+    "bptree": BPlusTree,
+}
+
+
+def create_tree(
+    engine: str = "avl",
+    compact: bool = False,
+    fanout: int = DEFAULT_FANOUT,
+    shards: int = 1,
+    record_file: str = "",
+    record_cache_size: int = 10000,
+) -> VehicleIndex:
+    """
+    Crea un árbol vacío del motor indicado.
+
+    Args:
+        engine (str): Nombre del motor ("bst", "avl" o "bptree").
+        compact (bool): Guardar registros compactos en lugar de modelos pydantic.
+        fanout (int): Hijos por nodo del árbol B+ (los motores binarios lo ignoran).
+        shards (int): Con más de 1, un ShardedTree que reparte las placas
+            entre esa cantidad de árboles del motor elegido.
+        record_file (str): Con una ruta, modo disco: los vehículos se guardan
+            en ese archivo y el árbol solo guarda placas y posiciones. Cada
+            partición usa su propio archivo (ruta.0, ruta.1, ...).
+        record_cache_size (int): Vehículos materializados en la caché LRU del
+            modo disco (repartidos entre las particiones).
+
+    Returns:
+        VehicleIndex: Una instancia vacía del motor elegido.
+
+    Raises:
+        ValueError: Si el motor no existe o la cantidad de particiones es menor que 1.
+    """
+    if shards < 1:
+        raise ValueError("The number of shards must be at least 1")
+    if shards > 1:
+        return ShardedTree([
+            create_tree(
+                engine, compact, fanout,
+                record_file=f"{record_file}.{i}" if record_file else "",
+                record_cache_size=-(-record_cache_size // shards),
+            )
+            for i in range(shards)
+        ])
+    try:
+        tree_class = TREE_ENGINES[engine.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown tree engine '{engine}'. Available: {', '.join(TREE_ENGINES)}"
+        ) from None
+    records = RecordStore(record_file, record_cache_size) if record_file else None
+    if tree_class is BPlusTree:
+        return BPlusTree(fanout=fanout, compact=compact, records=records)
+    return tree_class(compact=compact, records=records)
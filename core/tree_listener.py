@@ -0,0 +1,35 @@
+from typing import List
+from models.vehicle import Vehicle
+
+
+class TreeListener:
+    """
+    Observador de las modificaciones de un árbol de vehículos.
+
+    Las estructuras que deben mantenerse sincronizadas con el árbol (por
+    ejemplo los índices secundarios) heredan de esta clase y se registran con
+    BinarySearchTree.add_listener. Cada método se llama después de que el
+    árbol aplicó el cambio. Por defecto no hacen nada.
+
+    Los vehículos recibidos son los que guarda el árbol: modelos Vehicle o,
+    en modo compacto, VehicleRecord con los mismos atributos.
+    """
+
+    def on_insert(self, vehicle: Vehicle) -> None:
+        """Se llama cuando se inserta un vehículo nuevo."""
+
+    def on_update(self, old: Vehicle, new: Vehicle) -> None:
+        """Se llama cuando se reemplazan los datos de un vehículo existente."""
+
+    def on_delete(self, vehicle: Vehicle) -> None:
+        """Se llama cuando se elimina un vehículo."""
+
+    def on_bulk_load(self, vehicles: List[Vehicle]) -> None:
+        """
+        Se llama tras una carga masiva con los vehículos realmente agregados.
+
+        Por defecto equivale a llamar on_insert para cada uno; las subclases
+        pueden sobrescribirlo para procesar el lote de una sola vez.
+        """
+        for vehicle in vehicles:
+            self.on_insert(vehicle)
@@ -0,0 +1,37 @@
+class TreeStats:
+    """
+    Observador del costo de las operaciones de un árbol de vehículos.
+
+    Se asigna con BinarySearchTree.set_stats. Para que la medición pueda
+    quedar activa en producción, el árbol solo mide una de cada
+    `sample_every` operaciones (search, insert y delete): en esas toma el
+    tiempo transcurrido y la cantidad de nodos comparados durante el
+    descenso, y las entrega a record. Por defecto record no hace nada; las
+    subclases deciden dónde acumular los datos.
+    """
+
+    def __init__(self, sample_every: int = 16):
+        """
+        Args:
+            sample_every (int): Se mide una de cada `sample_every` operaciones
+                (1 mide todas, 0 no mide ninguna).
+        """
+        self.sample_every = sample_every
+        self._calls = 0
+
+    def should_sample(self) -> bool:
+        """Cuenta una operación y retorna True si debe medirse."""
+        if self.sample_every <= 0:
+            return False
+        self._calls += 1
+        return self._calls % self.sample_every == 0
+
+    def record(self, operation: str, elapsed_ns: int, comparisons: int) -> None:
+        """
+        Se llama con cada operación medida.
+
+        Args:
+            operation (str): "search", "insert" o "delete".
+            elapsed_ns (int): Duración de la operación en nanosegundos.
+            comparisons (int): Nodos cuya placa se comparó durante el descenso.
+        """
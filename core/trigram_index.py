@@ -0,0 +1,120 @@
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Set
+from models.vehicle import Vehicle
+from core.tree_listener import TreeListener
+
+
+class TrigramIndex(TreeListener):
+    """
+    Índice invertido de trigramas de las placas, para buscar por subcadena.
+
+    Cada placa (normalizada sin mayúsculas) se descompone en sus trigramas,
+    las subcadenas de tres caracteres: "MVZ321" -> mvz, vz3, z32, 321. El
+    índice guarda, por trigrama, la lista ordenada de placas que lo contienen.
+
+    Una placa que contiene el texto buscado contiene también todos sus
+    trigramas, así que basta recorrer la lista del trigrama menos frecuente
+    del texto, en orden, comprobando la subcadena en cada placa, y parar al
+    juntar las pedidas. Nunca se recorre el árbol ni la lista completa de
+    placas, y las placas salen ordenadas sin tener que ordenarlas.
+
+    Las listas guardan referencias a las mismas cadenas que el árbol, así
+    que cada aparición de una placa cuesta un puntero (una placa de seis
+    caracteres aparece en cuatro listas).
+
+    Se registra como listener del árbol, igual que SecondaryIndexes. Los
+    textos de menos de tres caracteres no tienen trigramas y no se buscan
+    aquí (el controlador los resuelve por prefijo en el árbol).
+
+    Como en SecondaryIndexes, un lock serializa las modificaciones (que
+    pueden llegar desde otro hilo) con las búsquedas.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Las placas y los textos buscados se comparan sin distinguir mayúsculas."""
+        return text.casefold()
+
+    @staticmethod
+    def _trigrams(key: str) -> Set[str]:
+        """Trigramas distintos de un texto ya normalizado."""
+        return {key[i:i + 3] for i in range(len(key) - 2)}
+
+    def on_insert(self, vehicle: Vehicle) -> None:
+        plate = vehicle.plate
+        with self._lock:
+            for trigram in self._trigrams(self._normalize(plate)):
+                plates = self._postings.get(trigram)
+                if plates is None:
+                    self._postings[trigram] = [plate]
+                else:
+                    insort(plates, plate)
+
+    def on_update(self, old: Vehicle, new: Vehicle) -> None:
+        # La placa es la clave del árbol y no cambia al actualizar
+        pass
+
+    def on_delete(self, vehicle: Vehicle) -> None:
+        plate = vehicle.plate
+        with self._lock:
+            for trigram in self._trigrams(self._normalize(plate)):
+                plates = self._postings.get(trigram)
+                if plates is None:
+                    continue
+                position = bisect_left(plates, plate)
+                if position < len(plates) and plates[position] == plate:
+                    del plates[position]
+                    if not plates:
+                        del self._postings[trigram]
+
+    def on_bulk_load(self, vehicles: List[Vehicle]) -> None:
+        """Agrega las placas al final de sus listas y reordena una vez las listas que quedaron desordenadas."""
+        postings = self._postings
+        touched: Set[str] = set()
+        with self._lock:
+            for vehicle in vehicles:
+                plate = vehicle.plate
+                for trigram in self._trigrams(self._normalize(plate)):
+                    plates = postings.get(trigram)
+                    if plates is None:
+                        postings[trigram] = [plate]
+                    else:
+                        if plates[-1] > plate:
+                            touched.add(trigram)
+                        plates.append(plate)
+            for trigram in touched:
+                postings[trigram].sort()
+
+    def search(self, text: str, limit: int) -> List[str]:
+        """
+        Placas que contienen `text`, las `limit` menores en orden.
+
+        Complejidad de tiempo: O(m) en el peor caso, con m el largo de la
+        lista del trigrama menos frecuente del texto; termina antes si junta
+        `limit` placas.
+
+        Args:
+            text (str): Texto a buscar (al menos tres caracteres).
+            limit (int): Cantidad máxima de placas.
+
+        Returns:
+            List[str]: Las placas encontradas, ordenadas.
+        """
+        key = self._normalize(text)
+        trigrams = self._trigrams(key)
+        if not trigrams:
+            return []
+        found: List[str] = []
+        with self._lock:
+            rarest = min((self._postings.get(trigram, []) for trigram in trigrams), key=len)
+            for plate in rarest:
+                if key in self._normalize(plate):
+                    found.append(plate)
+                    if len(found) == limit:
+                        break
+        return found
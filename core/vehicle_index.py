@@ -0,0 +1,125 @@
+from typing import Iterable, Iterator, List, Optional, Protocol, Tuple
+from models.vehicle import Vehicle
+from core.plate_filter import CountingBloomFilter
+from core.price_summary import PriceSummary
+from core.tree_listener import TreeListener
+from core.tree_stats import TreeStats
+
+
+class VehicleIndex(Protocol):
+    """
+    Interfaz común de los motores que indexan vehículos por placa.
+
+    BinarySearchTree (y AVLTree) la cumplen tal cual; BPlusTree la implementa
+    con hojas anchas ordenadas. El controlador solo usa estos métodos, así que
+    cualquier motor registrado en tree_factory.TREE_ENGINES puede atender los
+    mismos endpoints.
+
+    Todos los motores siguen el mismo contrato de versiones: las escrituras
+    publican una nueva raíz sin modificar los nodos que un lector pueda estar
+    recorriendo, y snapshot() retorna una vista estable en O(1).
+
+    Los recorridos preorden y postorden dependen de la forma de un árbol
+    binario; un motor que no los tenga lanza NotImplementedError al pedirlos.
+    """
+
+    compact: bool
+    version: int
+    filter: Optional[CountingBloomFilter]
+
+    def add_listener(self, listener: TreeListener) -> None:
+        """Registra un observador de las modificaciones."""
+
+    def set_stats(self, stats: Optional[TreeStats]) -> None:
+        """Asigna el observador del costo de las operaciones."""
+
+    def enable_filter(self, capacity: int = 100000, false_positive_rate: float = 0.01) -> None:
+        """Activa el filtro de Bloom que descarta las placas inexistentes en O(1)."""
+
+    def snapshot(self) -> "VehicleIndex":
+        """Vista de solo lectura de la versión actual."""
+
+    def insert(self, vehicle: Vehicle) -> bool:
+        """Inserta un vehículo; False si la placa ya existe."""
+
+    def search(self, plate: str) -> Optional[Vehicle]:
+        """Busca un vehículo por placa."""
+
+    def __contains__(self, plate: str) -> bool:
+        """Si la placa existe, sin construir el vehículo."""
+
+    def search_json(self, plate: str) -> Optional[bytes]:
+        """Busca un vehículo y retorna su JSON ya serializado."""
+
+    def update(self, plate: str, updated_vehicle: Vehicle) -> bool:
+        """Reemplaza los datos de un vehículo; False si no existe."""
+
+    def delete(self, plate: str) -> bool:
+        """Elimina un vehículo; False si no existe."""
+
+    def bulk_load(self, vehicles: Iterable[Vehicle], presorted: bool = False) -> int:
+        """Agrega muchos vehículos de una vez; retorna cuántos eran nuevos."""
+
+    def __len__(self) -> int:
+        """Cantidad de vehículos."""
+
+    def height(self) -> int:
+        """Niveles del índice (0 si está vacío)."""
+
+    def average_depth(self) -> float:
+        """Niveles visitados en promedio por una búsqueda exitosa."""
+
+    def rank(self, plate: str) -> int:
+        """Cantidad de placas menores que la dada."""
+
+    def select(self, index: int) -> Vehicle:
+        """Vehículo en la posición `index` del orden de placas."""
+
+    def floor(self, plate: str) -> Optional[Vehicle]:
+        """Vehículo con la mayor placa menor o igual a la dada."""
+
+    def ceiling(self, plate: str) -> Optional[Vehicle]:
+        """Vehículo con la menor placa mayor o igual a la dada."""
+
+    def range(self, low: Optional[str] = None, high: Optional[str] = None) -> Iterator[Vehicle]:
+        """Vehículos con placa entre `low` y `high` (inclusive)."""
+
+    def count_range(self, low: Optional[str] = None, high: Optional[str] = None) -> int:
+        """Cantidad de vehículos con placa entre `low` y `high` (inclusive)."""
+
+    def price_stats(self, low: Optional[str] = None, high: Optional[str] = None) -> PriceSummary:
+        """Estadísticas de precio del rango de placas, a partir de los agregados del índice."""
+
+    def recompute_price_stats(self, low: Optional[str] = None, high: Optional[str] = None) -> PriceSummary:
+        """Las mismas estadísticas recorriendo el rango completo, para verificarlas."""
+
+    def iter_inorder(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Vehicle]:
+        """Vehículos en orden de placa, omitiendo `start` y limitados al rango."""
+
+    def iter_preorder(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Vehicle]:
+        """Recorrido preorden."""
+
+    def iter_postorder(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Vehicle]:
+        """Recorrido postorden."""
+
+    def iter_json(
+        self, order: str = "inorder", start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """JSON de cada vehículo en el recorrido indicado."""
+
+    def iter_json_items(
+        self, start: int = 0, low: Optional[str] = None, high: Optional[str] = None
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Pares (placa, JSON) en orden de placa, para mezclar varios índices."""
+
+    def inorder(self) -> List[Vehicle]:
+        """Lista de vehículos en orden de placa."""
+
+    def get_all(self) -> List[Vehicle]:
+        """Todos los vehículos ordenados por placa."""
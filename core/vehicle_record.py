@@ -0,0 +1,43 @@
+import sys
+from typing import NamedTuple, Union
+from models.vehicle import Vehicle
+
+
+class VehicleRecord(NamedTuple):
+    """
+    Representación compacta de un vehículo para guardar dentro del árbol.
+
+    Es una tupla con nombre: no tiene __dict__ ni los metadatos de validación
+    de un modelo pydantic, y expone los mismos atributos que Vehicle (plate,
+    brand, color, model, price), así que el árbol la usa sin cambios. Las
+    cadenas de baja cardinalidad (marca, color y modelo) se internan para que
+    todos los registros compartan la misma copia.
+    """
+    plate: str
+    brand: str
+    color: str
+    model: str
+    price: float
+
+    @classmethod
+    def from_vehicle(cls, vehicle: Union[Vehicle, "VehicleRecord"]) -> "VehicleRecord":
+        """Convierte un Vehicle en registro (un registro se devuelve tal cual)."""
+        if isinstance(vehicle, cls):
+            return vehicle
+        return cls(
+            vehicle.plate,
+            sys.intern(vehicle.brand),
+            sys.intern(vehicle.color),
+            sys.intern(vehicle.model),
+            float(vehicle.price),
+        )
+
+    def to_vehicle(self) -> Vehicle:
+        """Construye el Vehicle de la API sin volver a validar los datos."""
+        return Vehicle.model_construct(
+            plate=self.plate,
+            brand=self.brand,
+            color=self.color,
+            model=self.model,
+            price=self.price,
+        )
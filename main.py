@@ -1,11 +1,27 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from controllers import vehicle_controller
 from controllers.vehicle_controller import router
+from controllers.health_controller import router as health_router
+from services.metrics_service import CONTENT_TYPE, RequestMetricsMiddleware, registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the data in the background so the server can answer health checks right away
+    vehicle_controller.start_warmup()
+    yield
+    # Flush pending writes before the process exits
+    vehicle_controller.shutdown()
+
 
 app = FastAPI(
     title="Vehicle BST API",
     description="Binary Search Tree API for vehicle management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -16,9 +32,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency histograms for /metrics
+app.add_middleware(RequestMetricsMiddleware)
 
 # Include routers
 app.include_router(router)
+app.include_router(health_router)
 
 
 @app.get("/")
@@ -28,3 +47,9 @@ async def root():
         "version": "1.0.0",
         "docs": "/docs"
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Expose service metrics in the Prometheus text format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
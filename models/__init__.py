@@ -1,3 +1,4 @@
 from .vehicle import Vehicle
+from .batch import BatchOperation, BatchRequest
 
-__all__ = ["Vehicle"]
+__all__ = ["Vehicle", "BatchOperation", "BatchRequest"]
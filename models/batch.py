@@ -0,0 +1,35 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+from .vehicle import Vehicle
+
+
+class BatchOperation(BaseModel):
+    """A single insert, update or delete inside a batch request."""
+    op: Literal["insert", "update", "delete"] = Field(..., description="Operation to apply")
+    plate: str = Field(..., description="Plate the operation applies to")
+    vehicle: Optional[Vehicle] = Field(None, description="Vehicle data (required for insert and update)")
+
+
+class BatchRequest(BaseModel):
+    """A list of operations applied together and persisted with one write."""
+    operations: List[BatchOperation] = Field(..., description="Operations to apply")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "operations": [
+                    {
+                        "op": "insert",
+                        "plate": "ABC-123",
+                        "vehicle": {
+                            "plate": "ABC-123",
+                            "brand": "Toyota",
+                            "color": "Red",
+                            "model": "Corolla",
+                            "price": 25000.00
+                        }
+                    },
+                    {"op": "delete", "plate": "XYZ-789"}
+                ]
+            }
+        }
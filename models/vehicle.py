@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+# Field terminator of binary snapshot records; vehicles may not contain it
+RESERVED_CHARACTER = "\x1f"
 
 
 class Vehicle(BaseModel):
@@ -9,6 +12,14 @@ class Vehicle(BaseModel):
     model: str = Field(..., description="Vehicle model")
     price: float = Field(..., description="Vehicle price")
 
+    @field_validator("plate", "brand", "color", "model")
+    @classmethod
+    def _no_reserved_character(cls, value: str) -> str:
+        """Reject the character that separates fields in snapshots."""
+        if RESERVED_CHARACTER in value:
+            raise ValueError("must not contain the reserved character \\x1f")
+        return value
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -1,3 +1,5 @@
 from .csv_service import CSVService
+from .journal_service import JournaledCSVService
+from .snapshot_service import SnapshotService
 
-__all__ = ["CSVService"]
+__all__ = ["CSVService", "JournaledCSVService", "SnapshotService"]
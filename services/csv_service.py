@@ -1,7 +1,16 @@
 import csv
 import os
-from typing import List
+import time
+from typing import Callable, List, NamedTuple, Optional
 from models.vehicle import Vehicle
+from services.metrics_service import observe_io
+
+
+class Mutation(NamedTuple):
+    """A change to persist: op is "insert", "update" or "delete"."""
+    op: str
+    plate: str
+    vehicle: Optional[Vehicle] = None
 
 
 class CSVService:
@@ -26,22 +35,40 @@ class CSVService:
                 writer.writeheader()
 
     def save_all(self, vehicles: List[Vehicle]) -> None:
-        """Save all vehicles to CSV file."""
-        with open(self.filepath, 'w', newline='') as f:
+        """Save all vehicles to CSV file.
+
+        The data is written to a temporary file that atomically replaces the
+        CSV, so a crash mid-write never leaves a truncated file behind.
+        """
+        started = time.perf_counter()
+        tmp_path = self.filepath + ".tmp"
+        with open(tmp_path, 'w', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=['plate', 'brand', 'color', 'model', 'price'])
             writer.writeheader()
             for vehicle in vehicles:
                 writer.writerow(vehicle.model_dump())
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(tmp_path, self.filepath)
+        observe_io("save", started, size)
 
-    def load_all(self) -> List[Vehicle]:
-        """Load all vehicles from CSV file."""
+    def load_all(self, progress: Optional[Callable[[int], None]] = None, chunk_size: int = 10000) -> List[Vehicle]:
+        """Load all vehicles from CSV file.
+
+        If given, `progress` is called with the number of rows read after
+        every `chunk_size` rows.
+        """
         vehicles = []
         if not os.path.exists(self.filepath):
             return vehicles
 
+        started = time.perf_counter()
         with open(self.filepath, 'r', newline='') as f:
             reader = csv.DictReader(f)
-            for row in reader:
+            for count, row in enumerate(reader, 1):
+                if progress is not None and count % chunk_size == 0:
+                    progress(count)
                 if row:
                     try:
                         vehicle = Vehicle(
@@ -54,13 +81,19 @@ class CSVService:
                         vehicles.append(vehicle)
                     except (KeyError, ValueError):
                         continue
+            size = os.fstat(f.fileno()).st_size
+        observe_io("load", started, size)
         return vehicles
 
     def add_vehicle(self, vehicle: Vehicle) -> None:
         """Add a single vehicle to CSV file."""
+        started = time.perf_counter()
         with open(self.filepath, 'a', newline='') as f:
+            start = f.tell()
             writer = csv.DictWriter(f, fieldnames=['plate', 'brand', 'color', 'model', 'price'])
             writer.writerow(vehicle.model_dump())
+            size = f.tell() - start
+        observe_io("append", started, size)
 
     def remove_vehicle(self, plate: str) -> None:
         """Remove a vehicle from CSV file by plate."""
@@ -76,3 +109,38 @@ class CSVService:
                 vehicles[i] = updated_vehicle
                 break
         self.save_all(vehicles)
+
+    def apply_batch(self, mutations: List[Mutation]) -> None:
+        """Persist a batch of mutations with a single write and fsync.
+
+        A batch of only inserts is appended; anything else rewrites the file
+        once for the whole batch instead of once per mutation.
+        """
+        if not mutations:
+            return
+        if all(mutation.op == "insert" for mutation in mutations):
+            started = time.perf_counter()
+            with open(self.filepath, 'a', newline='') as f:
+                start = f.tell()
+                writer = csv.DictWriter(f, fieldnames=['plate', 'brand', 'color', 'model', 'price'])
+                writer.writerows(mutation.vehicle.model_dump() for mutation in mutations)
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell() - start
+            observe_io("append", started, size)
+            return
+
+        vehicles = {vehicle.plate: vehicle for vehicle in self.load_all()}
+        for mutation in mutations:
+            if mutation.op == "delete":
+                vehicles.pop(mutation.plate, None)
+            else:
+                vehicles[mutation.plate] = mutation.vehicle
+        self.save_all(list(vehicles.values()))
+
+    def source_paths(self) -> List[str]:
+        """Files whose contents make up the persisted data."""
+        return [self.filepath]
+
+    def close(self) -> None:
+        """Release any resources held by the service."""
@@ -0,0 +1,194 @@
+import asyncio
+import csv
+import io
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Awaitable, Callable, Deque, List, NamedTuple, Optional, Tuple
+from pydantic import ValidationError
+from core.vehicle_record import VehicleRecord
+from models.vehicle import Vehicle
+
+FIELDNAMES = ('plate', 'brand', 'color', 'model', 'price')
+
+
+class RowError(NamedTuple):
+    """A rejected CSV row: the file line it starts on (the header is line 1) and the reason."""
+    line: int
+    error: str
+
+
+class ParsedImport(NamedTuple):
+    """Valid vehicles of an uploaded CSV, sorted by plate with one vehicle per plate."""
+    records: List[VehicleRecord]
+    # Line of each record, for reporting rows rejected later
+    lines: List[int]
+    errors: List[RowError]
+    failed: int
+    rows: int
+
+
+def _describe(exc: ValidationError) -> str:
+    """One-line summary of a pydantic validation error."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def parse_chunk(data: bytes, fieldnames: List[str], first_line: int) -> Tuple[List[VehicleRecord], List[int], List[Tuple[int, str]], int]:
+    """Parse and validate a block of whole CSV lines; runs in a worker process.
+
+    Returns the valid vehicles, the file line of each one, the rejected rows
+    as (line, reason) and the number of rows read.
+    """
+    records: List[VehicleRecord] = []
+    lines: List[int] = []
+    errors: List[Tuple[int, str]] = []
+    # Invalid UTF-8 survives decoding as lone surrogates and is reported per row
+    reader = csv.reader(io.StringIO(data.decode("utf-8", "surrogateescape"), newline=""))
+    line = first_line
+    rows = 0
+    try:
+        for row in reader:
+            # A quoted field may span several lines: the row starts where the previous one ended
+            start, line = line, first_line + reader.line_num
+            if not row:
+                continue
+            rows += 1
+            try:
+                if len(row) != len(fieldnames):
+                    raise ValueError(f"expected {len(fieldnames)} fields, found {len(row)}")
+                values = dict(zip(fieldnames, row))
+                fields = {name: values[name] for name in FIELDNAMES}
+                for value in fields.values():
+                    value.encode("utf-8")
+                vehicle = Vehicle(**fields)
+            except ValidationError as exc:
+                errors.append((start, _describe(exc)))
+            except UnicodeEncodeError:
+                errors.append((start, "invalid UTF-8"))
+            except ValueError as exc:
+                errors.append((start, str(exc)))
+            else:
+                records.append(VehicleRecord.from_vehicle(vehicle))
+                lines.append(start)
+    except csv.Error as exc:
+        # A malformed quoted field spoils the rest of the block
+        errors.append((line, f"malformed CSV: {exc}"))
+    return records, lines, errors, rows
+
+
+class ImportService:
+    """Parse uploaded vehicle CSVs in parallel worker processes.
+
+    The upload is read in blocks of `chunk_bytes`, cut at line boundaries
+    (never inside a quoted field) and handed to a process pool, at most two
+    blocks per worker in flight so memory stays bounded however large the
+    file is. Results are collected in file order.
+    """
+
+    def __init__(self, workers: int = 0, chunk_bytes: int = 4 * 1024 * 1024, max_errors: int = 1000):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_bytes = chunk_bytes
+        self.max_errors = max_errors
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use.
+
+        Workers are spawned rather than forked: the server already runs
+        threads, which a forked child would inherit in an unknown state.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    @staticmethod
+    def _read_header(line: bytes) -> List[str]:
+        """Column names of the header line; raises ValueError if a vehicle column is missing."""
+        fieldnames = next(csv.reader([line.decode("utf-8-sig", "replace")]), [])
+        fieldnames = [name.strip() for name in fieldnames]
+        missing = [name for name in FIELDNAMES if name not in fieldnames]
+        if missing:
+            raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+        return fieldnames
+
+    async def parse(self, read: Callable[[int], Awaitable[bytes]]) -> ParsedImport:
+        """Read and validate a whole CSV upload.
+
+        Args:
+            read: Coroutine returning up to n more bytes, b"" at the end (UploadFile.read).
+
+        Raises:
+            ValueError: If the file is empty or its header lacks a vehicle column.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        in_flight: Deque[asyncio.Future] = deque()
+        records: List[VehicleRecord] = []
+        lines: List[int] = []
+        errors: List[RowError] = []
+        failed = 0
+        rows = 0
+
+        def collect(result) -> None:
+            nonlocal failed, rows
+            chunk_records, chunk_lines, chunk_errors, chunk_rows = result
+            records.extend(chunk_records)
+            lines.extend(chunk_lines)
+            failed += len(chunk_errors)
+            rows += chunk_rows
+            errors.extend(RowError(*error) for error in chunk_errors[:self.max_errors - len(errors)])
+
+        fieldnames: Optional[List[str]] = None
+        buffer = b""
+        line = 1
+        eof = False
+        while not eof:
+            data = await read(self.chunk_bytes)
+            eof = not data
+            buffer += data
+            if fieldnames is None:
+                end = buffer.find(b"\n")
+                if end < 0 and not eof:
+                    continue
+                if not buffer.strip():
+                    raise ValueError("CSV file is empty")
+                end = len(buffer) if end < 0 else end + 1
+                fieldnames = self._read_header(buffer[:end])
+                buffer = buffer[end:]
+                line = 2
+
+            cut = len(buffer) if eof else buffer.rfind(b"\n") + 1
+            block = buffer[:cut]
+            if not block or (not eof and block.count(b'"') % 2):
+                # No complete line yet, or the last newline is inside a quoted field
+                continue
+            buffer = buffer[cut:]
+            in_flight.append(loop.run_in_executor(pool, parse_chunk, block, fieldnames, line))
+            line += block.count(b"\n")
+            if len(in_flight) >= 2 * self.workers:
+                collect(await in_flight.popleft())
+        while in_flight:
+            collect(await in_flight.popleft())
+
+        # Keep the first row of each plate, in file order
+        plates = [record.plate for record in records]
+        order = sorted(range(len(records)), key=plates.__getitem__)
+        unique: List[int] = []
+        for i in order:
+            if unique and records[unique[-1]].plate == records[i].plate:
+                failed += 1
+                if len(errors) < self.max_errors:
+                    errors.append(RowError(lines[i], f"Duplicate plate '{records[i].plate}' (first on line {lines[unique[-1]]})"))
+                continue
+            unique.append(i)
+        errors.sort()
+        return ParsedImport([records[i] for i in unique], [lines[i] for i in unique], errors, failed, rows)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
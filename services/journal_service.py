@@ -0,0 +1,308 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+from models.vehicle import Vehicle
+from services.csv_service import CSVService, Mutation
+from services.metrics_service import observe_io
+
+try:
+    import fcntl
+except ImportError:  # file locks are only needed when several processes share the journal
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# First line of a journal started by a compaction, numbering the journal generations
+ROTATE_OP = "rotate"
+
+
+class JournaledCSVService(CSVService):
+    """CSV service with an append-only journal (write-ahead log).
+
+    The CSV file is the snapshot. Every mutation appends one JSON line to the
+    journal instead of rewriting the CSV, so add/update/remove cost O(1) I/O.
+    load_all() replays the journal on top of the snapshot. Compaction writes a
+    fresh snapshot atomically and starts an empty journal; it runs in the
+    background once the journal reaches `compact_threshold` records and, if
+    `compact_interval` is set, every `compact_interval` seconds.
+
+    With `shared` several processes append to the same journal: appends and
+    journal rotation take an exclusive file lock (flock) next to the journal,
+    compactions another one, and a process whose journal was rotated by
+    another one reopens it before appending. Every journal started by a
+    compaction begins with a {"op": "rotate", "generation": n} record so
+    that readers following the journal can tell whether they missed one.
+    """
+
+    def __init__(
+        self,
+        filepath: str = "data/vehicles.csv",
+        journal_path: Optional[str] = None,
+        compact_threshold: int = 10000,
+        compact_interval: float = 0.0,
+        fsync: bool = True,
+        shared: bool = False,
+    ):
+        super().__init__(filepath)
+        self.journal_path = journal_path or filepath + ".journal"
+        # Journal being folded into the snapshot by an in-progress compaction
+        self.compacting_path = self.journal_path + ".compacting"
+        self.compact_threshold = compact_threshold
+        self.compact_interval = compact_interval
+        self.fsync = fsync
+        self.shared = shared
+
+        self._lock = threading.Lock()
+        self._compaction_lock = threading.Lock()
+        # Cross-process locks; the depth makes exclusive() reentrant within a thread
+        self._exclusive_lock = threading.RLock()
+        self._exclusive_depth = 0
+        self._lock_file = None
+        self._compaction_lock_file = None
+        if shared:
+            if fcntl is None:
+                raise RuntimeError("A shared journal needs POSIX file locks (fcntl)")
+            self._lock_file = open(self.journal_path + ".lock", 'a')
+            self._compaction_lock_file = open(self.journal_path + ".compact.lock", 'a')
+        self._records = self._count_records(self.journal_path)
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        with self.exclusive():
+            self._terminate_torn_record()
+        self._stop = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if compact_interval > 0:
+            self._timer = threading.Thread(target=self._compact_periodically, daemon=True)
+            self._timer.start()
+
+    @staticmethod
+    def _count_records(path: str) -> int:
+        """Count the records already present in a journal file."""
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as f:
+            return sum(1 for line in f if line.strip() and not line.startswith(b'{"op":"rotate"'))
+
+    @staticmethod
+    def generation(path: str) -> Optional[int]:
+        """Generation number of a journal file: 0 if it was never rotated, None if it does not exist.
+
+        A rotation puts the new journal in place with its first record
+        already written, so a journal without one is the original.
+        """
+        try:
+            with open(path, 'rb') as f:
+                first = f.readline()
+        except FileNotFoundError:
+            return None
+        try:
+            record = json.loads(first)
+        except ValueError:
+            return 0
+        if isinstance(record, dict) and record.get("op") == ROTATE_OP:
+            return record["generation"]
+        return 0
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the journal write lock, across processes when shared (a no-op otherwise).
+
+        Reentrant within a thread: appends made while holding it do not lock again.
+        """
+        if not self.shared:
+            yield
+            return
+        with self._exclusive_lock:
+            if self._exclusive_depth == 0:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._exclusive_depth += 1
+            try:
+                yield
+            finally:
+                self._exclusive_depth -= 1
+                if self._exclusive_depth == 0:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _follow_rotation(self) -> None:
+        """Reopen the journal if another process rotated it; called holding the write lock."""
+        try:
+            current = os.stat(self.journal_path).st_ino
+        except FileNotFoundError:
+            current = None
+        if current != os.fstat(self._journal.fileno()).st_ino:
+            self._journal.close()
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._records = 0
+
+    def _terminate_torn_record(self) -> None:
+        """End a record torn by a crash so that new records start on a fresh line."""
+        if self._journal.tell() == 0:
+            return
+        with open(self.journal_path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                self._journal.write("\n")
+                self._journal.flush()
+
+    def _append(self, *records: dict) -> None:
+        """Append records to the journal with one write and trigger compaction if it grew too large."""
+        lines = "".join(json.dumps(record, separators=(',', ':')) + "\n" for record in records)
+        with self.exclusive(), self._lock:
+            if self.shared:
+                # Another process may have rotated the journal or died mid-record
+                self._follow_rotation()
+                self._terminate_torn_record()
+            started = time.perf_counter()
+            self._journal.write(lines)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            observe_io("journal_append", started, len(lines.encode('utf-8')))
+            self._records += len(records)
+            should_compact = self.compact_threshold > 0 and self._records >= self.compact_threshold
+        if should_compact:
+            self.compact_in_background()
+
+    def add_vehicle(self, vehicle: Vehicle) -> None:
+        """Record the creation of a vehicle in the journal."""
+        self._append({"op": "insert", "vehicle": vehicle.model_dump()})
+
+    def update_vehicle(self, plate: str, updated_vehicle: Vehicle) -> None:
+        """Record the update of a vehicle in the journal."""
+        self._append({"op": "update", "plate": plate, "vehicle": updated_vehicle.model_dump()})
+
+    def remove_vehicle(self, plate: str) -> None:
+        """Record the removal of a vehicle in the journal."""
+        self._append({"op": "delete", "plate": plate})
+
+    def apply_batch(self, mutations: List[Mutation]) -> None:
+        """Append a batch of mutations to the journal with a single write and fsync."""
+        records = []
+        for mutation in mutations:
+            if mutation.op == "delete":
+                records.append({"op": "delete", "plate": mutation.plate})
+            else:
+                records.append({"op": mutation.op, "plate": mutation.plate, "vehicle": mutation.vehicle.model_dump()})
+        if records:
+            self._append(*records)
+
+    @staticmethod
+    def _replay(path: str, vehicles: Dict[str, Vehicle]) -> None:
+        """Apply the records of a journal file to a plate -> vehicle mapping.
+
+        Records carry the full resulting state, so replaying a record twice is
+        harmless. A torn last line left by a crash is ignored.
+        """
+        if not os.path.exists(path):
+            return
+        started = time.perf_counter()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record["op"] == "delete":
+                        vehicles.pop(record["plate"], None)
+                    else:
+                        vehicle = Vehicle(**record["vehicle"])
+                        vehicles[vehicle.plate] = vehicle
+                except (KeyError, ValueError, TypeError):
+                    continue
+        observe_io("journal_replay", started, os.path.getsize(path))
+
+    def load_all(self, progress: Optional[Callable[[int], None]] = None, chunk_size: int = 10000) -> List[Vehicle]:
+        """Load the CSV snapshot and replay the journal on top of it."""
+        vehicles = {vehicle.plate: vehicle for vehicle in super().load_all(progress, chunk_size)}
+        self._replay(self.compacting_path, vehicles)
+        self._replay(self.journal_path, vehicles)
+        return list(vehicles.values())
+
+    def save_all(self, vehicles: List[Vehicle]) -> None:
+        """Replace all data with a new snapshot and an empty journal."""
+        with self._compaction_lock, self._lock:
+            super().save_all(vehicles)
+            self._journal.truncate(0)
+            self._records = 0
+            if os.path.exists(self.compacting_path):
+                os.remove(self.compacting_path)
+
+    def source_paths(self) -> List[str]:
+        """The CSV snapshot plus the journals replayed on top of it."""
+        return [self.filepath, self.compacting_path, self.journal_path]
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh CSV snapshot.
+
+        The current journal is moved aside so that writers keep appending to a
+        new one while the snapshot is rebuilt. The snapshot is written to a
+        temporary file and renamed over the CSV, then the old journal is dropped.
+        When shared, one process compacts at a time and the journal is rotated
+        holding the write lock.
+        """
+        with self._compaction_lock, self._file_lock(self._compaction_lock_file):
+            with self.exclusive(), self._lock:
+                # A leftover file from an interrupted compaction is folded in first
+                if not os.path.exists(self.compacting_path):
+                    if self.shared:
+                        self._follow_rotation()
+                        # Other processes append too: count what is in the file
+                        self._records = self._count_records(self.journal_path)
+                    if self._records == 0:
+                        return
+                    generation = self.generation(self.journal_path) or 0
+                    self._journal.close()
+                    os.replace(self.journal_path, self.compacting_path)
+                    if self.shared:
+                        self._start_generation(generation + 1)
+                    self._journal = open(self.journal_path, 'a', encoding='utf-8')
+                    self._records = 0
+            super().save_all(self.load_all())
+            os.remove(self.compacting_path)
+
+    @staticmethod
+    @contextmanager
+    def _file_lock(lock_file) -> Iterator[None]:
+        """Hold an exclusive flock on an open file; a no-op for None."""
+        if lock_file is None:
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _start_generation(self, generation: int) -> None:
+        """Put a new journal in place already holding its rotate record, so no reader sees it without one."""
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"op": ROTATE_OP, "generation": generation}, separators=(',', ':')) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    def compact_in_background(self) -> None:
+        """Start a compaction on a daemon thread unless one is already running."""
+        if self._compaction_lock.locked():
+            return
+        threading.Thread(target=self.compact, daemon=True).start()
+
+    def _compact_periodically(self) -> None:
+        """Compact every `compact_interval` seconds until the service is closed."""
+        while not self._stop.wait(self.compact_interval):
+            try:
+                self.compact()
+            except Exception:
+                # Keep compacting on later ticks: a transient error (e.g. a full disk) must not stop it for good
+                logger.exception("Periodic journal compaction failed")
+
+    def close(self) -> None:
+        """Stop periodic compaction and close the journal."""
+        self._stop.set()
+        with self._lock:
+            self._journal.close()
+        for lock_file in (self._lock_file, self._compaction_lock_file):
+            if lock_file is not None:
+                lock_file.close()
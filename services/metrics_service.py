@@ -0,0 +1,282 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+A small registry of counters, gauges and histograms, so the service can be
+scraped without extra dependencies. Metric updates take a short lock and
+are cheap enough to stay enabled under load.
+"""
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from core.tree_stats import TreeStats
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Latency buckets in seconds, from 50µs to 10s
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# Key-comparison buckets: a balanced tree of a million keys needs about 20
+COMPARISON_BUCKETS = (1, 2, 4, 8, 12, 16, 20, 24, 32, 48, 64, 128, 256, 1024, 4096, 16384)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in sorted(values):
+            yield f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def samples(self) -> Iterable[str]:
+        yield f"{self.name} {_format_value(self.read())}"
+
+
+class Histogram:
+    """Distribution of observed values over fixed buckets, per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            series = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                bucket = _format_labels(self.labels, labels, f'le="{_format_value(float(bound))}"')
+                yield f"{self.name}_bucket{bucket} {cumulative}"
+            label_text = _format_labels(self.labels, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together for a scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(name, documentation, read))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+TREE_OPERATION_SECONDS = registry.histogram(
+    "bst_operation_duration_seconds", "Sampled duration of tree operations", ("operation",)
+)
+TREE_OPERATION_COMPARISONS = registry.histogram(
+    "bst_operation_comparisons", "Sampled key comparisons per tree operation", ("operation",), COMPARISON_BUCKETS
+)
+CSV_IO_BYTES = registry.counter("csv_io_bytes_total", "Bytes read from or written to the data files", ("operation",))
+CSV_IO_SECONDS = registry.histogram("csv_io_duration_seconds", "Duration of data file reads and writes", ("operation",))
+
+
+class TreeMetrics(TreeStats):
+    """Feeds the sampled tree operation costs into the registry histograms."""
+
+    def record(self, operation: str, elapsed_ns: int, comparisons: int) -> None:
+        TREE_OPERATION_SECONDS.observe(elapsed_ns / 1e9, operation)
+        TREE_OPERATION_COMPARISONS.observe(comparisons, operation)
+
+
+def register_tree_gauges(tree) -> None:
+    """Expose the live shape of a tree: node count, height and average node depth.
+
+    The optimal height gauge makes a degenerated tree obvious: a healthy tree
+    stays within a small factor of it, a list-like one grows with the node count.
+    """
+    registry.gauge("bst_nodes", "Vehicles stored in the tree", lambda: len(tree))
+    registry.gauge("bst_height", "Height of the tree", tree.height)
+    registry.gauge(
+        "bst_height_optimal", "Height of a perfectly balanced tree with the same node count",
+        lambda: math.ceil(math.log2(len(tree) + 1)),
+    )
+    registry.gauge("bst_average_depth", "Average node depth (nodes visited by a successful search)", tree.average_depth)
+
+
+def register_filter_gauges(tree) -> None:
+    """Expose the plate filter statistics; they read 0 while the filter is disabled.
+
+    Lookups the filter answered as misses never walk the tree; false positives
+    passed the filter and were then not found. A sharded tree has one filter
+    per shard: the counters are summed and the rate averaged.
+    """
+    def filters() -> list:
+        return [index.filter for index in getattr(tree, "shards", (tree,)) if index.filter is not None]
+
+    def read(attribute: str) -> Callable[[], float]:
+        return lambda: sum(getattr(plate_filter, attribute) for plate_filter in filters())
+
+    def estimated_rate() -> float:
+        rates = [plate_filter.estimated_false_positive_rate() for plate_filter in filters()]
+        return sum(rates) / len(rates) if rates else 0
+
+    registry.gauge("bst_filter_lookups", "Plate lookups checked against the Bloom filter", read("lookups"))
+    registry.gauge("bst_filter_negatives", "Lookups the Bloom filter answered as misses", read("negatives"))
+    registry.gauge("bst_filter_false_positives", "Lookups that passed the Bloom filter but were not found", read("false_positives"))
+    registry.gauge(
+        "bst_filter_estimated_false_positive_rate", "Expected false positive rate at the current plate count",
+        estimated_rate,
+    )
+
+
+def register_record_gauges(tree) -> None:
+    """Expose the record file and its cache in disk mode (RECORD_FILE); they read 0 otherwise.
+
+    Hits and misses count vehicles decoded for the API; JSON responses are
+    copied straight from the file and do not go through the cache.
+    """
+    def total(read: Callable[[Any], float]) -> Callable[[], float]:
+        def collect() -> float:
+            indexes = getattr(tree, "shards", (tree,))
+            return sum(read(index.records) for index in indexes if getattr(index, "records", None) is not None)
+        return collect
+
+    registry.gauge("bst_record_file_bytes", "Bytes written to the record file, superseded versions included", total(lambda store: store.size))
+    registry.gauge("bst_record_file_records", "Records written to the record file, superseded versions included", total(lambda store: store.records))
+    registry.gauge("bst_record_cache_entries", "Vehicles held decoded in the record cache", total(lambda store: store.cached()))
+    registry.gauge("bst_record_cache_hits", "Vehicle reads answered from the record cache", total(lambda store: store.hits))
+    registry.gauge("bst_record_cache_misses", "Vehicle reads decoded from the record file", total(lambda store: store.misses))
+
+
+def register_sync_gauges(sync) -> None:
+    """Expose how closely this worker follows the journal shared by all workers (SHARED_WORKERS)."""
+    registry.gauge("worker_sync_applied_records", "Journal records written by other workers and applied here", lambda: sync.applied)
+    registry.gauge("worker_sync_pending_bytes", "Journal bytes not applied yet", sync.pending_bytes)
+    registry.gauge(
+        "worker_sync_seconds_since_catch_up", "Seconds since the journal was last checked for new records",
+        lambda: time.monotonic() - sync.last_poll if sync.last_poll is not None else 0,
+    )
+    registry.gauge("worker_sync_resyncs", "Full reconciliations after missing a journal rotation", lambda: sync.resyncs)
+
+
+def observe_io(operation: str, started: float, size: int) -> None:
+    """Record a data file read or write that began at `started` (time.perf_counter) and moved `size` bytes."""
+    CSV_IO_SECONDS.observe(time.perf_counter() - started, operation)
+    CSV_IO_BYTES.inc(size, operation)
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware timing each request until its last body chunk is sent.
+
+    Requests are labeled with the matched route template (for example
+    /api/vehicles/{plate}) rather than the raw path, which keeps the number of
+    series bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
@@ -0,0 +1,76 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+from services.csv_service import CSVService, Mutation
+
+logger = logging.getLogger(__name__)
+
+
+class PersistenceWriter:
+    """Background thread that persists mutations off the event loop.
+
+    Mutations are queued by submit() and written by a single thread, in
+    order, as group commits: everything queued within `commit_window`
+    seconds of the first pending mutation (up to `max_batch` submissions) is handed to
+    the service's apply_batch, which costs one write and one fsync.
+    The future returned by submit() resolves once its batch is on disk.
+    """
+
+    def __init__(self, service: CSVService, commit_window: float = 0.002, max_batch: int = 10000):
+        self.service = service
+        self.commit_window = commit_window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Tuple[List[Mutation], Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, mutation: Mutation) -> Future:
+        """Queue a mutation and return a future resolved when it is persisted."""
+        return self.submit_many([mutation])
+
+    def submit_many(self, mutations: List[Mutation]) -> Future:
+        """Queue several mutations that are always persisted in the same commit."""
+        future: Future = Future()
+        self._queue.put((mutations, future))
+        return future
+
+    def _next_batch(self, first: Tuple[List[Mutation], Future]) -> Tuple[List[Tuple[List[Mutation], Future]], bool]:
+        """Collect the mutations that join the first one in this commit."""
+        batch = [first]
+        deadline = time.monotonic() + self.commit_window
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._next_batch(first)
+            pending = [mutation for mutations, _ in batch for mutation in mutations]
+            try:
+                self.service.apply_batch(pending)
+            except Exception as exc:
+                logger.exception("Failed to persist %d mutations", len(pending))
+                for _, future in batch:
+                    future.set_exception(exc)
+            else:
+                for _, future in batch:
+                    future.set_result(None)
+
+    def close(self) -> None:
+        """Persist everything already queued and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
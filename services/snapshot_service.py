@@ -0,0 +1,167 @@
+import mmap
+import os
+import struct
+import sys
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Optional
+from core.vehicle_record import VehicleRecord
+from models.vehicle import RESERVED_CHARACTER, Vehicle
+
+# Header: magic, format version, record count, key block offset, record block offset, end of records
+HEADER = struct.Struct("<8sIQQQQ")
+MAGIC = b"VBSTSNAP"
+VERSION = 1
+# Key block entry: offset of a record relative to the record block
+OFFSET = struct.Struct("<Q")
+# Every field (plate, brand, color, model, price) is terminated by this separator,
+# which the Vehicle model rejects in its fields
+SEPARATOR = RESERVED_CHARACTER
+FIELDS_PER_RECORD = 5
+
+
+def pack_record(vehicle: Vehicle) -> bytes:
+    """Encode a vehicle as separator-terminated UTF-8 fields."""
+    fields = (vehicle.plate, vehicle.brand, vehicle.color, vehicle.model)
+    if any(SEPARATOR in field for field in fields):
+        raise ValueError(f"Vehicle '{vehicle.plate}' contains the reserved character \\x1f")
+    return (SEPARATOR.join(fields) + SEPARATOR + repr(float(vehicle.price)) + SEPARATOR).encode("utf-8")
+
+
+def unpack_record(data: bytes) -> VehicleRecord:
+    """Decode one packed record without any validation."""
+    plate, brand, color, model, price, _ = data.decode("utf-8").split(SEPARATOR)
+    return VehicleRecord(plate, sys.intern(brand), sys.intern(color), sys.intern(model), float(price))
+
+
+class SnapshotReader:
+    """Read-only, memory-mapped view of a binary snapshot file."""
+
+    def __init__(self, filepath: str):
+        self._file = open(filepath, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self._keys_offset, self._records_offset, self._records_end = (
+            HEADER.unpack_from(self._map, 0)
+        )
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{filepath}' is not a version {VERSION} vehicle snapshot")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record_start(self, index: int) -> int:
+        if index >= self.count:
+            return self._records_end
+        relative = OFFSET.unpack_from(self._map, self._keys_offset + index * OFFSET.size)[0]
+        return self._records_offset + relative
+
+    def record_at(self, index: int) -> VehicleRecord:
+        """Return the record at a position of the plate order."""
+        if not 0 <= index < self.count:
+            raise IndexError("snapshot index out of range")
+        # Records are contiguous, so a record ends where the next one starts
+        return unpack_record(self._map[self._record_start(index):self._record_start(index + 1)])
+
+    def find(self, plate: str) -> Optional[VehicleRecord]:
+        """Binary search the key block for a plate."""
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            record = self.record_at(mid)
+            if record.plate < plate:
+                low = mid + 1
+            elif record.plate > plate:
+                high = mid
+            else:
+                return record
+        return None
+
+    def records(self) -> List[VehicleRecord]:
+        """Decode every record in plate order.
+
+        The whole record block is decoded and split in one go, and the
+        columns are rebuilt with map/zip, so the per-record Python work is
+        only building the tuple.
+        """
+        fields = self._map[self._records_offset:self._records_end].decode("utf-8").split(SEPARATOR)
+        plates = fields[0::FIELDS_PER_RECORD]
+        brands = map(sys.intern, fields[1::FIELDS_PER_RECORD])
+        colors = map(sys.intern, fields[2::FIELDS_PER_RECORD])
+        models = map(sys.intern, fields[3::FIELDS_PER_RECORD])
+        prices = map(float, fields[4::FIELDS_PER_RECORD])
+        return list(map(VehicleRecord._make, zip(plates, brands, colors, models, prices)))
+
+    def __iter__(self) -> Iterator[VehicleRecord]:
+        return iter(self.records())
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class SnapshotService:
+    """Service for the binary snapshot format.
+
+    Layout: a fixed header, a key block with the offset of every record in
+    plate order, then the records themselves. The file is opened with mmap
+    and records are decoded directly into VehicleRecord tuples, so loading
+    skips CSV parsing and pydantic validation. CSV stays the import/export
+    format; see cli.py to convert between both.
+    """
+
+    def __init__(self, filepath: str = "data/vehicles.snap"):
+        self.filepath = filepath
+
+    def exists(self) -> bool:
+        return os.path.exists(self.filepath)
+
+    def is_fresh(self, sources: Iterable[str]) -> bool:
+        """Whether the snapshot is at least as recent as every non-empty source file."""
+        if not self.exists():
+            return False
+        snapshot_mtime = os.path.getmtime(self.filepath)
+        for source in sources:
+            if os.path.exists(source) and os.path.getsize(source) > 0:
+                if os.path.getmtime(source) > snapshot_mtime:
+                    return False
+        return True
+
+    def save_all(self, vehicles: Iterable[Vehicle], presorted: bool = False) -> int:
+        """Write all vehicles to a new snapshot (temp file + rename). Returns the count."""
+        items: List[Vehicle] = list(vehicles)
+        if not presorted:
+            items.sort(key=attrgetter("plate"))
+        count = len(items)
+        keys_offset = HEADER.size
+        records_offset = keys_offset + count * OFFSET.size
+
+        offsets = bytearray(count * OFFSET.size)
+        records = []
+        position = 0
+        for index, vehicle in enumerate(items):
+            OFFSET.pack_into(offsets, index * OFFSET.size, position)
+            data = pack_record(vehicle)
+            records.append(data)
+            position += len(data)
+
+        tmp_path = self.filepath + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, count, keys_offset, records_offset, records_offset + position))
+            f.write(offsets)
+            f.writelines(records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.filepath)
+        return count
+
+    def open(self) -> SnapshotReader:
+        """Memory-map the snapshot for reading."""
+        return SnapshotReader(self.filepath)
+
+    def load_records(self) -> List[VehicleRecord]:
+        """Load every record in plate order."""
+        reader = self.open()
+        try:
+            return reader.records()
+        finally:
+            reader.close()
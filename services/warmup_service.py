@@ -0,0 +1,77 @@
+"""Background loading of the initial data, tracked for the readiness probe."""
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+class WarmUpService:
+    """Runs the startup load on a worker thread and reports its progress.
+
+    The server starts answering (health checks included) immediately; the
+    vehicle endpoints wait for `ready` through wait().
+    """
+
+    def __init__(self):
+        self.state = "pending"
+        self.phase: Optional[str] = None
+        self.loaded = 0
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self, load: Callable[["WarmUpService"], None]) -> None:
+        """Start `load(self)` on a worker thread; must be called from the running event loop."""
+        self._done = asyncio.Event()
+        self.state = "loading"
+        self.started_at = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._run(load))
+
+    async def _run(self, load: Callable[["WarmUpService"], None]) -> None:
+        try:
+            await asyncio.to_thread(load, self)
+        except Exception as exc:
+            self.state = "failed"
+            self.error = f"{type(exc).__name__}: {exc}"
+        else:
+            self.state = "ready"
+            self.phase = "done"
+        finally:
+            self.finished_at = time.monotonic()
+            self._done.set()
+
+    def progress(self, phase: str, loaded: Optional[int] = None) -> None:
+        """Record loading progress; called from the loading thread between chunks."""
+        self.phase = phase
+        if loaded is not None:
+            self.loaded = loaded
+        # Hand the GIL to the event loop thread so probes stay responsive
+        time.sleep(0)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for the load to finish; return whether the data is ready."""
+        if self.ready:
+            return True
+        if self._done is None or timeout <= 0:
+            return False
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.ready
+
+    def status(self) -> dict:
+        """Loading state and progress, as reported by the readiness probe."""
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return {
+            "status": self.state,
+            "phase": self.phase,
+            "loaded": self.loaded,
+            "elapsed_seconds": round(end - self.started_at, 3) if self.started_at is not None else 0.0,
+            "error": self.error,
+        }
@@ -0,0 +1,202 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import BinaryIO, Callable, List, Optional, Tuple, TypeVar
+from pydantic import ValidationError
+from models.vehicle import Vehicle
+from services.csv_service import Mutation
+from services.journal_service import JournaledCSVService, ROTATE_OP
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerSync:
+    """Keep the tree of one server process in step with a journal shared by several.
+
+    With `uvicorn --workers N` every worker has its own tree. Writes are
+    serialized across workers by the journal's file lock: a worker takes it,
+    applies the records other workers appended since it last looked, makes
+    its change (so checks like "plate already exists" see every earlier
+    write) and appends the change before releasing it. The journal is thus
+    the single, ordered change log of all workers.
+
+    Between writes a background thread polls the journal every `interval`
+    seconds and applies new records, so reads on any worker lag the latest
+    write by at most about `interval` plus the time to apply it.
+
+    Records carry the full new state of a vehicle, so replaying a record
+    that is already reflected in the tree is harmless: following the journal
+    from any earlier point ends in the same state. When a compaction rotates
+    the journal, the old file stays readable through the open handle and is
+    read to its end before switching. If two rotations happen between polls
+    the generation numbers show a gap, and the tree is reconciled with the
+    whole data set (CSV plus journals) instead.
+    """
+
+    def __init__(self, journal: JournaledCSVService, tree, interval: float = 0.05):
+        self.journal = journal
+        self.tree = tree
+        self.interval = interval
+        self.applied = 0
+        self.resyncs = 0
+        self.last_poll: Optional[float] = None
+        self._file: Optional[BinaryIO] = None
+        self._generation = 0
+        self._position = 0
+        # Serializes catching up with this process's own writes
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def mark(self) -> None:
+        """Remember the current end of the journal; call before loading the data.
+
+        Everything appended later is applied by catch_up(), even if the load
+        already saw part of it.
+        """
+        with self._lock:
+            self._open_current()
+            self._position = os.fstat(self._file.fileno()).st_size
+
+    def _open_current(self) -> bool:
+        """Switch to the journal file currently in place; False if a rotation is still putting it there."""
+        generation = self.journal.generation(self.journal.journal_path)
+        if generation is None:
+            return False
+        try:
+            current = open(self.journal.journal_path, 'rb')
+        except FileNotFoundError:
+            return False
+        if self._file is not None:
+            self._file.close()
+        self._file = current
+        self._generation = generation
+        self._position = 0
+        return True
+
+    def _rotated(self) -> bool:
+        """Whether the journal path now holds a different file than the one being read."""
+        try:
+            return os.stat(self.journal.journal_path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            # Between the two renames of a rotation
+            return False
+
+    def _read_records(self) -> int:
+        """Apply the complete records after the current position; a torn last line is left for later."""
+        self._file.seek(self._position)
+        data = self._file.read()
+        end = data.rfind(b"\n") + 1
+        applied = 0
+        for line in data[:end].splitlines():
+            if self._apply(line):
+                applied += 1
+        self._position += end
+        return applied
+
+    def _apply(self, line: bytes) -> bool:
+        """Apply one journal record to the tree; unreadable records are skipped, as in a replay."""
+        try:
+            record = json.loads(line)
+            op = record["op"]
+            if op == ROTATE_OP:
+                return False
+            if op == "delete":
+                self.tree.delete(record["plate"])
+            else:
+                vehicle = Vehicle(**record["vehicle"])
+                # Inserts and updates both set the vehicle's whole state
+                if not self.tree.insert(vehicle):
+                    self.tree.update(vehicle.plate, vehicle)
+        except (KeyError, TypeError, ValueError, ValidationError):
+            return False
+        return True
+
+    def catch_up(self) -> int:
+        """Apply every record appended since the last call; return how many were applied."""
+        with self._lock:
+            return self._catch_up()
+
+    def _catch_up(self) -> int:
+        if self._file is None:
+            self._open_current()
+            if self._file is None:
+                return 0
+        applied = 0
+        while True:
+            # The old file gets no more records once it is rotated away: check first, then drain it
+            rotated = self._rotated()
+            applied += self._read_records()
+            if not rotated:
+                break
+            previous = self._generation
+            if not self._open_current():
+                break
+            if self._generation != previous + 1:
+                # A whole journal was folded into the CSV and dropped before it was read
+                self._resync()
+                break
+        self.applied += applied
+        self.last_poll = time.monotonic()
+        return applied
+
+    def _resync(self) -> None:
+        """Reconcile the tree with the complete data set after missing a journal generation."""
+        logger.warning("Missed a journal rotation; reconciling the tree with the data files")
+        self.resyncs += 1
+        # Records appended while loading are applied again by the next catch-up
+        self._position = os.fstat(self._file.fileno()).st_size
+        vehicles = {vehicle.plate: vehicle for vehicle in self.journal.load_all()}
+        for vehicle in list(self.tree.snapshot().iter_inorder()):
+            if vehicle.plate not in vehicles:
+                self.tree.delete(vehicle.plate)
+        for plate, vehicle in vehicles.items():
+            if self.tree.search(plate) != vehicle and not self.tree.insert(vehicle):
+                self.tree.update(plate, vehicle)
+
+    def write(self, change: Callable[[], Tuple[T, List[Mutation]]]) -> T:
+        """Apply a change as the only writer of all processes and append its mutations to the journal.
+
+        Args:
+            change: Applies the change to the tree and returns a result and
+                the mutations to persist; it sees every earlier write of any
+                process. Exceptions propagate and nothing is appended.
+        """
+        with self.journal.exclusive(), self._lock:
+            self._catch_up()
+            result, mutations = change()
+            if mutations:
+                self.journal.apply_batch(mutations)
+                # Skip the records just appended: they are already in the tree
+                self._position = os.fstat(self._file.fileno()).st_size
+            return result
+
+    def pending_bytes(self) -> int:
+        """Journal bytes not applied yet (of the file being read)."""
+        file = self._file
+        return os.fstat(file.fileno()).st_size - self._position if file is not None and not file.closed else 0
+
+    def start(self) -> None:
+        """Start following the journal on a background thread."""
+        self._thread = threading.Thread(target=self._run, name="worker-sync", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.catch_up()
+            except Exception:
+                logger.exception("Failed to apply journal records")
+
+    def close(self) -> None:
+        """Stop following the journal."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()